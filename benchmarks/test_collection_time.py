@@ -0,0 +1,45 @@
+"""Budget for the Jenkins ``--collect-only`` pass over the whole tests/ tree.
+
+Run with ``pytest benchmarks``; ``COLLECT_BUDGET_SECONDS`` overrides the 1s
+target on slow agents.
+"""
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+COLLECT_BUDGET_SECONDS = float(os.environ.get("COLLECT_BUDGET_SECONDS", "1.0"))
+
+
+def _collect(manifest: bool = True):
+    env = dict(os.environ, TEST_MANIFEST="1" if manifest else "0")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-qq", "tests"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started
+    assert result.returncode == 0, result.stdout + result.stderr
+    node_ids = sorted(line for line in result.stdout.splitlines() if "::" in line)
+    return elapsed, node_ids
+
+
+def test_collect_only_under_budget():
+    _collect()  # refresh the manifest cache for the current tree
+    best = min(_collect()[0] for _ in range(3))
+    print(f"collect-only wall time: {best:.3f}s (budget {COLLECT_BUDGET_SECONDS:.1f}s)")
+    assert best < COLLECT_BUDGET_SECONDS, (
+        f"--collect-only took {best:.3f}s, over the {COLLECT_BUDGET_SECONDS:.1f}s budget"
+    )
+
+
+def test_manifest_collects_same_tests_as_import():
+    _, from_manifest = _collect(manifest=True)
+    _, from_import = _collect(manifest=False)
+    assert from_manifest, "No tests collected"
+    assert from_manifest == from_import
@@ -125,6 +125,34 @@ def resolve_runtime_config(environment: Optional[str] = None) -> Dict[str, objec
     }
 
 
+def budget_for(check: str, *keys: Optional[str]) -> Dict[str, float]:
+    """Budget for ``check`` from ``config.json``: its ``default`` entry overlaid with each of ``keys`` in turn."""
+    budgets = _config.get("budgets", {}).get(check, {})
+    merged = dict(budgets.get("default", {}))
+    for key in keys:
+        if key:
+            merged.update(budgets.get(key, {}))
+    return merged
+
+
+def login_settings(portal: Optional[str] = None) -> Dict[str, str]:
+    """Login strategy settings from ``config.json``: ``login.default`` overlaid with the portal's entry."""
+    login = _config.get("login", {})
+    merged = dict(login.get("default", {"strategy": "ui"}))
+    if portal:
+        merged.update(login.get(portal, {}))
+    return merged
+
+
+def readiness_profile(url_key: Optional[str] = None) -> Dict[str, object]:
+    """What "ready" means for a tab: ``readiness.default`` overlaid with the tab's entry."""
+    readiness = _config.get("readiness", {})
+    merged = dict(readiness.get("default", {}))
+    if url_key:
+        merged.update(readiness.get(url_key, {}))
+    return merged
+
+
 def validate_config_shape(required_url_keys: Optional[List[str]] = None) -> List[str]:
     errors: List[str] = []
 
@@ -139,5 +167,8 @@ def validate_config_shape(required_url_keys: Optional[List[str]] = None) -> List
         missing = [k for k in required_url_keys if k not in urls]
         if missing:
             errors.append(f"Missing urls keys: {', '.join(sorted(missing))}")
+        stray = [k for k in _config.get("readiness", {}) if k != "default" and k not in required_url_keys]
+        if stray:
+            errors.append(f"readiness profiles for unknown tabs: {', '.join(sorted(stray))}")
 
     return errors
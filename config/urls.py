@@ -86,6 +86,53 @@ class URLs:
         PUBLIC_COMPANY_SEARCH_TAB,
     )
 
+    # Tab marker registered in pytest.ini for each URL key.
+    TAB_MARKERS = {
+        ACCOUNTS_DEFAULT: "accounts",
+        CONTACT_DEFAULT: "contact",
+        INVESTMENT_ALLOCATOR_ACCOUNTS_DEFAULT: "investment_allocator_accounts",
+        INVESTMENT_FIRM_ACCOUNTS_DEFAULT: "investment_firm_accounts",
+        DAKOTA_SEARCHES_TAB: "dakota_searches",
+        MY_ACCOUNTS_DEFAULT: "my_accounts",
+        INVESTMENT_ALLOCATOR_CONTACTS_DEFAULT: "investment_allocator_contacts",
+        INVESTMENT_FIRM_CONTACTS_DEFAULT: "investment_firm_contacts",
+        PORTFOLIO_COMPANIES_CONTACTS_DEFAULT: "portfolio_companies_contacts",
+        UNIVERSITY_ALUMNI_CONTACTS_DEFAULT: "university_alumni_contacts",
+        ALL_DOCUMENTS: "all_documents",
+        MANAGER_PRESENTATION_DASHBOARD: "manager_presentation_dashboard",
+        CONSULTANT_REVIEWS: "consultant_reviews",
+        PENSION_DOCUMENTS: "pension_documents",
+        PUBLIC_PLAN_MINUTES_SEARCH_TAB: "public_plan_minutes_search",
+        FEE_SCHEDULES_DASHBOARD: "fee_schedules_dashboard",
+        FUND_FAMILY_MEMOS: "fund_family_memos",
+        DAKOTA_CITY_GUIDES: "dakota_city_guides",
+        PUBLIC_INVESTMENTS_SEARCH_TAB: "public_investments_search",
+        FILINGS_13F_INVESTMENTS_SEARCH_TAB: "filings_13f_investments_search",
+        PRIVATE_FUND_SEARCH_TAB: "private_fund_search",
+        FUND_LAUNCHES: "fund_launches",
+        CONTINUATION_VEHICLE: "continuation_vehicle",
+        PORTFOLIO_COMPANIES: "portfolio_companies",
+        RECENT_TRANSACTIONS: "recent_transactions",
+        BENCHMARKING_TAB: "benchmarking_tab",
+        HEDGE_FUND_PERFORMANCE: "hedge_fund_performance",
+        EVERGREEN_FUND_PERFORMANCE: "evergreen_fund_performance",
+        FORECASTED_TRANSACTIONS: "forecasted_transactions",
+        PRIVATE_COMPANIES_TRANSACTIONS: "private_companies_transactions",
+        FUNDRAISING_NEWS: "fundraising_news",
+        CONFERENCE_SEARCH_TAB: "conference_search",
+        DAKOTA_VIDEO_SEARCH_TAB: "dakota_video_search",
+        PUBLIC_COMPANY_SEARCH_TAB: "public_company_search",
+    }
+
+    @staticmethod
+    def key_for_markers(marker_names) -> Optional[str]:
+        """Return the URL key whose tab marker appears in ``marker_names``."""
+        names = set(marker_names)
+        for url_key, marker in URLs.TAB_MARKERS.items():
+            if marker in names:
+                return url_key
+        return None
+
     @staticmethod
     def get_url_path(url_key: str, environment: Optional[str] = None) -> str:
         runtime = resolve_runtime_config(environment)
@@ -1,20 +1,71 @@
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 import os
 import logging
-import shutil
-from pathlib import Path
-from config.settings import resolve_runtime_config
+import time
+from config.settings import budget_for, resolve_runtime_config, validate_config_shape
+from config.urls import URLs
+from pages import locators
+from utils.driver_broker import BrokerClient, BrokerError, broker_enabled, start_broker, stop_broker
+from utils.dom_snapshots import (
+    DomCheckpoints,
+    ReplayDriver,
+    dom_snapshot_mode,
+    recording_name,
+    snapshot_root,
+    virtual_clock,
+)
+from utils.driver_factory import (
+    PRESPAWN_LOGIN_ENV,
+    PRESPAWN_TEST_ID,
+    DriverPrespawner,
+    create_driver,
+    env_flag,
+    prespawn_depth,
+    prespawn_min_free_mb,
+    quit_driver,
+    resolve_browser_name,
+)
+from utils.field_snapshots import FieldSnapshotStore, TabFieldSnapshot, snapshot_mode
+from utils.browser_telemetry import BrowserTelemetry
+from utils.lazy_load_metrics import (
+    STEP_NAME as LAZY_LOAD_STEP,
+    LazyLoadMetrics,
+    budget_mode,
+    lazy_load_target_records,
+    sample_every_rows,
+)
+from utils.list_view_sweeper import VIEW_CREATING_MARKERS, ListViewSweeper, run_id
+from utils.page_performance import STEP_NAME as PAGE_PERFORMANCE_STEP, PagePerformanceProbe
+from utils.tab_crawler import CRAWLED_CHECKS, CrawlSnapshot, TabCrawler, crawl_enabled, saved_snapshot_path
+from utils.tab_metadata import collect_with_cdp, metadata_backend
+from utils.session_keepalive import (
+    STEP_NAME as SESSION_RELOGIN_STEP,
+    SessionKeeper,
+    attach_keeper,
+    keepalive_interval,
+)
+from utils.session_normalizer import (
+    SessionNormalizer,
+    normalize_enabled,
+    publish_normalized,
+    save_baseline,
+    summary_lines as normalization_summary_lines,
+    withdraw_normalized,
+)
+from utils.step_timings import load_steps
+from utils.test_manifest import Manifest, make_module, manifest_enabled
+
+# login_page and utils.timeouts import selenium.webdriver; they are imported where
+# a browser is actually driven so the --collect-only pass stays light.
+
+# Tabs where a view-creating test failed and may have leaked a list view.
+_leaked_view_tabs: set[str] = set()
+_sweep_summary: list[str] = []
+_normalize_summary: list[str] = []
+_broker_process = None
+
+# Suites whose extracted field lists are kept in the snapshot store.
+FIELD_SNAPSHOT_CHECKS = ("fields_comparison", "fields_display")
 
 
 def _runtime_env_input():
@@ -22,49 +73,298 @@ def _runtime_env_input():
     return os.environ.get("ENV") or os.environ.get("TEST_ENV")
 
 
-DEFAULT_BROWSER_WIDTH = 1920
-DEFAULT_BROWSER_HEIGHT = 1080
+def pytest_configure(config):
+    config_errors = validate_config_shape(list(URLs.ALL_KEYS))
+    if config_errors:
+        raise pytest.UsageError("config/config.json: " + "; ".join(config_errors))
+    runtime = resolve_runtime_config(_runtime_env_input())
+    logging.info(
+        "Test runtime: env=%s portal=%s url=%s username=%s",
+        runtime["environment"],
+        runtime["portal"],
+        runtime["url"],
+        runtime["username"],
+    )
+    logging.info("Automation run id: %s", run_id())
+    if config.option.collectonly:
+        return
+    from utils.timeouts import TimeoutPolicy, set_policy
 
+    set_policy(TimeoutPolicy.from_env(runtime["environment"]))
+    if broker_enabled() and not hasattr(config, "workerinput"):
+        _start_driver_broker(config, runtime["environment"])
+    # Before xdist starts workers, so they inherit the list of normalized tabs.
+    if normalize_enabled() and not hasattr(config, "workerinput") and dom_snapshot_mode() != "replay":
+        _normalize_session_start(config, runtime)
 
-def _env_flag(name: str, default: bool = False) -> bool:
-    raw = os.environ.get(name)
-    if raw is None:
-        return default
-    return raw.strip().lower() in {"1", "true", "yes", "on"}
 
+def _normalize_session_start(config, runtime) -> None:
+    """Unpin every tab and record its default view once, in one logged-in session."""
+    from login_page import LoginPage
 
-def _resolve_viewport_size() -> tuple[int, int]:
-    width_raw = os.environ.get("BROWSER_WIDTH", str(DEFAULT_BROWSER_WIDTH)).strip()
-    height_raw = os.environ.get("BROWSER_HEIGHT", str(DEFAULT_BROWSER_HEIGHT)).strip()
+    normalize_driver = None
+    started = time.monotonic()
     try:
-        width = int(width_raw)
-        height = int(height_raw)
-    except ValueError as exc:
-        raise ValueError(
-            "BROWSER_WIDTH and BROWSER_HEIGHT must be valid integers."
-        ) from exc
-    if width <= 0 or height <= 0:
-        raise ValueError("BROWSER_WIDTH and BROWSER_HEIGHT must be greater than zero.")
-    return width, height
+        normalize_driver = create_driver(resolve_browser_name(config.getoption("--browser")))
+        login_page = LoginPage(normalize_driver)
+        login_page.navigate_to_login(runtime["url"])
+        login_page.login(runtime["username"], runtime["password"])
+        results = SessionNormalizer(normalize_driver, runtime["url"]).normalize(URLs.ALL_KEYS)
+    except Exception as exc:
+        logging.warning("Session normalization skipped: %s", exc)
+        _normalize_summary.append(f"Session normalization skipped: {exc}")
+        return
+    finally:
+        if normalize_driver is not None:
+            quit_driver(normalize_driver)
+    save_baseline(runtime["environment"], runtime["username"], results)
+    publish_normalized(results)
+    _normalize_summary.extend(normalization_summary_lines(results, time.monotonic() - started))
+
+
+def _start_driver_broker(config, environment: str) -> None:
+    """Start the warm-session broker from the controller; workers inherit its address."""
+    global _broker_process
+    workers = getattr(config.option, "numprocesses", None)
+    default_size = workers if isinstance(workers, int) and workers > 0 else 1
+    size = int(os.environ.get("DRIVER_BROKER_SIZE", default_size))
+    try:
+        _broker_process = start_broker(
+            resolve_browser_name(config.getoption("--browser")), environment, size
+        )
+    except BrokerError as exc:
+        logging.warning("Driver broker disabled: %s", exc)
 
 
-def _is_headless_mode() -> bool:
-    # Default to headless on Jenkins unless explicitly overridden.
-    default_headless = bool(os.environ.get("JENKINS_URL"))
-    return _env_flag("HEADLESS", default=default_headless)
+def pytest_unconfigure(config):
+    global _broker_process
+    if _broker_process is not None:
+        stop_broker(_broker_process)
+        _broker_process = None
 
 
-def pytest_configure(config):
+def pytest_pycollect_makemodule(module_path, parent):
+    # --collect-only: serve static test modules from the cached AST manifest.
+    return make_module(module_path, parent)
+
+
+def pytest_collection_finish(session):
+    if manifest_enabled(session.config):
+        Manifest.for_config(session.config).save()
+    # Pin/unpin tests pin views while other suites run; nobody may skip the probe then.
+    # Every xdist worker collects the same items, so each one withdraws it too.
+    if any(item.get_closest_marker("pin_unpin") is not None for item in session.items):
+        withdraw_normalized()
+
+
+def _variant_selected(item, use_cdp: bool, crawl: bool) -> bool:
+    if item.get_closest_marker("tab_crawl") is not None:
+        return crawl
+    if crawl and any(item.get_closest_marker(name) is not None for name in CRAWLED_CHECKS):
+        return False
+    if item.get_closest_marker("column_names") is not None:
+        return (item.get_closest_marker("cdp_backend") is not None) == use_cdp
+    return True
+
+
+def pytest_collection_modifyitems(config, items):
+    # Read-only checks exist per tab (Selenium), over CDP and against the tab crawl;
+    # keep only the selected variant.
+    use_cdp = metadata_backend() == "cdp"
+    crawl = crawl_enabled()
+    selected, deselected = [], []
+    for item in items:
+        if _variant_selected(item, use_cdp, crawl):
+            selected.append(item)
+        else:
+            deselected.append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    from utils.timeouts import get_policy
+
+    # Key learned timeouts by tab and start the per-test wait budget.
+    tab = URLs.key_for_markers(marker.name for marker in item.iter_markers())
+    get_policy().begin_test(tab)
+
+
+def pytest_runtest_teardown(item):
+    from utils.timeouts import get_policy
+
+    get_policy().end_test()
+
+
+def pytest_runtest_logreport(report):
+    if not (report.failed or report.outcome == "rerun"):
+        return
+    if any(marker in report.keywords for marker in VIEW_CREATING_MARKERS):
+        tab = URLs.key_for_markers(report.keywords)
+        if tab:
+            _leaked_view_tabs.add(tab)
+
+
+def _sweep_mode() -> str:
+    raw = os.environ.get("SWEEP_LIST_VIEWS", "auto").strip().lower()
+    if raw in {"0", "false", "no", "off"}:
+        return "off"
+    return "all" if raw == "all" else "auto"
+
+
+def _sweep_leaked_list_views(config) -> None:
+    """Delete this run's leaked automation list views in one logged-in session."""
+    mode = _sweep_mode()
+    if mode == "off":
+        return
+    tabs = list(URLs.ALL_KEYS) if mode == "all" else sorted(_leaked_view_tabs)
+    if not tabs:
+        return
+    from login_page import LoginPage
+
     runtime = resolve_runtime_config(_runtime_env_input())
-    logging.info(
-        "Test runtime: env=%s portal=%s url=%s username=%s",
-        runtime["environment"],
-        runtime["portal"],
-        runtime["url"],
-        runtime["username"],
+    sweep_driver = None
+    try:
+        sweep_driver = create_driver(resolve_browser_name(config.getoption("--browser")))
+        login_page = LoginPage(sweep_driver)
+        login_page.navigate_to_login(runtime["url"])
+        login_page.login(runtime["username"], runtime["password"])
+        result = ListViewSweeper(sweep_driver, runtime["url"]).sweep(tabs)
+    except Exception as exc:
+        logging.warning("List view sweep skipped: %s", exc)
+        _sweep_summary.append(f"List view sweep skipped: {exc}")
+        return
+    finally:
+        if sweep_driver is not None:
+            quit_driver(sweep_driver)
+    _sweep_summary.append(
+        f"List view sweep (run {run_id()}): {result.deleted_count} deleted "
+        f"across {len(tabs)} tab(s), {len(result.errors)} tab error(s)."
+    )
+    for url_key, names in result.deleted.items():
+        _sweep_summary.append(f"  {url_key}: {', '.join(names)}")
+    for url_key, error in result.errors.items():
+        _sweep_summary.append(f"  {url_key}: sweep failed ({error})")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if session.config.option.collectonly:
+        return
+    from utils.timeouts import get_policy
+
+    # Replayed waits run on a virtual clock; their latencies are not real observations.
+    if dom_snapshot_mode() != "replay":
+        get_policy().save()
+    locators.flush_stats()
+    # xdist workers report failures to the controller; sweep once, from there.
+    if not hasattr(session.config, "workerinput"):
+        _sweep_leaked_list_views(session.config)
+
+
+def _report_field_snapshot_changes(terminalreporter) -> None:
+    if terminalreporter.config.option.collectonly or snapshot_mode() == "off":
+        return
+    try:
+        changes = FieldSnapshotStore().changes_for_run(run_id())
+    except (OSError, ValueError) as exc:
+        terminalreporter.write_line(f"Field snapshot report unavailable: {exc}")
+        return
+    if not changes:
+        return
+    terminalreporter.write_line(f"Field lists changed since the last build ({len(changes)} tab(s)):")
+    for change in changes:
+        terminalreporter.write_line(f"  {change.describe()}")
+
+
+def _report_lazy_load_budgets(terminalreporter) -> None:
+    if terminalreporter.config.option.collectonly:
+        return
+    breached = [
+        record for record in load_steps(LAZY_LOAD_STEP, run_id()) if record.get("budget_breaches")
+    ]
+    if not breached:
+        return
+    terminalreporter.write_line(f"Lazy loading over budget ({len(breached)} tab(s)):")
+    for record in breached:
+        terminalreporter.write_line(f"  {record['tab']}: {'; '.join(record['budget_breaches'])}")
+
+
+def _report_page_performance(terminalreporter) -> None:
+    if terminalreporter.config.option.collectonly:
+        return
+    results = load_steps(PAGE_PERFORMANCE_STEP, run_id())
+    if not results:
+        return
+    terminalreporter.write_line(f"Page performance ({len(results)} tab(s), grid ready / header / LCP in ms):")
+    for result in sorted(results, key=lambda record: record["tab"]):
+        metrics = result["metrics"]
+        change = result["trend"].get("grid_ready_ms", {}).get("change_pct")
+        line = (
+            f"  {result['tab']}: {metrics['grid_ready_ms']} / {metrics['header_ms']} / {metrics['lcp_ms']}"
+            + (f" (grid {change:+.1f}% vs trend)" if change is not None else "")
+        )
+        if result["budget_breaches"]:
+            line += " OVER BUDGET: " + "; ".join(result["budget_breaches"])
+        terminalreporter.write_line(line)
+
+
+def _report_session_relogins(terminalreporter) -> None:
+    if terminalreporter.config.option.collectonly:
+        return
+    relogins = load_steps(SESSION_RELOGIN_STEP, run_id())
+    if not relogins:
+        return
+    counts: dict[tuple[str, str], int] = {}
+    for record in relogins:
+        key = (record.get("trigger", "?"), record.get("method", "?"))
+        counts[key] = counts.get(key, 0) + 1
+    terminalreporter.write_line(
+        f"Session re-logins ({len(relogins)}): "
+        + ", ".join(f"{count} on {trigger} via {method}" for (trigger, method), count in sorted(counts.items()))
     )
 
 
+def _report_slow_locators(terminalreporter) -> None:
+    if terminalreporter.config.option.collectonly:
+        return
+    threshold = locators.slow_ms()
+    slow = [entry for entry in locators.summarize(run_id()) if entry["mean_ms"] >= threshold]
+    if not slow:
+        return
+    terminalreporter.write_line(f"Slow locators (mean >= {threshold:g}ms in-page):")
+    for entry in slow:
+        terminalreporter.write_line(
+            f"  {entry['locator']}: {entry['evaluations']} evaluations, "
+            f"mean {entry['mean_ms']}ms, max {entry['max_ms']}ms, total {entry['total_ms']}ms"
+        )
+
+
+def pytest_terminal_summary(terminalreporter):
+    for line in _normalize_summary + _sweep_summary:
+        terminalreporter.write_line(line)
+    _report_field_snapshot_changes(terminalreporter)
+    _report_lazy_load_budgets(terminalreporter)
+    _report_page_performance(terminalreporter)
+    _report_session_relogins(terminalreporter)
+    _report_slow_locators(terminalreporter)
+    if _broker_process is not None:
+        try:
+            pools = BrokerClient.from_env().stats()
+        except (OSError, BrokerError) as exc:
+            terminalreporter.write_line(f"Driver broker stats unavailable: {exc}")
+            return
+        for environment, stats in pools.items():
+            terminalreporter.write_line(
+                f"Driver broker [{environment}]: {stats['leases']} leases "
+                f"(avg wait {stats['avg_lease_wait']}s), {stats['started']} started, "
+                f"{stats['relogins']} re-logins ({stats['keepalive_cookie_relogins']} from cached cookies, "
+                f"{stats['keepalive_pings']} keepalive pings), {stats['discarded']} discarded, "
+                f"{stats['start_failures']} start failures."
+            )
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--browser",
@@ -104,165 +404,173 @@ def runtime_config():
 
 @pytest.fixture(scope="session")
 def browser_name(request):
-    cli_browser = request.config.getoption("--browser")
-    browser = (cli_browser or os.environ.get("BROWSER") or "chrome").strip().lower()
-    if browser not in {"chrome", "edge", "firefox"}:
-        raise ValueError(
-            f"Unsupported browser '{browser}'. Supported browsers: chrome, edge, firefox"
-        )
-    return browser
-
-
-def _build_common_browser_args(options):
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-infobars")
-    options.add_argument("--disable-extensions")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--no-sandbox")
-
-
-def _resolve_browser_binary(browser_name: str) -> str | None:
-    env_var_map = {
-        "chrome": "CHROME_BINARY",
-        "edge": "EDGE_BINARY",
-        "firefox": "FIREFOX_BINARY",
-    }
-    env_var = env_var_map[browser_name]
-    explicit_binary = os.environ.get(env_var, "").strip()
-    if explicit_binary:
-        if not Path(explicit_binary).exists():
-            raise FileNotFoundError(
-                f"{env_var} is set but file does not exist: {explicit_binary}"
-            )
-        return explicit_binary
-
-    if browser_name == "chrome":
-        names = ["chrome", "google-chrome", "google-chrome-stable", "chrome.exe"]
-        candidates = [
-            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-        ]
-    elif browser_name == "edge":
-        names = ["msedge", "msedge.exe", "microsoft-edge"]
-        candidates = [
-            r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
-            r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-        ]
-    else:  # firefox
-        names = ["firefox", "firefox.exe"]
-        candidates = [
-            r"C:\Program Files\Mozilla Firefox\firefox.exe",
-            r"C:\Program Files (x86)\Mozilla Firefox\firefox.exe",
-        ]
-
-    for name in names:
-        resolved = shutil.which(name)
-        if resolved:
-            return resolved
-    for candidate in candidates:
-        if Path(candidate).exists():
-            return candidate
-    return None
-
-
-def _effective_browser_for_driver(requested: str) -> str:
-    """On CI agents without Firefox, fall back to Chrome so jobs do not fail at fixture setup."""
-    if requested != "firefox":
-        return requested
-    if _resolve_browser_binary("firefox") is not None:
-        return requested
-    ci = _env_flag("CI") or bool(os.environ.get("JENKINS_URL"))
-    if ci:
-        logging.warning(
-            "Requested Firefox but no Firefox binary was found; using Chrome on this agent."
-        )
-        return "chrome"
-    return requested
-
-
-def _apply_browser_binary_option(browser_name, options):
-    binary = _resolve_browser_binary(browser_name)
-    if not binary:
-        env_hint = {
-            "chrome": "CHROME_BINARY",
-            "edge": "EDGE_BINARY",
-            "firefox": "FIREFOX_BINARY",
-        }[browser_name]
-        raise RuntimeError(
-            f"Could not find installed {browser_name} browser binary on this machine. "
-            f"Install {browser_name} or set {env_hint} to the browser executable path."
-        )
-    options.binary_location = binary
-    logging.info("Using %s binary: %s", browser_name, binary)
+    return resolve_browser_name(request.config.getoption("--browser"))
+
+
+@pytest.fixture(scope="session")
+def session_keeper(environment):
+    """Re-login for pooled (broker / pre-spawned) sessions; None with ``KEEPALIVE_INTERVAL=0``."""
+    if not keepalive_interval():
+        return None
+    return SessionKeeper.for_environment(environment)
+
+
+@pytest.fixture(scope="session")
+def driver_prespawner(browser_name, runtime_config, session_keeper):
+    """Background starter for the next test's browser with ``DRIVER_PRESPAWN``; None otherwise."""
+    depth = prespawn_depth()
+    if not depth or broker_enabled() or dom_snapshot_mode() == "replay":
+        yield None
+        return
+    login = None
+    if env_flag(PRESPAWN_LOGIN_ENV):
+        def login(browser_driver):
+            from login_page import LoginPage
+
+            login_page = LoginPage(browser_driver, test_id=PRESPAWN_TEST_ID)
+            login_page.navigate_to_login(runtime_config["url"])
+            login_page.login(runtime_config["username"], runtime_config["password"])
+            return runtime_config["username"]
+
+    keeper = session_keeper if login is not None else None
+    prespawner = DriverPrespawner(
+        browser_name, depth, login=login, min_free_mb=prespawn_min_free_mb(),
+        keeper=keeper, keepalive_interval=keepalive_interval(),
+    ).start()
+    yield prespawner
+    prespawner.close()
+    logging.info("Driver pre-spawn: %s", prespawner.stats)
 
 
 @pytest.fixture(scope="function")
-def driver(browser_name):
-    effective_browser = _effective_browser_for_driver(browser_name)
-    browser_driver = None
-    viewport_width, viewport_height = _resolve_viewport_size()
-    is_headless = _is_headless_mode()
-
-    if effective_browser == "chrome":
-        options = ChromeOptions()
-        _build_common_browser_args(options)
-        options.add_argument(f"--window-size={viewport_width},{viewport_height}")
-        if is_headless:
-            options.add_argument("--headless=new")
-        options.add_argument("--remote-allow-origins=*")  # Chrome 111+ fix
-        _apply_browser_binary_option("chrome", options)
-        try:
-            service = ChromeService(ChromeDriverManager().install())
-        except Exception as exc:
-            logging.warning(
-                "ChromeDriverManager failed: %s. Falling back to system ChromeDriver.", exc
-            )
-            service = ChromeService()
-        browser_driver = webdriver.Chrome(service=service, options=options)
-
-    elif effective_browser == "edge":
-        options = EdgeOptions()
-        _build_common_browser_args(options)
-        options.add_argument(f"--window-size={viewport_width},{viewport_height}")
-        if is_headless:
-            options.add_argument("--headless=new")
-        _apply_browser_binary_option("edge", options)
-        try:
-            service = EdgeService(EdgeChromiumDriverManager().install())
-        except Exception as exc:
-            logging.warning(
-                "EdgeDriverManager failed: %s. Falling back to system EdgeDriver.", exc
-            )
-            service = EdgeService()
-        browser_driver = webdriver.Edge(service=service, options=options)
-
-    elif effective_browser == "firefox":
-        options = FirefoxOptions()
-        options.add_argument(f"--width={viewport_width}")
-        options.add_argument(f"--height={viewport_height}")
-        if is_headless:
-            options.add_argument("-headless")
-        _apply_browser_binary_option("firefox", options)
+def driver(request, browser_name, environment, driver_prespawner, session_keeper):
+    if dom_snapshot_mode() == "replay":
+        recording = snapshot_root(environment) / recording_name(request.node)
+        if not recording.is_dir():
+            pytest.skip(f"DOM_SNAPSHOT=replay: no recording at {recording}")
+        username = resolve_runtime_config(_runtime_env_input())["username"]
+        with virtual_clock():
+            yield ReplayDriver(recording, logged_in_user=username)
+        return
+    broker = BrokerClient.from_env()
+    if broker is not None:
         try:
-            service = FirefoxService(GeckoDriverManager().install())
-        except Exception as exc:
-            logging.warning(
-                "GeckoDriverManager failed: %s. Falling back to system geckodriver.", exc
-            )
-            service = FirefoxService()
-        browser_driver = webdriver.Firefox(service=service, options=options)
-
+            leased = broker.lease(environment)
+        except (OSError, BrokerError) as exc:
+            logging.warning("Driver broker lease failed, starting a local browser: %s", exc)
+        else:
+            if session_keeper is not None:
+                attach_keeper(leased, session_keeper)
+            yield leased
+            try:
+                broker.release(leased)
+            except (OSError, BrokerError) as exc:
+                logging.warning("Driver broker release failed: %s", exc)
+            return
+    browser_driver = driver_prespawner.take() if driver_prespawner is not None else None
     if browser_driver is None:
-        raise ValueError(f"Driver setup failed for browser '{effective_browser}'")
+        browser_driver = create_driver(browser_name)
+    yield browser_driver
+    quit_driver(browser_driver)
 
-    # Enforce viewport after session starts for consistent rendering/click targets.
-    browser_driver.set_window_size(viewport_width, viewport_height)
+@pytest.fixture(scope="session")
+def cdp_tab_metadata(request, browser_name, base_url, credentials):
+    """Metadata for every selected CDP-backend tab, loaded concurrently in one logged-in browser."""
+    if browser_name == "firefox":
+        pytest.skip("METADATA_BACKEND=cdp needs Chrome or Edge (DevTools protocol).")
+    url_keys = sorted({
+        item.callspec.params["url_key"]
+        for item in request.session.items
+        if item.get_closest_marker("cdp_backend") is not None and hasattr(item, "callspec")
+    })
+    from login_page import LoginPage
+
+    cdp_driver = create_driver(browser_name)
+    try:
+        login_page = LoginPage(cdp_driver)
+        login_page.navigate_to_login(base_url)
+        login_page.login(*credentials)
+        return collect_with_cdp(cdp_driver, base_url, url_keys)
+    finally:
+        quit_driver(cdp_driver)
+
+
+@pytest.fixture(scope="session")
+def tab_crawl(request, browser_name, base_url, credentials, environment):
+    """Every selected crawl tab's metadata, from ``TAB_CRAWL_SNAPSHOT`` or one logged-in crawl."""
+    saved = saved_snapshot_path()
+    if saved is not None:
+        return CrawlSnapshot.load(saved)
+    url_keys = sorted({
+        item.callspec.params["url_key"]
+        for item in request.session.items
+        if item.get_closest_marker("tab_crawl") is not None and hasattr(item, "callspec")
+    })
+    from login_page import LoginPage
+
+    crawl_driver = create_driver(browser_name)
+    try:
+        login_page = LoginPage(crawl_driver)
+        login_page.navigate_to_login(base_url)
+        login_page.login(*credentials)
+        snapshot = TabCrawler(crawl_driver, base_url).crawl(url_keys, environment)
+    finally:
+        quit_driver(crawl_driver)
+    print(f"Tab crawl snapshot saved to {snapshot.save()}")
+    return snapshot
+
+
+@pytest.fixture(scope="function")
+def field_snapshots(request, runtime_config):
+    """Snapshot of this tab's field lists; whatever the test records is stored at teardown."""
+    node = request.node
+    tab = URLs.key_for_markers(marker.name for marker in node.iter_markers()) or node.name
+    check = next(
+        (name for name in FIELD_SNAPSHOT_CHECKS if node.get_closest_marker(name) is not None),
+        node.name,
+    )
+    snapshot = TabFieldSnapshot(
+        FieldSnapshotStore(), runtime_config["base_env"], runtime_config["portal"],
+        tab, check, run_id(), "off" if dom_snapshot_mode() == "replay" else snapshot_mode(),
+    )
+    yield snapshot
+    try:
+        snapshot.flush()
+    except OSError as exc:
+        logging.warning("Field snapshot for %s not saved: %s", tab, exc)
+
+
+@pytest.fixture(scope="function")
+def lazy_load_metrics(request, driver, environment):
+    """Times the lazy-loading session of this test's tab against its budget in ``config.json``."""
+    tab = URLs.key_for_markers(marker.name for marker in request.node.iter_markers()) or request.node.name
+    return LazyLoadMetrics(
+        tab, environment, lazy_load_target_records(), budget_for(LAZY_LOAD_STEP, tab), budget_mode(),
+        telemetry=BrowserTelemetry(driver), sample_every_rows=sample_every_rows(),
+    )
+
+
+@pytest.fixture(scope="function")
+def page_performance(driver, runtime_config):
+    """Page-load recorder for this test's browser; removed again at teardown."""
+    probe = PagePerformanceProbe(driver, runtime_config["environment"], runtime_config["portal"])
+    yield probe
+    probe.uninstall()
+
+
+@pytest.fixture(scope="function")
+def dom_snapshots(request, driver, environment):
+    """Named DOM checkpoints: captured with ``DOM_SNAPSHOT=capture``, replayed with ``replay``."""
+    checkpoints = DomCheckpoints(
+        driver, dom_snapshot_mode(), snapshot_root(environment) / recording_name(request.node)
+    )
+    yield checkpoints
+    checkpoints.save()
 
-    yield browser_driver
-    browser_driver.quit()
 
 @pytest.fixture(scope="function")
 def wait(driver):
-    """Provides WebDriverWait instance for explicit waits"""
-    return WebDriverWait(driver, 30)
+    """Provides an adaptive wait (a ``WebDriverWait``); ``wait("predicate_name", timeout)`` keys one by what it waits for"""
+    from utils.timeouts import adaptive_wait
+
+    return adaptive_wait(driver, "fixture_wait", 30)
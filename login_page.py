@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import time
 
 from selenium.webdriver.common.by import By
@@ -7,20 +8,186 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 
 from pages.base_page import BasePage
+from utils.timeouts import adaptive_wait
+from utils.api_login import ApiLoginError, frontdoor_url, login_strategy, session_id_for
+from utils.step_timings import record_step
+
+FAST_PATH_ENV = "LOGIN_FAST_PATH"
+MARKETPLACE_LINK = (By.CSS_SELECTOR, "a[title='Dakota Marketplace']")
+
+# True once the document has loaded and, on Aura pages, the framework has its context.
+_READY_SCRIPT = """
+if (document.readyState !== 'complete') {
+    return false;
+}
+if (window.$A && typeof $A.getContext === 'function' && !$A.getContext()) {
+    return false;
+}
+return true;
+"""
+
+# Set both fields with the native setter + events, let handlers run for two frames,
+# re-read both values and submit only when they stuck.
+_FAST_FILL_SCRIPT = """
+const [userField, passwordField, button, user, pwd, done] = arguments;
+const setValue = (el, val) => {
+    el.focus();
+    const descriptor = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(el, val);
+    } else {
+        el.value = val;
+    }
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+    el.dispatchEvent(new Event('change', { bubbles: true }));
+    el.dispatchEvent(new KeyboardEvent('keyup', { bubbles: true }));
+    el.blur();
+};
+setValue(userField, user);
+setValue(passwordField, pwd);
+requestAnimationFrame(() => requestAnimationFrame(() => {
+    const userActual = (userField.value || '').trim();
+    const passwordActual = (passwordField.value || '').trim();
+    const verified = userActual === user.trim() && passwordActual === pwd.trim();
+    if (verified) {
+        button.click();
+    }
+    done({verified: verified, username: userActual, password_len: passwordActual.length});
+}));
+"""
+
+# The login form and the errors Salesforce renders on it. Form errors are only
+# read while this form is still on the page.
+LOGIN_FORM_CSS = "form[id='loginPage:loginForm'], input[type='password'], input[name='password']"
+LOGIN_ERROR_CSS = "#error, .loginError, .errorMsg, .message.errorM3"
+
+# What the browser shows after submit: the marketplace, one of the known failure
+# screens, or (while still loading) nothing yet. Verification and expired passwords
+# are pages of their own, so they are recognised by URL only; site error pages by
+# their title or heading, never by text anywhere in the body.
+_POST_SUBMIT_SCRIPT = """
+const [formCss, errorCss] = arguments;
+if (document.querySelector("a[title='Dakota Marketplace']")) {
+    return {state: 'success'};
+}
+const url = location.pathname;
+const text = document.body ? document.body.innerText.slice(0, 20000) : '';
+const firstMatch = (pattern) => {
+    const match = text.match(pattern);
+    return match ? match[0] : '';
+};
+if (/identity\\/verification|IdentityVerification|\\/secur\\/verify/i.test(url)) {
+    return {state: 'identity_verification', detail: firstMatch(/verify your identity[^\\n]*/i)};
+}
+if (/changepassword|expiredpassword/i.test(url)) {
+    return {state: 'password_expired',
+            detail: firstMatch(/your password has expired[^\\n]*|change your password[^\\n]*/i)};
+}
+if (document.querySelector(formCss)) {
+    for (const node of document.querySelectorAll(errorCss)) {
+        const error = (node.innerText || '').trim().split('\\n')[0];
+        if (!error || node.getClientRects().length === 0) {
+            continue;
+        }
+        if (/locked out|account (has been |is )?locked/i.test(error)) {
+            return {state: 'locked_out', detail: error};
+        }
+        return {state: /username|password|login attempt|credentials/i.test(error)
+            ? 'invalid_credentials' : 'login_error', detail: error};
+    }
+    return null;
+}
+const headings = Array.from(document.querySelectorAll('h1, h2'), (node) => (node.innerText || '').trim());
+for (const heading of [document.title, ...headings]) {
+    if (/an unexpected error has occurred|service unavailable|down for maintenance|site under construction/i.test(heading)) {
+        return {state: 'error_page', detail: heading.split('\\n')[0].slice(0, 200)};
+    }
+}
+return null;
+"""
+
+
+class LoginRejectedError(RuntimeError):
+    """Salesforce answered the login with a screen no retry will get past.
+
+    Retrying only pays the login timeout again, so pools and the Jenkins rerun
+    policy treat it (and its subclasses) as non-retryable. Messages start with
+    "Login rejected:" so ``--rerun-except`` can match every subclass.
+    """
+
+    retryable = False
+    description = "Salesforce rejected the login"
+
+    def __init__(self, detail: str = "", url: str = ""):
+        self.detail = detail
+        self.url = url
+        message = f"Login rejected: {self.description}"
+        if detail:
+            message += f" ({detail})"
+        if url:
+            message += f" at {url}"
+        super().__init__(message)
+
+
+class IdentityVerificationRequiredError(LoginRejectedError):
+    description = "identity verification is required for this user"
+
+
+class PasswordExpiredError(LoginRejectedError):
+    description = "the password has expired and must be changed"
+
+
+class AccountLockedError(LoginRejectedError):
+    description = "the user is locked out"
+
+
+class InvalidCredentialsError(LoginRejectedError):
+    description = "the username or password was not accepted"
+
+
+class SiteErrorPageError(LoginRejectedError):
+    description = "the site showed an error page"
+
+
+_REJECTIONS = {
+    "identity_verification": IdentityVerificationRequiredError,
+    "password_expired": PasswordExpiredError,
+    "locked_out": AccountLockedError,
+    "invalid_credentials": InvalidCredentialsError,
+    "login_error": LoginRejectedError,
+    "error_page": SiteErrorPageError,
+}
+
+
+def fast_path_enabled() -> bool:
+    """``LOGIN_FAST_PATH=0`` always uses the careful field-by-field routine."""
+    return os.environ.get(FAST_PATH_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
 
 
 class LoginPage(BasePage):
     """Salesforce Experience Cloud login.
 
     Username is flaky on this form: password focus / partial page settle can leave
-    the email blank. Always re-find fields, verify both values, and refill username
-    if it was cleared before submit.
+    the email blank. Portals configured for an API strategy (``utils.api_login``)
+    skip the form and open the site through frontdoor. The fast path sets both
+    fields and submits in one script, but only after re-reading both values; when
+    they didn't stick, the careful routine re-finds fields, verifies both values,
+    and refills username if it was cleared before submit. Which path ran and how
+    long it took goes to the step-timing export as ``login``.
     """
 
     FILL_RETRIES = 3
+    # Settle time the careful routine has always given Experience Cloud / Aura handlers.
+    CAREFUL_SETTLE_SECONDS = 1.0
 
-    def __init__(self, driver):
+    def __init__(self, driver, test_id: str | None = None):
         super().__init__(driver, timeout=30)
+        # Test id for the step-timing export; None means the running test.
+        self.test_id = test_id
+        # Which login path ran and how long it took, e.g. {"path": "fast", "seconds": 1.8}.
+        self.last_login: dict | None = None
+        self.base_url: str | None = None
+        self.strategy = login_strategy()
         self.username_locators = [
             (By.ID, "loginPage:loginForm:login-email"),
             (By.NAME, "username"),
@@ -40,28 +207,41 @@ class LoginPage(BasePage):
             (By.XPATH, "//button[contains(.,'Log In') or contains(.,'Login')]"),
         ]
 
+    def _already_logged_in(self, user: str | None = None) -> bool:
+        """Session leased from the driver broker (or a DOM snapshot replay), already logged in (as ``user``)."""
+        logged_in_user = getattr(self.driver, "logged_in_user", None)
+        return bool(logged_in_user) and (user is None or logged_in_user == user)
+
     def navigate_to_login(self, base_url: str) -> None:
+        self.base_url = base_url
+        if self._already_logged_in():
+            # login() opens the form itself if the session belongs to a different user.
+            return
+        if self.strategy["strategy"] != "ui":
+            # API strategies open the site through frontdoor; the form is only loaded as a fallback.
+            return
+        self._open_login_form(base_url)
+
+    def _drop_session(self) -> None:
+        """Log out a leased session that belongs to another user and load the login form for ``login()``."""
+        print(f"[Login] Session is logged in as {self.driver.logged_in_user}; logging out.")
+        self.driver.delete_all_cookies()
+        self.driver.logged_in_user = None
+        if self.strategy["strategy"] == "ui":
+            self._open_login_form(self.base_url)
+
+    def _open_login_form(self, base_url: str) -> None:
         self.driver.get(base_url)
         self._wait_for_visible_field(self.username_locators)
         self._wait_for_visible_field(self.password_locators)
-        # Allow Experience Cloud / Aura handlers to attach before interacting.
-        time.sleep(1.0)
+        # Let Experience Cloud / Aura handlers attach before interacting.
+        self.wait_for("login_form_ready").until(
+            lambda driver: driver.execute_script(_READY_SCRIPT),
+            "login_form_ready: page never finished loading",
+        )
 
     def _wait_for_visible_field(self, locators):
-        def _find_visible(_driver):
-            return self._find_first_visible(locators)
-
-        return self.wait.until(_find_visible)
-
-    def _find_first_visible(self, locators):
-        for locator in locators:
-            for element in self.driver.find_elements(*locator):
-                try:
-                    if element.is_displayed() and element.is_enabled():
-                        return element
-                except Exception:
-                    continue
-        return None
+        return self.wait_for("login_field_visible").until(lambda _: self.find_first_visible(locators))
 
     def _field_value(self, field) -> str:
         try:
@@ -99,7 +279,7 @@ class LoginPage(BasePage):
         )
 
     def _set_input_value(self, field, value: str, *, label: str) -> None:
-        self.wait.until(lambda _: field.is_displayed() and field.is_enabled())
+        self.wait_for("login_field_enabled").until(lambda _: field.is_displayed() and field.is_enabled())
         self.driver.execute_script(
             "arguments[0].scrollIntoView({block:'center'});", field
         )
@@ -173,19 +353,74 @@ class LoginPage(BasePage):
         )
 
     def _find_login_button(self):
-        for locator in self.login_button_locators:
-            for candidate in self.driver.find_elements(*locator):
-                try:
-                    if candidate.is_displayed() and candidate.is_enabled():
-                        return candidate
-                except Exception:
-                    continue
-        return None
+        return self.find_first_visible(self.login_button_locators)
 
     def login(self, user: str, pwd: str) -> None:
         if not user or not pwd:
             raise ValueError("Login username and password must be non-empty")
+        if self._already_logged_in(user):
+            print("[Login] Warm session is already logged in; skipping the login form.")
+            return
+        if self._already_logged_in():
+            self._drop_session()
 
+        started = time.monotonic()
+        fallback_reasons = []
+        strategy = self.strategy["strategy"]
+        if strategy != "ui" and self.base_url:
+            reason = self._api_submit(user, pwd)
+            if not reason:
+                self._wait_for_login_complete()
+                self._record_login(strategy, started)
+                return
+            print(f"[Login] {strategy} login failed ({reason}); using the login form.")
+            fallback_reasons.append(reason)
+            self._open_login_form(self.base_url)
+        if fast_path_enabled():
+            reason = self._fast_submit(user, pwd)
+            if not reason:
+                self._wait_for_login_complete()
+                self._record_login("fast", started, "; ".join(fallback_reasons))
+                return
+            print(f"[Login] Fast path not verified ({reason}); using the careful routine.")
+            fallback_reasons.append(reason)
+            time.sleep(self.CAREFUL_SETTLE_SECONDS)
+        self._careful_submit(user, pwd)
+        self._wait_for_login_complete()
+        self._record_login("careful", started, "; ".join(fallback_reasons))
+
+    def _api_submit(self, user: str, pwd: str) -> str:
+        """Get a session over the API and open the site through frontdoor; returns why not, or ""."""
+        try:
+            session_id = session_id_for(self.strategy, self.base_url, user, pwd)
+        except (ApiLoginError, OSError) as exc:
+            return str(exc)
+        self.driver.get(frontdoor_url(self.base_url, session_id))
+        return ""
+
+    def _fast_submit(self, user: str, pwd: str) -> str:
+        """Set both fields and submit in one script; returns why it didn't, or "" once submitted."""
+        username_field = self.find_first_visible(self.username_locators)
+        password_field = self.find_first_visible(self.password_locators)
+        login_btn = self._find_login_button()
+        if username_field is None or password_field is None or login_btn is None:
+            return "login form not found"
+        try:
+            result = self.driver.execute_async_script(
+                _FAST_FILL_SCRIPT, username_field, password_field, login_btn, user, pwd
+            )
+        except Exception as exc:
+            message = str(exc).strip().splitlines()
+            return f"fill script failed: {message[0] if message else type(exc).__name__}"
+        if not result or not result.get("verified"):
+            result = result or {}
+            return (
+                f"username='{result.get('username', '')}', "
+                f"password_len={result.get('password_len', 0)} (expected {len(pwd.strip())})"
+            )
+        return ""
+
+    def _careful_submit(self, user: str, pwd: str) -> None:
         last_error: Exception | None = None
         for attempt in range(1, self.FILL_RETRIES + 1):
             try:
@@ -205,14 +440,32 @@ class LoginPage(BasePage):
         if login_btn is None:
             raise RuntimeError("Login submit button not found")
 
-        self.wait.until(EC.element_to_be_clickable(login_btn))
+        self.wait_for("login_button_clickable").until(EC.element_to_be_clickable(login_btn))
         try:
             login_btn.click()
         except Exception:
             self.js_click(login_btn)
 
-        self.wait.until(
-            EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "a[title='Dakota Marketplace']")
-            )
+    def _post_submit_state(self, driver):
+        """Truthy once logged in; raises the matching :class:`LoginRejectedError` on a failure screen."""
+        result = driver.execute_script(_POST_SUBMIT_SCRIPT, LOGIN_FORM_CSS, LOGIN_ERROR_CSS)
+        if not result:
+            return False
+        if result["state"] == "success":
+            return True
+        url = driver.current_url.split("?", 1)[0]
+        raise _REJECTIONS.get(result["state"], LoginRejectedError)(result.get("detail", ""), url)
+
+    def _wait_for_login_complete(self) -> None:
+        # Races the marketplace link against known failure screens, so a rejected login
+        # fails within a poll or two instead of after the whole timeout.
+        adaptive_wait(self.driver, "login_complete", self.timeout, poll_frequency=0.25).until(
+            self._post_submit_state,
+            "login_complete: neither the marketplace nor a known login failure screen appeared",
         )
+
+    def _record_login(self, path: str, started: float, fallback_reason: str = "") -> None:
+        seconds = round(time.monotonic() - started, 2)
+        self.last_login = {"path": path, "seconds": seconds}
+        print(f"[Login] Logged in via the {path} path in {seconds:.2f}s.")
+        record_step("login", seconds, test=self.test_id, path=path, fallback_reason=fallback_reason)
@@ -1,6 +1,55 @@
 from __future__ import annotations
 
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from pages.element_proxy import execute_script, lazy
+from utils.timeouts import AdaptiveWait, adaptive_wait
+
+# First visible, enabled element for an ordered list of [by, value] locators, in one call.
+_FIRST_VISIBLE_SCRIPT = """
+const usable = (node) => {
+    if (!node || node.disabled || node.getClientRects().length === 0) {
+        return false;
+    }
+    const style = window.getComputedStyle(node);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+};
+const lookup = (by, value) => {
+    switch (by) {
+    case 'id': {
+        const node = document.getElementById(value);
+        return node ? [node] : [];
+    }
+    case 'name':
+        return document.getElementsByName(value);
+    case 'css selector':
+        return document.querySelectorAll(value);
+    case 'class name':
+        return document.getElementsByClassName(value);
+    case 'tag name':
+        return document.getElementsByTagName(value);
+    case 'xpath': {
+        const snapshot = document.evaluate(value, document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) {
+            nodes.push(snapshot.snapshotItem(i));
+        }
+        return nodes;
+    }
+    default:
+        throw new Error('find_first_visible: unsupported locator strategy ' + by);
+    }
+};
+for (const [by, value] of arguments[0]) {
+    for (const node of lookup(by, value)) {
+        if (usable(node)) {
+            return node;
+        }
+    }
+}
+return null;
+"""
 
 
 class BasePage:
@@ -9,8 +58,58 @@ class BasePage:
     def __init__(self, driver, timeout: int = 30):
         self.driver = driver
         self.timeout = timeout
-        self.wait = WebDriverWait(driver, timeout)
+        # Kept for existing callers; wait_for (or self.wait("predicate")) keys the history per predicate.
+        self.wait = adaptive_wait(driver, type(self).__name__, timeout)
+
+    def wait_for(self, predicate: str, timeout: float | None = None) -> AdaptiveWait:
+        """Wait whose timeout is learned separately for ``predicate``.
+
+        Every wait names what it waits for, so unrelated waits never share history.
+        """
+        return adaptive_wait(self.driver, predicate, timeout or self.timeout)
 
     def js_click(self, element) -> None:
-        """Click via JavaScript to bypass overlay/animation intercepts."""
-        self.driver.execute_script("arguments[0].click();", element)
+        """Click via JavaScript to bypass overlay/animation intercepts.
+
+        A stale :class:`LazyElement` is looked up again and clicked.
+        """
+        self.execute_script("arguments[0].click();", element)
+
+    def execute_script(self, script: str, *args):
+        """``driver.execute_script``, retried with fresh elements when a :class:`LazyElement` argument is stale."""
+        return execute_script(self.driver, script, *args)
+
+    def element(self, locator, predicate: str, timeout: float | None = None,
+                condition=EC.visibility_of_element_located):
+        """Wait for ``condition(locator)`` and return the element as a :class:`LazyElement`.
+
+        The element finds itself again by ``locator`` if Lightning re-renders it.
+        """
+        found = self.wait_for(predicate, timeout).until(condition(locator))
+        return lazy(self.driver, found, lambda: self.driver.find_element(*locator), locator[1])
+
+    def find_first_visible(self, locators):
+        """First visible, enabled match of ``locators`` (tried in order), or ``None``.
+
+        All locators are evaluated in-page in one script call, instead of a
+        ``find_elements`` per locator plus ``is_displayed``/``is_enabled`` per candidate.
+        The match is a :class:`LazyElement` that repeats the lookup when it goes stale.
+        """
+        return lazy(
+            self.driver,
+            self._first_visible(locators),
+            lambda: self._first_visible(locators),
+            " | ".join(value for _, value in locators),
+        )
+
+    def _first_visible(self, locators):
+        return self.driver.execute_script(
+            _FIRST_VISIBLE_SCRIPT, [[by, value] for by, value in locators]
+        )
+
+    def wait_for_first_visible(self, locators, predicate: str, timeout: float | None = None):
+        """Wait until one of ``locators`` matches a visible, enabled element and return it."""
+        return self.wait_for(predicate, timeout).until(
+            lambda _: self.find_first_visible(locators),
+            f"{predicate}: nothing visible and enabled for {[value for _, value in locators]}",
+        )
@@ -0,0 +1,108 @@
+"""WebElements that find themselves again after a Lightning re-render.
+
+Lightning replaces DOM nodes when a component re-renders (a header after a view
+switch, modal items, toolbar buttons), so a WebElement held across that point
+raises ``StaleElementReferenceException`` on its next use. A :class:`LazyElement`
+remembers how it was found; when a command on it comes back stale it looks the
+element up again (up to ``STALE_RETRIES`` times) and repeats the command.
+
+It is a ``WebElement`` subclass, so it can be passed to expected conditions
+like the raw element. ``driver.execute_script`` only sends the element id,
+though, and a stale id fails there without the proxy seeing it: scripts that
+take elements go through :func:`execute_script` (or ``BasePage.js_click``),
+which re-resolves the proxies among the arguments and runs the script again.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Optional, Tuple
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+
+STALE_RETRIES = 3
+RETRY_PAUSE_SECONDS = 0.25
+
+
+class LazyElement(WebElement):
+    """``WebElement`` that re-resolves through ``resolve`` when it goes stale."""
+
+    def __init__(self, element: WebElement, resolve: Callable[[], Optional[WebElement]],
+                 description: str = "", retries: int = STALE_RETRIES):
+        super().__init__(element.parent, element.id)
+        self._resolve = resolve
+        self._description = description
+        self._retries = retries
+        self.re_resolutions = 0
+
+    @classmethod
+    def located(cls, driver, locator: Tuple[str, str], element: Optional[WebElement] = None,
+                retries: int = STALE_RETRIES) -> "LazyElement":
+        """Proxy for ``driver.find_element(*locator)``; ``element`` is a match already in hand."""
+        resolve = lambda: driver.find_element(*locator)
+        return cls(element if element is not None else resolve(), resolve, locator[1], retries)
+
+    def __repr__(self):
+        return f"<LazyElement {self._description!r} (element=\"{self._id}\")>"
+
+    def _re_resolve(self, stale: StaleElementReferenceException) -> None:
+        try:
+            element = self._resolve()
+        except NoSuchElementException:
+            element = None
+        if element is None:
+            # Gone for good (modal closed, navigated away): the stale error is the real answer.
+            raise stale
+        self._parent, self._id = element.parent, element.id
+        self.re_resolutions += 1
+        logging.debug("Re-resolved stale element %s", self._description)
+
+    def _retrying(self, call: Callable[[], object]):
+        for attempt in range(self._retries + 1):
+            try:
+                return call()
+            except StaleElementReferenceException as stale:
+                if attempt == self._retries:
+                    raise
+                time.sleep(RETRY_PAUSE_SECONDS)
+                self._re_resolve(stale)
+        raise AssertionError("unreachable")
+
+    # WebElement commands go through _execute; a few go through execute_script instead.
+
+    def _execute(self, command, params=None):
+        return self._retrying(lambda: super(LazyElement, self)._execute(command, dict(params or {})))
+
+    def is_displayed(self) -> bool:
+        return self._retrying(super().is_displayed)
+
+    def get_attribute(self, name) -> Optional[str]:
+        return self._retrying(lambda: super(LazyElement, self).get_attribute(name))
+
+    def submit(self) -> None:
+        self._retrying(super().submit)
+
+
+def execute_script(driver, script: str, *args, retries: int = STALE_RETRIES):
+    """``driver.execute_script`` that re-resolves :class:`LazyElement` arguments when one goes stale."""
+    proxies = [arg for arg in args if isinstance(arg, LazyElement)]
+    for attempt in range(retries + 1):
+        try:
+            return driver.execute_script(script, *args)
+        except StaleElementReferenceException as stale:
+            if not proxies or attempt == retries:
+                raise
+            time.sleep(RETRY_PAUSE_SECONDS)
+            # The error does not say which argument went stale; looking a fresh one up again is harmless.
+            for proxy in proxies:
+                proxy._re_resolve(stale)
+    raise AssertionError("unreachable")
+
+
+def lazy(driver, element, resolve: Callable[[], Optional[WebElement]], description: str = ""):
+    """Wrap ``element`` in a :class:`LazyElement`; ``None`` and non-WebElements (replay) pass through."""
+    if element is None or not isinstance(element, WebElement):
+        return element
+    return LazyElement(element, resolve, description)
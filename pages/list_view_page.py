@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+from typing import Sequence
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from config.settings import readiness_profile
+from config.urls import get_url
+from pages.base_page import BasePage
+from pages.element_proxy import lazy
+from utils.session_normalizer import normalized_tabs
+
+# Innermost text of every "Select a List View" option, read in one round trip.
+_VIEW_NAMES_SCRIPT = """
+const snapshot = document.evaluate(arguments[0], document, null,
+    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const names = [];
+for (let i = 0; i < snapshot.snapshotLength; i++) {
+    names.push((snapshot.snapshotItem(i).innerText || '').trim());
+}
+return names;
+"""
+
+_FIND_VIEW_SCRIPT = """
+const snapshot = document.evaluate(arguments[0], document, null,
+    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let i = 0; i < snapshot.snapshotLength; i++) {
+    const option = snapshot.snapshotItem(i);
+    if ((option.innerText || '').trim() === arguments[1]) {
+        return option;
+    }
+}
+return null;
+"""
+
+# Types into the dropdown's search box (if it has one) with Lightning-safe events.
+_TYPE_AHEAD_SCRIPT = """
+const box = document.evaluate(arguments[0], document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!box || box.offsetParent === null) {
+    return false;
+}
+const setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, 'value').set;
+box.focus();
+setter.call(box, arguments[1]);
+box.dispatchEvent(new Event('input', { bubbles: true }));
+box.dispatchEvent(new KeyboardEvent('keyup', { bubbles: true }));
+return true;
+"""
+
+# No Lightning spinner is still showing (records, charts or documents still loading).
+_NO_SPINNER_SCRIPT = """
+for (const node of document.querySelectorAll('.slds-spinner_container, lightning-spinner')) {
+    if (node.getClientRects().length > 0) {
+        return false;
+    }
+}
+return true;
+"""
+
+
+def base_view_name(header: str) -> str:
+    return re.split(r"\s*\(", header.strip(), 1)[0].strip()
+
+
+class ListViewPage(BasePage):
+    """Marketplace tab: SLDS grid, list view header and "Select a List View" dropdown."""
+
+    GRID_HEADER_ROW = (By.XPATH, "//tr[@class='slds-line-height_reset']")
+    LIST_VIEW_HEADER = (By.XPATH, "//div[@class='dropdownStyling']")
+    SELECT_LIST_VIEW_BUTTON = (By.XPATH, "//button[@title='Select a List View']")
+    UNPIN_BUTTON = (By.XPATH, "//button[@title='Unpin this List View']")
+    LIST_VIEW_OPTIONS_XPATH = "//div[@role='main']//li//a[1]"
+    LIST_VIEW_SEARCH_XPATH = (
+        "//div[@role='main']//input[@type='search' or contains(@placeholder,'Search')]"
+    )
+    # Tried in order by find_first_visible: the icon button, then a titled or labelled one.
+    DELETE_BUTTON_LOCATORS = [
+        (By.XPATH, "//button[.//svg[@data-key='delete']]"),
+        (By.XPATH, "//button[contains(@title,'Delete')]"),
+        (By.XPATH, "//button[.//span[contains(normalize-space(.),'Delete')]]"),
+    ]
+    CONFIRM_DELETE_BUTTON = (By.XPATH, "(//button[contains(text(),'Delete')])")
+
+    def __init__(self, driver):
+        super().__init__(driver, timeout=30)
+        self.url_key = None
+
+    def open(self, base_url: str, url_key: str) -> None:
+        self.driver.get(get_url(base_url, url_key))
+        self.wait_until_ready(url_key)
+
+    def _readiness_check(self, name: str):
+        if name == "grid_ready":
+            return EC.element_to_be_clickable(self.GRID_HEADER_ROW)
+        if name == "grid_present":
+            return EC.presence_of_element_located(self.GRID_HEADER_ROW)
+        if name == "list_view_header":
+            return EC.visibility_of_element_located(self.LIST_VIEW_HEADER)
+        if name == "no_spinner":
+            return lambda driver: driver.execute_script(_NO_SPINNER_SCRIPT)
+        raise ValueError(
+            f"Unknown readiness check '{name}'. "
+            "Supported: grid_ready, grid_present, list_view_header, no_spinner"
+        )
+
+    def wait_until_ready(self, url_key: str | None = None, extra_checks: Sequence[str] = ()) -> None:
+        """Wait for the checks in ``url_key``'s readiness profile (``config.json`` ``readiness``).
+
+        Without ``url_key`` the tab last passed to :meth:`open` (or to this method) is used.
+        ``extra_checks`` are what the caller needs on top of the tab's profile, such as
+        ``grid_ready`` before reading the grid headers; checks the profile has are not repeated.
+        """
+        self.url_key = url_key or self.url_key
+        profile = readiness_profile(self.url_key)
+        timeout = float(profile.get("timeout_seconds", 60))
+        checks = list(profile.get("checks", ["grid_ready", "list_view_header"]))
+        checks += [name for name in extra_checks if name not in checks]
+        started = time.monotonic()
+        for name in checks:
+            self.wait_for(name, timeout).until(
+                self._readiness_check(name), f"{self.url_key or 'tab'} not ready: {name}"
+            )
+        elapsed = time.monotonic() - started
+        expected = profile.get("expected_seconds")
+        if expected and elapsed > float(expected):
+            logging.info("%s took %.1fs to become ready (expected %ss)",
+                         self.url_key or "tab", elapsed, expected)
+
+    def unpin_button(self):
+        """The visible "Unpin this List View" button, or ``None`` when no view is pinned.
+
+        Answered from the DOM right away: call it once the tab is ready, when the
+        header's buttons have rendered.
+        """
+        return self.find_first_visible([self.UNPIN_BUTTON])
+
+    def is_pinned(self) -> bool:
+        return self.unpin_button() is not None
+
+    def ensure_unpinned(self, url_key: str | None = None, trust_baseline: bool = False) -> bool:
+        """Unpin the current list view and reload the tab, only if one is pinned.
+
+        ``url_key`` picks the readiness profile waited on after the reload (see
+        :meth:`wait_until_ready`). Returns whether the view was pinned. With
+        ``trust_baseline``, tabs the session-start normalization left unpinned
+        are not probed; only suites that never pin a view should pass it.
+        """
+        if trust_baseline and url_key and url_key in normalized_tabs():
+            return False
+        button = self.unpin_button()
+        if button is None:
+            return False
+        self.js_click(button)
+        try:
+            self.wait_for("unpin_applied", 10).until(lambda _: not self.is_pinned())
+        except TimeoutException:
+            # The refresh below shows the default view either way.
+            pass
+        self.driver.refresh()
+        self.wait_until_ready(url_key)
+        return True
+
+    def header_text(self) -> str:
+        return self.element(self.LIST_VIEW_HEADER, "page").text.strip()
+
+    def header_base(self) -> str:
+        """Header without the trailing record count, e.g. ``My View (1,234)`` -> ``My View``."""
+        return base_view_name(self.header_text())
+
+    def _header_base_now(self) -> str:
+        try:
+            headers = self.driver.find_elements(*self.LIST_VIEW_HEADER)
+            return base_view_name(headers[0].text) if headers else ""
+        except StaleElementReferenceException:
+            return ""
+
+    def open_view_dropdown(self) -> None:
+        button = self.element(
+            self.SELECT_LIST_VIEW_BUTTON, "select_list_view_btn", condition=EC.element_to_be_clickable
+        )
+        self.js_click(button)
+        self._wait_for_options()
+
+    def view_names(self) -> list[str]:
+        """Names of every option in the open dropdown."""
+        return self.driver.execute_script(_VIEW_NAMES_SCRIPT, self.LIST_VIEW_OPTIONS_XPATH)
+
+    def _wait_for_options(self) -> None:
+        self.wait_for("views_list").until(
+            EC.presence_of_all_elements_located((By.XPATH, self.LIST_VIEW_OPTIONS_XPATH))
+        )
+
+    def _lookup_view(self, name: str):
+        def lookup():
+            return self.driver.execute_script(
+                _FIND_VIEW_SCRIPT, self.LIST_VIEW_OPTIONS_XPATH, name.strip()
+            )
+
+        return lazy(self.driver, lookup(), lookup, name)
+
+    def find_view(self, name: str, type_ahead: bool = False, timeout: float = 5):
+        """Option for ``name`` in the open dropdown, or ``None``.
+
+        The match is made in-page in one script call instead of reading ``.text``
+        on every entry. With ``type_ahead`` the name is typed into the dropdown's
+        search box first (when it has one) and the lookup is retried while the
+        list filters, for up to ``timeout`` seconds.
+        """
+        self._wait_for_options()
+        option = self._lookup_view(name)
+        if option is not None or not type_ahead:
+            return option
+        if not self.driver.execute_script(
+            _TYPE_AHEAD_SCRIPT, self.LIST_VIEW_SEARCH_XPATH, name.strip()
+        ):
+            return None
+        try:
+            return self.wait_for("view_type_ahead", timeout).until(
+                lambda _: self._lookup_view(name)
+            )
+        except TimeoutException:
+            return None
+
+    def view_exists(self, name: str) -> bool:
+        """Whether the open dropdown lists ``name``."""
+        return self.find_view(name) is not None
+
+    def select_view(self, name: str) -> None:
+        """Pick ``name`` from the open dropdown and wait until the header shows it."""
+        option = self.find_view(name, type_ahead=True)
+        if option is None:
+            raise LookupError(f"List view '{name}' not found in dropdown")
+        self.js_click(option)
+        self.wait_for("select_view").until(lambda _: self._header_base_now() == name)
+
+    def delete_current_view(self) -> None:
+        """Delete the selected list view and wait for the grid to show another view."""
+        deleted = self.header_base()
+        delete_btn = self.wait_for_first_visible(self.DELETE_BUTTON_LOCATORS, "delete_btn")
+        self.js_click(delete_btn)
+        confirm_btn = self.element(
+            self.CONFIRM_DELETE_BUTTON, "confirm_delete_btn", condition=EC.element_to_be_clickable
+        )
+        self.js_click(confirm_btn)
+        self.wait_for("view_deleted", 60).until(
+            lambda _: self._header_base_now() not in ("", deleted)
+        )
+        self.wait_until_ready()
@@ -0,0 +1,226 @@
+"""Registry of hot locators, evaluated in-page and scoped to their container.
+
+The suites' busiest lookups (grid rows, column headers, "Select Fields To
+Display" options) were document-wide XPaths over a Lightning DOM that grows to
+tens of thousands of nodes while a grid lazy-loads, and were usually followed by
+one round trip per element just to count or read them. A :class:`Locator` names
+the lookup once:
+
+* ``css``: a CSS selector equivalent to ``xpath``, used instead of it when given.
+* ``root``: CSS of the container the query is scoped to (the whole document
+  when the container is not on the page).
+* ``shadow``: also search open shadow roots (LWC components).
+
+:func:`find_all`, :func:`count` and :func:`texts` evaluate a locator in one
+script call that returns only what the caller needs. Each evaluation's in-page
+latency is counted per locator; :func:`flush_stats` writes the totals to the
+step-timing export as ``locator`` records, and the terminal summary lists
+locators slower than ``LOCATOR_SLOW_MS``. DOM snapshot replay answers the
+script from its recorded DOM by ``xpath``, without a timing to count.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from utils.step_timings import load_steps, record_step
+
+STEP_NAME = "locator"
+SLOW_MS_ENV = "LOCATOR_SLOW_MS"
+DEFAULT_SLOW_MS = 50.0
+
+_EVALUATE_SCRIPT = """
+const [css, xpath, rootCss, shadow, mode] = arguments;
+const started = performance.now();
+const root = (rootCss && document.querySelector(rootCss)) || document;
+let nodes;
+if (css && shadow) {
+    nodes = [];
+    const visit = (scope) => {
+        nodes.push(...scope.querySelectorAll(css));
+        for (const host of scope.querySelectorAll('*')) {
+            if (host.shadowRoot) {
+                visit(host.shadowRoot);
+            }
+        }
+    };
+    visit(root);
+} else if (css) {
+    nodes = Array.from(root.querySelectorAll(css));
+} else {
+    const scoped = root === document ? xpath : '.' + xpath;
+    const snapshot = document.evaluate(scoped, root, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    nodes = [];
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+        nodes.push(snapshot.snapshotItem(i));
+    }
+}
+let value;
+if (mode === 'count') {
+    value = nodes.length;
+} else if (mode === 'visible_count') {
+    value = nodes.filter((node) => node.getClientRects().length > 0).length;
+} else if (mode === 'texts') {
+    value = nodes.map((node) => (node.innerText || node.textContent || '').trim()).filter(Boolean);
+} else {
+    value = nodes;
+}
+return {value: value, ms: performance.now() - started};
+"""
+
+
+@dataclass(frozen=True)
+class Locator:
+    """A named lookup; ``xpath`` is document-wide and always set (replay and fallback)."""
+
+    name: str
+    xpath: str
+    css: Optional[str] = None
+    root: Optional[str] = None
+    shadow: bool = False
+
+
+LOCATORS: Dict[str, Locator] = {}
+
+
+def register(locator: Locator) -> Locator:
+    LOCATORS[locator.name] = locator
+    return locator
+
+
+# First cell of every loaded grid row: one per record while a tab lazy-loads.
+GRID_ROW_CELLS = register(Locator(
+    "grid_row_cells",
+    xpath="//tbody/tr/td[1]",
+    css="tbody > tr > td:first-of-type",
+    root="div[role='main']",
+))
+# Column header labels of the list view grid.
+COLUMN_HEADER_LABELS = register(Locator(
+    "column_header_labels",
+    xpath="//th[@role='columnheader']//span[contains(@class,'slds-truncate')]",
+    css="th[role='columnheader'] span.slds-truncate",
+    root="div[role='main']",
+))
+# Every non-empty label in the list view grid table: what the column-name suites compare.
+# No CSS: normalize-space(text()) only counts a span's own text.
+GRID_LABELS = register(Locator(
+    "grid_labels",
+    xpath="//table[contains(@class,'slds-table')]//span[contains(@class,'slds-truncate') and normalize-space(text())]",
+    root="div[role='main']",
+))
+# Truncated cell texts of the list view grid.
+GRID_CELL_LABELS = register(Locator(
+    "grid_cell_labels",
+    xpath="//div[@class='slds-truncate']",
+    css="div[class='slds-truncate']",
+    root="div[role='main']",
+))
+# Options in the "Select Fields To Display" modal.
+SELECT_FIELDS_OPTIONS = register(Locator(
+    "select_fields_options",
+    xpath="//li[@role='presentation']",
+    css="li[role='presentation']",
+    root="section[role='dialog']",
+))
+
+
+class LocatorStats:
+    """Evaluation count and in-page latency per locator, for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, ms: float) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(name, {"evaluations": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["evaluations"] += 1
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+
+    def drain(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            stats, self._stats = self._stats, {}
+        return stats
+
+
+STATS = LocatorStats()
+
+
+def _resolve(locator: Union[str, Locator]) -> Locator:
+    if isinstance(locator, Locator):
+        return locator
+    try:
+        return LOCATORS[locator]
+    except KeyError:
+        raise KeyError(f"Unknown locator '{locator}'. Registered: {', '.join(sorted(LOCATORS))}") from None
+
+
+def _evaluate(driver, locator: Union[str, Locator], mode: str):
+    locator = _resolve(locator)
+    result = driver.execute_script(
+        _EVALUATE_SCRIPT, locator.css, locator.xpath, locator.root, locator.shadow, mode
+    )
+    if "ms" in result:
+        STATS.add(locator.name, float(result["ms"]))
+    return result["value"]
+
+
+def find_all(driver, locator: Union[str, Locator]) -> list:
+    """Every element ``locator`` matches."""
+    return _evaluate(driver, locator, "elements")
+
+
+def count(driver, locator: Union[str, Locator], visible: bool = False) -> int:
+    """How many elements ``locator`` matches (only rendered ones with ``visible``), without fetching them."""
+    return int(_evaluate(driver, locator, "visible_count" if visible else "count"))
+
+
+def texts(driver, locator: Union[str, Locator]) -> List[str]:
+    """Non-empty texts of the matches, in document order."""
+    return list(_evaluate(driver, locator, "texts"))
+
+
+def slow_ms() -> float:
+    raw = os.environ.get(SLOW_MS_ENV, "").strip()
+    if not raw:
+        return DEFAULT_SLOW_MS
+    try:
+        return float(raw)
+    except ValueError as exc:
+        raise ValueError(f"{SLOW_MS_ENV} must be a number of milliseconds, got '{raw}'.") from exc
+
+
+def flush_stats() -> None:
+    """Write this process's per-locator totals to the step-timing export."""
+    for name, entry in sorted(STATS.drain().items()):
+        record_step(
+            STEP_NAME,
+            round(entry["total_ms"] / 1000.0, 4),
+            test="",
+            locator=name,
+            evaluations=int(entry["evaluations"]),
+            total_ms=round(entry["total_ms"], 2),
+            max_ms=round(entry["max_ms"], 2),
+        )
+
+
+def summarize(run: str) -> List[Dict[str, float]]:
+    """Per-locator totals of run ``run`` across all workers, slowest average first."""
+    merged: Dict[str, Dict[str, float]] = {}
+    for record in load_steps(STEP_NAME, run):
+        entry = merged.setdefault(
+            record["locator"], {"locator": record["locator"], "evaluations": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        entry["evaluations"] += record.get("evaluations", 0)
+        entry["total_ms"] += record.get("total_ms", record["seconds"] * 1000.0)
+        entry["max_ms"] = max(entry["max_ms"], record.get("max_ms", 0.0))
+    for entry in merged.values():
+        entry["mean_ms"] = round(entry["total_ms"] / entry["evaluations"], 2) if entry["evaluations"] else 0.0
+        entry["total_ms"] = round(entry["total_ms"], 1)
+    return sorted(merged.values(), key=lambda entry: entry["mean_ms"], reverse=True)
@@ -0,0 +1,289 @@
+"""Expected leading column headers per tab, shared by both column-name backends."""
+
+from config.urls import URLs
+
+EXPECTED_COLUMNS = {
+    URLs.FILINGS_13F_INVESTMENTS_SEARCH_TAB: [
+        "Account",
+        "Investment Strategy",
+        "Ticker",
+        "Latest Fund Balance",
+        "No. of Shares",
+        "Latest Filing Date",
+        "View Investment",
+    ],
+    URLs.ACCOUNTS_DEFAULT: [
+        "Account Name",
+        "Account Type",
+        "AUM",
+        "Metro Area",
+        "Website",
+    ],
+    URLs.ALL_DOCUMENTS: [
+        "Document Name",
+        "Type",
+        "Account",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Meeting Date",
+    ],
+    URLs.BENCHMARKING_TAB: [
+        "Account",
+        "Investment Strategy",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Vintage",
+        "Fund AUM",
+        "Net IRR",
+        "TVPI",
+        "DPI",
+    ],
+    URLs.CONFERENCE_SEARCH_TAB: [
+        "Conference Name",
+        "Investment Focus",
+        "Conference Organizer",
+        "Format",
+        "Metro Area",
+        "Start Date",
+    ],
+    URLs.CONSULTANT_REVIEWS: [
+        "Document Name",
+        "Type",
+        "Consultant",
+        "Public Plan Minute",
+        "Investment Strategy",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Meeting Date",
+    ],
+    URLs.CONTACT_DEFAULT: [
+        "Contact Name",
+        "Account",
+        "Title",
+        "Contact Type",
+        "Contact Metro Area",
+        "Email",
+        "Phone",
+        "Account: Account Type",
+        "Account: Metro Area",
+    ],
+    URLs.DAKOTA_CITY_GUIDES: [
+        "Title",
+        "Metro Area",
+        "Published Date",
+    ],
+    URLs.DAKOTA_SEARCHES_TAB: [
+        "Searches Name",
+        "Metro Area",
+        "Account",
+        "Consultant",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Amount",
+        "Search Status",
+    ],
+    URLs.DAKOTA_VIDEO_SEARCH_TAB: [
+        "Date",
+        "Type",
+        "Watch",
+        "Featured On",
+        "Content Name",
+    ],
+    URLs.EVERGREEN_FUND_PERFORMANCE: [
+        "Account",
+        "Investment Strategy",
+        "Fund AUM",
+        "YTD Return",
+        "1yr",
+        "3yr",
+        "5yr",
+        "Inception Date",
+        "As of Date",
+    ],
+    URLs.FEE_SCHEDULES_DASHBOARD: [
+        "Public Pension Fund",
+        "Account",
+        "Investment Strategy",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Base Fee",
+        "Total Fee",
+    ],
+    URLs.FORECASTED_TRANSACTIONS: [
+        "Transaction Target (Private Company)",
+        "Transaction's Target Sector",
+        "Industry",
+        "Estimated Next Transaction Date",
+        "Last Transaction Date",
+        "Last Transaction Type",
+        "Last Transaction Sub-Type",
+        "Transaction Value",
+        "Transaction Name",
+    ],
+    URLs.FUND_FAMILY_MEMOS: [
+        "Fund Memo Name",
+        "Account",
+        "Account Investment Focus",
+        "Account Metro Area",
+        "Last Modified Date",
+    ],
+    URLs.FUND_LAUNCHES: [
+        "New Fund Name",
+        "Account",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Date of First Sale",
+        "Total Amount Sold",
+        "Total Offering Amount",
+        "Account: Metro Area",
+        "Account: AUM",
+    ],
+    URLs.FUNDRAISING_NEWS: [
+        "News Title",
+        "Account",
+        "Account Type",
+        "Topic",
+        "Sector",
+        "Geography",
+        "Publish Date",
+    ],
+    URLs.HEDGE_FUND_PERFORMANCE: [
+        "Account",
+        "Performance Name",
+        "YTD Return",
+        "1yr Return",
+        "3yr Return",
+        "5yr Return",
+        "10yr Return",
+        "As of Date",
+        "Inception Date",
+    ],
+    URLs.INVESTMENT_ALLOCATOR_ACCOUNTS_DEFAULT: [
+        "Account Name",
+        "Account Type",
+        "AUM",
+        "Metro Area",
+        "Website",
+    ],
+    URLs.INVESTMENT_ALLOCATOR_CONTACTS_DEFAULT: [
+        "Contact Name",
+        "Title",
+        "Contact Type",
+        "Asset Class Coverage",
+        "Account",
+        "Contact Metro Area",
+        "Email",
+        "Phone",
+        "Account: AUM",
+        "Account: Account Type",
+    ],
+    URLs.INVESTMENT_FIRM_ACCOUNTS_DEFAULT: [
+        "Account Name",
+        "Investment Focus",
+        "AUM",
+        "Metro Area",
+        "Website",
+    ],
+    URLs.INVESTMENT_FIRM_CONTACTS_DEFAULT: [
+        "Contact Name",
+        "Title",
+        "Contact Type",
+        "Account",
+        "Contact Metro Area",
+        "Email",
+        "Phone",
+        "Account: AUM",
+    ],
+    URLs.MANAGER_PRESENTATION_DASHBOARD: [
+        "Document Name",
+        "Account",
+        "Public Plan Minute",
+        "Investment Strategy",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Meeting Date",
+    ],
+    URLs.MY_ACCOUNTS_DEFAULT: [
+        "Account Name",
+        "Type",
+        "AUM",
+        "Metro Area",
+        "Website",
+    ],
+    URLs.PENSION_DOCUMENTS: [
+        "Document Name",
+        "Type",
+        "Account",
+        "Public Plan Minute",
+        "Investment Strategy",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Meeting Date",
+    ],
+    URLs.PORTFOLIO_COMPANIES_CONTACTS_DEFAULT: [
+        "Contact Name",
+        "Company Name",
+        "Title",
+        "Contact Metro Area",
+        "Account: Sector",
+        "Account: Industry",
+        "Account: Sub-Industry",
+    ],
+    URLs.PRIVATE_COMPANIES_TRANSACTIONS: [
+        "Transaction Target (Private Company)",
+        "Participant",
+        "Participant Type",
+        "Transaction Value",
+        "Transaction Type",
+        "Industry",
+        "Transaction Name",
+    ],
+    URLs.PRIVATE_FUND_SEARCH_TAB: [
+        "Account",
+        "Investment Strategy Name",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Vintage",
+        "Fundraising Status",
+        "Account: AUM",
+    ],
+    URLs.PUBLIC_COMPANY_SEARCH_TAB: [
+        "Account Name",
+        "Sector",
+        "Industry",
+        "Sub-Industry",
+    ],
+    URLs.PUBLIC_INVESTMENTS_SEARCH_TAB: [
+        "Account",
+        "Investment Strategy",
+        "Asset Class",
+        "Sub-Asset Class",
+        "Fund Balance",
+        "Funding Year",
+    ],
+    URLs.PUBLIC_PLAN_MINUTES_SEARCH_TAB: [
+        "Account",
+        "Public Plan Minute Name",
+        "Meeting Date",
+        "Meeting Minutes URL",
+        "Meeting Resource",
+        "Posted Date",
+        "Account: AUM",
+    ],
+    URLs.RECENT_TRANSACTIONS: [
+        "Transaction Name",
+        "Transaction Participants",
+        "Type",
+        "Transaction Target (Private Company)",
+        "Target Segment",
+        "Transaction's Target Sector",
+        "Transaction Type",
+        "Transaction Sub-Type",
+        "Transaction Value",
+    ],
+    URLs.UNIVERSITY_ALUMNI_CONTACTS_DEFAULT: [
+        "University Name",
+        "Metro Area",
+        "Total Number of Contacts",
+    ],
+}
@@ -0,0 +1,63 @@
+import json
+import allure
+import pytest
+from config.urls import URLs
+from .expected_columns import EXPECTED_COLUMNS
+
+# Runs instead of the per-tab Selenium column tests when METADATA_BACKEND=cdp.
+pytestmark = [
+    pytest.mark.cdp_backend,
+    pytest.mark.column_names,
+    pytest.mark.all_marketplace_access,
+    pytest.mark.dakota_ria_portal,
+    pytest.mark.dakota_transactions_ceos_access,
+    pytest.mark.fa_data_set,
+    pytest.mark.is_deal_team,
+    pytest.mark.dakota_private_markets_access,
+    pytest.mark.dakota_recommends_portal_access,
+    pytest.mark.dakota_family_office_portal,
+    pytest.mark.dakota_private_wealth_portal,
+    pytest.mark.dakota_international_portal,
+]
+
+
+@pytest.mark.parametrize(
+    "url_key",
+    [
+        pytest.param(url_key, id=URLs.TAB_MARKERS[url_key],
+                     marks=getattr(pytest.mark, URLs.TAB_MARKERS[url_key]))
+        for url_key in EXPECTED_COLUMNS
+    ],
+)
+def test_verify_tab_column_names_cdp(cdp_tab_metadata, url_key):
+    """
+    Verify a tab's leading column headers from metadata prefetched over CDP.
+    Steps:
+    1. Take the tab's metadata from the session-wide concurrent prefetch.
+    2. Attach the metadata to the Allure report.
+    3. Assert that the leading table headers match the expected columns.
+    """
+    print(f"Step 1: Reading prefetched metadata for {url_key}...")
+    metadata = cdp_tab_metadata[url_key]
+    assert not metadata.error, f"Tab {url_key} did not load over CDP: {metadata.error}"
+    if metadata.pinned:
+        pytest.skip(
+            f"A list view is pinned on {url_key}; the read-only CDP backend does not unpin. "
+            "Run with METADATA_BACKEND=selenium to unpin and check the default view."
+        )
+
+    allure.attach(
+        json.dumps(metadata.__dict__, indent=2),
+        name=f"{URLs.TAB_MARKERS[url_key]}_metadata",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    print("Actual column headers found:", metadata.columns)
+
+    expected_headers = EXPECTED_COLUMNS[url_key]
+    print("Expected column headers:", expected_headers)
+
+    comparison_actual = metadata.columns[:len(expected_headers)]
+    assert comparison_actual == expected_headers, (
+        f"Field names do not match!\nExpected: {expected_headers}\nActual: {comparison_actual}"
+    )
+    print("Test passed: Column names match expected values.")
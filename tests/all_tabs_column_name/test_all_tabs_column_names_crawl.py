@@ -0,0 +1,61 @@
+import json
+import allure
+import pytest
+from dataclasses import asdict
+from config.urls import URLs
+from .expected_columns import EXPECTED_COLUMNS
+
+# Runs instead of the per-tab column tests when TAB_CRAWL=1 (or TAB_CRAWL_SNAPSHOT is set).
+pytestmark = [
+    pytest.mark.tab_crawl,
+    pytest.mark.column_names,
+    pytest.mark.all_marketplace_access,
+    pytest.mark.dakota_ria_portal,
+    pytest.mark.dakota_transactions_ceos_access,
+    pytest.mark.fa_data_set,
+    pytest.mark.is_deal_team,
+    pytest.mark.dakota_private_markets_access,
+    pytest.mark.dakota_recommends_portal_access,
+    pytest.mark.dakota_family_office_portal,
+    pytest.mark.dakota_private_wealth_portal,
+    pytest.mark.dakota_international_portal,
+]
+
+
+@pytest.mark.parametrize(
+    "url_key",
+    [
+        pytest.param(url_key, id=URLs.TAB_MARKERS[url_key],
+                     marks=getattr(pytest.mark, URLs.TAB_MARKERS[url_key]))
+        for url_key in EXPECTED_COLUMNS
+    ],
+)
+def test_verify_tab_column_names_crawl(tab_crawl, url_key):
+    """
+    Verify a tab's leading column headers against the single-session tab crawl.
+    Steps:
+    1. Take the tab's capture from the crawl snapshot.
+    2. Attach the capture to the Allure report.
+    3. Assert that the leading table headers match the expected columns.
+    """
+    print(f"Step 1: Reading crawled metadata for {url_key}...")
+    capture = tab_crawl.tab(url_key)
+    assert "tab" not in capture.errors, f"Tab {url_key} did not load during the crawl: {capture.errors['tab']}"
+    if capture.pinned:
+        pytest.skip(f"A list view is still pinned on {url_key} after the crawler tried to unpin it.")
+
+    allure.attach(
+        json.dumps(asdict(capture), indent=2),
+        name=f"{URLs.TAB_MARKERS[url_key]}_crawl",
+        attachment_type=allure.attachment_type.JSON,
+    )
+    print("Actual column headers found:", capture.columns)
+
+    expected_headers = EXPECTED_COLUMNS[url_key]
+    print("Expected column headers:", expected_headers)
+
+    comparison_actual = capture.columns[:len(expected_headers)]
+    assert comparison_actual == expected_headers, (
+        f"Field names do not match!\nExpected: {expected_headers}\nActual: {comparison_actual}"
+    )
+    print("Test passed: Column names match expected values.")
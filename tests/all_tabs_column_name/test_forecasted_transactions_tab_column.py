@@ -1,9 +1,11 @@
-import time
 import allure
 from login_page import LoginPage
 from config.urls import URLs, get_url
+from pages import locators
+from pages.list_view_page import ListViewPage
+from .expected_columns import EXPECTED_COLUMNS
+from utils.timeouts import adaptive_wait
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pytest
 @pytest.mark.forecasted_transactions
@@ -19,7 +21,7 @@ import pytest
 @pytest.mark.dakota_private_wealth_portal
 @pytest.mark.dakota_international_portal
 
-def test_verify_forecasted_transactions_tab_column_names(driver, base_url, credentials):
+def test_verify_forecasted_transactions_tab_column_names(driver, base_url, credentials, dom_snapshots):
     """
     Verify that the columns in the Forecasted Transactions tab match the expected field names.
     Steps:
@@ -40,42 +42,27 @@ def test_verify_forecasted_transactions_tab_column_names(driver, base_url, crede
     forecasted_transactions_url = get_url(base_url, URLs.FORECASTED_TRANSACTIONS)
     driver.get(forecasted_transactions_url)
 
-    # Wait for the "Dakota Marketplace" link to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' link to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' link is clickable.")
+    # Wait for the tab's readiness checks, plus a usable grid since its headers are read
+    ListViewPage(driver).wait_until_ready(URLs.FORECASTED_TRANSACTIONS, extra_checks=["grid_ready"])
+    print("Tab is ready.")
 
 
     print("Waiting for Forecasted Transactions page to load (header visible)...")
-    wait = WebDriverWait(driver, 30)
     header_selector = (By.XPATH, "//div[@class='dropdownStyling']")
-    wait.until(EC.visibility_of_element_located(header_selector))
+    adaptive_wait(driver, "list_view_header", 30).until(EC.visibility_of_element_located(header_selector))
     print("Forecasted Transactions page loaded.")
 
     print("Step 3: Checking if 'Unpin this List View' button appears and handling it if present...")
-    try:
-        unpin_btn = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@title='Unpin this List View']"))
-        )
-        print("'Unpin this List View' button found. Attempting to click using JavaScript to ensure interaction.")
-        driver.execute_script("arguments[0].click();", unpin_btn)
-        time.sleep(2)
-
-        driver.refresh()
-        header_selector = (By.XPATH, "//div[@class='dropdownStyling']")
-        wait.until(EC.visibility_of_element_located(header_selector))
+    if ListViewPage(driver).ensure_unpinned(URLs.FORECASTED_TRANSACTIONS, trust_baseline=True):
         print("Page refreshed after unpinning.")
-    except Exception:
+    else:
         print("No 'Unpin this List View' button found or error handling it, continuing.")
 
     print("Step 4: Fetching column header names from the Forecasted Transactions table...")
-    field_xpath = "//table[contains(@class,'slds-table')]//span[contains(@class,'slds-truncate') and normalize-space(text())]"
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.XPATH, field_xpath)))
-    field_elements = driver.find_elements(By.XPATH, field_xpath)
-    actual_headers = [el.text.strip() for el in field_elements if el.text.strip()]
+    actual_headers = adaptive_wait(driver, "column_headers", 10).until(
+        lambda d: locators.texts(d, locators.GRID_LABELS)
+    )
+    dom_snapshots.checkpoint("column_headers")
 
     # Take screenshot and attach to Allure just before comparing both lists
     screenshot_png = driver.get_screenshot_as_png()
@@ -89,17 +76,7 @@ def test_verify_forecasted_transactions_tab_column_names(driver, base_url, crede
     print("Actual column headers found:", actual_headers)
 
     # Update this list to match the actual column names for Forecasted Transactions tab
-    expected_headers = [
-        'Transaction Target (Private Company)',
-        "Transaction's Target Sector",
-        'Industry',
-        'Estimated Next Transaction Date',
-        'Last Transaction Date',
-        'Last Transaction Type',
-        'Last Transaction Sub-Type',
-        'Transaction Value',
-        'Transaction Name'
-    ]
+    expected_headers = EXPECTED_COLUMNS[URLs.FORECASTED_TRANSACTIONS]
     print("Expected column headers for Forecasted Transactions tab:", expected_headers)
 
     # Compare only the expected number of headers in correct order
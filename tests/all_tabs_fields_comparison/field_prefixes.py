@@ -0,0 +1,24 @@
+"""Object prefixes stripped before comparing a tab's two field lists."""
+
+import re
+
+from config.urls import URLs
+
+# Additional Filter names related-object fields as "Account: AUM"; Select Fields To Display does not.
+DEFAULT_FILTER_PREFIXES = (r"^Account:\s*",)
+
+ADDITIONAL_FILTER_PREFIXES = {
+    URLs.FILINGS_13F_INVESTMENTS_SEARCH_TAB: (r"^Account:\s*", r"^Investment Strategy:\s*"),
+    URLs.PUBLIC_INVESTMENTS_SEARCH_TAB: (r"^Account:\s*", r"^Investment Strategy:\s*"),
+}
+
+# Tabs whose Select Fields To Display list carries the prefixes too.
+SELECT_FIELD_PREFIXES = {
+    URLs.PUBLIC_INVESTMENTS_SEARCH_TAB: (r"^Account:\s*", r"^Investment Strategy:\s*"),
+}
+
+
+def remove_prefixes(text, prefixes):
+    for prefix in prefixes:
+        text = re.sub(prefix, "", text, flags=re.IGNORECASE)
+    return text.strip()
@@ -0,0 +1,120 @@
+import json
+import allure
+import pytest
+from config.urls import URLs
+from .field_prefixes import (
+    ADDITIONAL_FILTER_PREFIXES,
+    DEFAULT_FILTER_PREFIXES,
+    SELECT_FIELD_PREFIXES,
+    remove_prefixes,
+)
+
+# Runs instead of the per-tab fields comparison tests when TAB_CRAWL=1 (or TAB_CRAWL_SNAPSHOT is set).
+pytestmark = [
+    pytest.mark.tab_crawl,
+    pytest.mark.fields_comparison,
+    pytest.mark.all_marketplace_access,
+    pytest.mark.dakota_ria_portal,
+    pytest.mark.dakota_transactions_ceos_access,
+    pytest.mark.fa_data_set,
+    pytest.mark.is_deal_team,
+    pytest.mark.dakota_private_markets_access,
+    pytest.mark.dakota_recommends_portal_access,
+    pytest.mark.dakota_family_office_portal,
+    pytest.mark.dakota_private_wealth_portal,
+    pytest.mark.dakota_international_portal,
+]
+
+# Tabs with a per-tab fields comparison test.
+FIELDS_COMPARISON_TABS = [
+    URLs.FILINGS_13F_INVESTMENTS_SEARCH_TAB,
+    URLs.ACCOUNTS_DEFAULT,
+    URLs.ALL_DOCUMENTS,
+    URLs.CONFERENCE_SEARCH_TAB,
+    URLs.CONSULTANT_REVIEWS,
+    URLs.CONTACT_DEFAULT,
+    URLs.DAKOTA_CITY_GUIDES,
+    URLs.DAKOTA_SEARCHES_TAB,
+    URLs.DAKOTA_VIDEO_SEARCH_TAB,
+    URLs.FEE_SCHEDULES_DASHBOARD,
+    URLs.FORECASTED_TRANSACTIONS,
+    URLs.INVESTMENT_ALLOCATOR_ACCOUNTS_DEFAULT,
+    URLs.INVESTMENT_ALLOCATOR_CONTACTS_DEFAULT,
+    URLs.INVESTMENT_FIRM_ACCOUNTS_DEFAULT,
+    URLs.INVESTMENT_FIRM_CONTACTS_DEFAULT,
+    URLs.MANAGER_PRESENTATION_DASHBOARD,
+    URLs.MY_ACCOUNTS_DEFAULT,
+    URLs.PENSION_DOCUMENTS,
+    URLs.PORTFOLIO_COMPANIES_CONTACTS_DEFAULT,
+    URLs.PRIVATE_COMPANIES_TRANSACTIONS,
+    URLs.PRIVATE_FUND_SEARCH_TAB,
+    URLs.PUBLIC_COMPANY_SEARCH_TAB,
+    URLs.PUBLIC_INVESTMENTS_SEARCH_TAB,
+    URLs.PUBLIC_PLAN_MINUTES_SEARCH_TAB,
+    URLs.RECENT_TRANSACTIONS,
+]
+
+
+@pytest.mark.parametrize(
+    "url_key",
+    [
+        pytest.param(url_key, id=URLs.TAB_MARKERS[url_key],
+                     marks=getattr(pytest.mark, URLs.TAB_MARKERS[url_key]))
+        for url_key in FIELDS_COMPARISON_TABS
+    ],
+)
+def test_verify_tab_fields_comparison_crawl(tab_crawl, field_snapshots, url_key):
+    """
+    Compare a tab's "Select Fields To Display" and Additional Filter lists from the tab crawl.
+    Steps:
+    1. Take both field lists from the crawl snapshot.
+    2. Strip the tab's object prefixes from the Additional Filter names.
+    3. Attach both lists to the Allure report.
+    4. Assert both lists contain the same fields (case insensitive, order independent).
+    """
+    print(f"Step 1: Reading crawled field lists for {url_key}...")
+    capture = tab_crawl.tab(url_key)
+    for section in ("tab", "select_fields", "additional_filter"):
+        assert section not in capture.errors, (
+            f"Crawl of {url_key} failed to read {section}: {capture.errors[section]}"
+        )
+    select_fields_list = capture.select_fields
+    print(f"  Found {len(select_fields_list)} fields in Select Fields To Display modal")
+
+    print("Step 2: Removing object prefixes from Additional Filter fields...")
+    filter_prefixes = ADDITIONAL_FILTER_PREFIXES.get(url_key, DEFAULT_FILTER_PREFIXES)
+    additional_filter_fields_list = [
+        remove_prefixes(field, filter_prefixes) for field in capture.additional_filter
+    ]
+    print(f"  Found {len(additional_filter_fields_list)} fields in Additional Filter combobox")
+    field_snapshots.record(
+        select_fields=select_fields_list, additional_filter=additional_filter_fields_list
+    )
+
+    print("Step 3: Attaching both field lists to Allure...")
+    allure.attach(
+        json.dumps(
+            {"select_fields": select_fields_list, "additional_filter": additional_filter_fields_list},
+            indent=2,
+        ),
+        name=f"{URLs.TAB_MARKERS[url_key]}_fields_crawl",
+        attachment_type=allure.attachment_type.JSON,
+    )
+
+    print("Step 4: Comparing both field lists (case insensitive, order independent)...")
+    select_prefixes = SELECT_FIELD_PREFIXES.get(url_key, ())
+    select_fields_normalized = sorted(
+        remove_prefixes(field, select_prefixes).lower() for field in select_fields_list if field.strip()
+    )
+    additional_filter_normalized = sorted(
+        field.lower() for field in additional_filter_fields_list if field.strip()
+    )
+    only_in_select_fields = sorted(set(select_fields_normalized) - set(additional_filter_normalized))
+    only_in_additional_filter = sorted(set(additional_filter_normalized) - set(select_fields_normalized))
+    assert select_fields_normalized == additional_filter_normalized, (
+        f"FIELD COMPARISON FAILED for {url_key}\n"
+        f"Fields ONLY in 'Select Fields To Display': {only_in_select_fields or '(none)'}\n"
+        f"Fields ONLY in 'Additional Filter': {only_in_additional_filter or '(none)'}"
+    )
+    field_snapshots.mark_verified()
+    print("Test passed: Both field lists match (case insensitive, order independent).")
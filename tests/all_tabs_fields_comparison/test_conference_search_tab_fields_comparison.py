@@ -5,8 +5,10 @@ import csv
 import io
 from login_page import LoginPage
 from config.urls import URLs, get_url
+from pages import locators
+from pages.list_view_page import ListViewPage
+from utils.timeouts import adaptive_wait
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pytest
 
@@ -80,7 +82,7 @@ def generate_fields_comparison_csv(
 @pytest.mark.dakota_international_portal
 
 
-def test_conference_search_tab_fields_comparison(driver, base_url, credentials):
+def test_conference_search_tab_fields_comparison(driver, base_url, credentials, field_snapshots, dom_snapshots):
     """
     End-to-end test for Conference Search Tab tab Fields Comparison:
         - Login
@@ -99,7 +101,6 @@ def test_conference_search_tab_fields_comparison(driver, base_url, credentials):
         - Compare both field lists (case insensitive, order independent)
         - All steps include Allure screenshots and csv of comparison
     """
-    wait = WebDriverWait(driver, 20)
 
     print("Step 1: Logging in...")
     username, password = credentials
@@ -119,59 +120,42 @@ def test_conference_search_tab_fields_comparison(driver, base_url, credentials):
     print("Step 2: Navigating to Conference Search Tab tab...")
     driver.get(get_url(base_url, URLs.CONFERENCE_SEARCH_TAB))
 
-    # Wait for the "Dakota Marketplace" link to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' link to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' link is clickable.")
-
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.CONFERENCE_SEARCH_TAB)
+    print("Tab is ready.")
 
     print("Step 3: Checking if Unpin is needed and performing if available...")
-    try:
-        unpin_btn = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@title='Unpin this List View']"))
-        )
-        driver.execute_script("arguments[0].click();", unpin_btn)
-        time.sleep(1)
-        driver.refresh()
-        wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    if ListViewPage(driver).ensure_unpinned(URLs.CONFERENCE_SEARCH_TAB, trust_baseline=True):
         print("  Unpinned List View.")
-        time.sleep(5)
-    except Exception:
+    else:
         print("  Unpin not required or button not found.")
 
     print("Step 4: Saving header...")
-    original_header = wait.until(
+    original_header = adaptive_wait(driver, "list_view_header", 20).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     print(f"  Saved header: {original_header}")
     time.sleep(5)
 
     print("Step 5: Clicking on 'Select Fields To Display' button...")
-    select_fields_btn = wait.until(
+    select_fields_btn = adaptive_wait(driver, "select_fields_btn", 20).until(
         EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Select Fields To Display']"))
     )
     driver.execute_script("arguments[0].click();", select_fields_btn)
     time.sleep(3)
 
     print("Step 6: Extracting fields from Select Fields To Display modal...")
-    field_elements = wait.until(
-        EC.presence_of_all_elements_located((By.XPATH, "//li[@role='presentation']"))
+    select_fields_list = adaptive_wait(driver, "field_elements", 20).until(
+        lambda d: locators.texts(d, locators.SELECT_FIELDS_OPTIONS)
     )
-    select_fields_list = []
-    for el in field_elements:
-        field_text = el.text.strip()
-        if field_text:
-            select_fields_list.append(field_text)
+    dom_snapshots.checkpoint("select_fields_modal")
     
     select_fields_count = len(select_fields_list)
     print(f"  Found {select_fields_count} fields in Select Fields To Display modal")
     print("  Fields list:")
     for idx, field in enumerate(select_fields_list, 1):
         print(f"    {idx}. {field}")
+    field_snapshots.record(select_fields=select_fields_list)
 
     print("Step 7: Taking screenshot of Select Fields To Display modal...")
     with allure.step("Select Fields To Display modal"):
@@ -182,30 +166,31 @@ def test_conference_search_tab_fields_comparison(driver, base_url, credentials):
         )
 
     print("Step 8: Clicking on Cancel button...")
-    cancel_btn = wait.until(
+    cancel_btn = adaptive_wait(driver, "cancel_btn", 20).until(
         EC.element_to_be_clickable((By.XPATH, "//button[contains(@class,'slds-button_neutral') and text()='Cancel']"))
     )
     driver.execute_script("arguments[0].click();", cancel_btn)
     time.sleep(2)
 
     print("Step 9: Clicking on Additional Filter button...")
-    additional_filter_btn = wait.until(
+    additional_filter_btn = adaptive_wait(driver, "additional_filter_btn", 20).until(
         EC.element_to_be_clickable((By.XPATH, "//button[contains(@class,'additionalFiltersStyling') and .//span[text()='Additional Filtering']]"))
     )
     driver.execute_script("arguments[0].click();", additional_filter_btn)
     time.sleep(2)
 
     print("Step 10: Clicking on 'Select a Field' button...")
-    select_field_btn = wait.until(
+    select_field_btn = adaptive_wait(driver, "select_field_btn", 20).until(
         EC.element_to_be_clickable((By.XPATH, "//span[normalize-space()='Select a Field']"))
     )
     driver.execute_script("arguments[0].click();", select_field_btn)
     time.sleep(2)
 
     print("Step 11: Extracting fields from Additional Filter combobox modal...")
-    combobox_elements = wait.until(
+    combobox_elements = adaptive_wait(driver, "combobox_elements", 20).until(
         EC.presence_of_all_elements_located((By.XPATH, "//lightning-base-combobox-item[contains(@class, 'slds-listbox__option')]"))
     )
+    dom_snapshots.checkpoint("additional_filter_options")
     additional_filter_fields_list = []
     for el in combobox_elements:
         field_text = el.text.strip()
@@ -222,6 +207,7 @@ def test_conference_search_tab_fields_comparison(driver, base_url, credentials):
     print("  Fields list:")
     for idx, field in enumerate(additional_filter_fields_list, 1):
         print(f"    {idx}. {field}")
+    field_snapshots.record(additional_filter=additional_filter_fields_list)
 
     print("Step 12: Taking screenshot of Additional Filter combobox modal...")
     with allure.step("Additional Filter combobox modal"):
@@ -328,6 +314,7 @@ def test_conference_search_tab_fields_comparison(driver, base_url, credentials):
         f"{'='*80}"
     )
     
+    field_snapshots.mark_verified()
     print("\n✓ Test completed successfully. Both field lists match (case insensitive, order independent).")
 
 
@@ -1,9 +1,12 @@
 import time
 import allure
-import random
 import re
 from login_page import LoginPage
+from pages import locators
+from pages.list_view_page import ListViewPage
 from config.urls import URLs, get_url
+from utils.list_view_sweeper import automation_view_name
+from utils.timeouts import adaptive_wait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -51,7 +54,7 @@ def click_button_if_present(driver, xpath, timeout=2):
 @pytest.mark.dakota_private_wealth_portal
 @pytest.mark.dakota_international_portal
 
-def test_conference_search_tab_fields_display_functionality(driver, base_url, credentials):
+def test_conference_search_tab_fields_display_functionality(driver, base_url, credentials, field_snapshots):
     """
     End-to-end validation for the Conference Search tab fields display functionality.
     Test Steps:
@@ -68,8 +71,6 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
     Test fails if no header diff is detected after the steps.
     """
 
-    wait = WebDriverWait(driver, 20)
-
     # Step 1: Login
     print("[Step 1] Logging in to the application...")
     username, password = credentials
@@ -84,36 +85,22 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
     print("[Step 2] Navigating to Conference Search tab...")
     driver.get(get_url(base_url, URLs.CONFERENCE_SEARCH_TAB))
 
-    # Wait for the "Dakota Marketplace" link to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for \'Dakota Marketplace\' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("\'Dakota Marketplace\' row is clickable.")
-
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.CONFERENCE_SEARCH_TAB)
+    print("Tab is ready.")
     time.sleep(2)
     print("[✓] Conference Search tab loaded.")
 
     # Step 3: Try Unpin
     print("[Step 3] Checking for 'Unpin this List View' button...")
-    try:
-        unpin_btn = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@title='Unpin this List View']"))
-        )
-        driver.execute_script("arguments[0].click();", unpin_btn)
-        time.sleep(1)
-        driver.refresh()
-        wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    if ListViewPage(driver).ensure_unpinned(URLs.CONFERENCE_SEARCH_TAB):
         print("[✓] List view unpinned and page refreshed.")
-        time.sleep(2)
-    except Exception:
+    else:
         print("[i] No unpin needed (button not found or already unpinned).")
 
     # Step 4: Save Current Header
     print("[Step 4] Capturing original header for verification...")
-    original_header = wait.until(
+    original_header = adaptive_wait(driver, "list_view_header", 20).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     print(f"    Original List View Name: {original_header}")
@@ -121,24 +108,22 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
 
     # Step 4a: Save table column headers BEFORE field selection change
     print("[Step 4a] Saving table column headers BEFORE changing display fields:")
-    header_span_elems = driver.find_elements(By.XPATH, "//th[@role='columnheader']//span[contains(@class,'slds-truncate')]")
-    original_column_names = [elem.text.strip() for elem in header_span_elems if elem.text.strip()]
+    original_column_names = locators.texts(driver, locators.COLUMN_HEADER_LABELS)
     if not original_column_names:
         raise AssertionError("No table column headers found before changing Select Fields To Display.")
     print(f"    ({len(original_column_names)}) columns: {', '.join(original_column_names)}")
 
     # Step 5: Open Select Fields To Display
     print("[Step 5] Opening 'Select Fields To Display' dialog...")
-    select_fields_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Select Fields To Display']")))
+    select_fields_btn = adaptive_wait(driver, "select_fields_btn", 20).until(EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Select Fields To Display']")))
     driver.execute_script("arguments[0].click();", select_fields_btn)
     time.sleep(2)
 
     # Step 6: Scrape all field names from modal
     print("[Step 6] Modal read: extracting all fields from //li[@role='presentation']...")
-    field_elements = wait.until(
-        EC.presence_of_all_elements_located((By.XPATH, "//li[@role='presentation']"))
+    fields_list = adaptive_wait(driver, "field_elements", 20).until(
+        lambda d: locators.texts(d, locators.SELECT_FIELDS_OPTIONS)
     )
-    fields_list = [el.text.strip() for el in field_elements if el.text.strip()]
     print(f"    Total fields found: {len(fields_list)}")
     if not fields_list:
         raise AssertionError("No fields found in Select Fields To Display modal")
@@ -148,6 +133,8 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
     print("    Debug list (index -> field text):")
     for idx, field_name in enumerate(fields_list, start=1):
         print(f"      [{idx}] {field_name}")
+    field_snapshots.record(select_fields=fields_list)
+    field_snapshots.skip_if_unchanged()
 
     # Get first and last for further operations
     first_field_name = fields_list[0]
@@ -157,7 +144,7 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
     # Step 7: Select FIRST field and click all required buttons in sequence
     print("[Step 7] Action A: select FIRST field and run button sequence...")
     first_field_xpath = "(//li[@role='presentation'])[1]"
-    first_field_element = wait.until(EC.element_to_be_clickable((By.XPATH, first_field_xpath)))
+    first_field_element = adaptive_wait(driver, "first_field_element", 20).until(EC.element_to_be_clickable((By.XPATH, first_field_xpath)))
     driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", first_field_element)
     time.sleep(0.4)
     first_field_element.click()
@@ -190,7 +177,7 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
     if process_last_field:
         print("[Step 8] Action B: select LAST field and repeat button sequence...")
         last_field_xpath = f"(//li[@role='presentation'])[{len(fields_list)}]"
-        last_field_element = wait.until(EC.element_to_be_clickable((By.XPATH, last_field_xpath)))
+        last_field_element = adaptive_wait(driver, "last_field_element", 20).until(EC.element_to_be_clickable((By.XPATH, last_field_xpath)))
         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", last_field_element)
         time.sleep(0.4)
         last_field_element.click()
@@ -224,48 +211,42 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
 
     # Step 10: Click Add, apply changes
     print("[Step 10] Clicking Add button to confirm displayed columns...")
-    add_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Add']")))
+    add_btn = adaptive_wait(driver, "add_btn", 20).until(EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Add']")))
     add_btn.click()
     print("    Add button clicked.")
     time.sleep(6)
 
 
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.CONFERENCE_SEARCH_TAB)
+    print("Tab is ready.")
     # Step 11: Create new list view (Save As)
     print("[Step 11] Performing 'Save As' to create a custom list view...")
-    save_as_btn = WebDriverWait(driver, 10).until(
+    save_as_btn = adaptive_wait(driver, "save_as_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "(//button[normalize-space(.)='Save As'])[1]"))
     )
     driver.execute_script("arguments[0].click();", save_as_btn)
     time.sleep(2)
-    new_list_view_name = f"Automation by Mani {random.randint(1000, 9999)}"
+    new_list_view_name = automation_view_name()
     print(f"    Created List View Name: {new_list_view_name}")
 
-    name_input = WebDriverWait(driver, 30).until(
+    name_input = adaptive_wait(driver, "name_input", 30).until(
         EC.visibility_of_element_located((By.XPATH, "//input[@name='enter-list-view-name']"))
     )
     name_input.clear()
     name_input.send_keys(new_list_view_name)
 
-    save_btn = WebDriverWait(driver, 30).until(
+    save_btn = adaptive_wait(driver, "save_btn", 30).until(
         EC.element_to_be_clickable((By.XPATH, "(//button[normalize-space(.)='Save'])[2]"))
     )
     driver.execute_script("arguments[0].click();", save_btn)
     time.sleep(6)
 
 
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
-    saved_header = WebDriverWait(driver, 12).until(
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.CONFERENCE_SEARCH_TAB)
+    print("Tab is ready.")
+    saved_header = adaptive_wait(driver, "saved_header", 12).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     saved_base = re.split(r'\s*\(', saved_header, 1)[0].strip()
@@ -281,10 +262,9 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
 
     # Step 12: Table header check (main logic)
     print("[Step 12] Verifying that table headers have CHANGED after field selection...")
-    wait.until(EC.presence_of_element_located((By.XPATH, "//table[contains(@class,'slds-table')]")))
+    adaptive_wait(driver, "grid_table", 20).until(EC.presence_of_element_located((By.XPATH, "//table[contains(@class,'slds-table')]")))
     time.sleep(2)
-    header_span_elems_new = driver.find_elements(By.XPATH, "//th[@role='columnheader']//span[contains(@class,'slds-truncate')]")
-    new_column_names = [elem.text.strip() for elem in header_span_elems_new if elem.text.strip()]
+    new_column_names = locators.texts(driver, locators.COLUMN_HEADER_LABELS)
     if not new_column_names:
         raise AssertionError("No table column headers found after changing Select Fields To Display.")
 
@@ -318,34 +298,26 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
 
     # Step 14: Delete the custom list view
     print(f"[Step 14] Deleting the created list view '{new_list_view_name}' for cleanup...")
-    delete_btn = WebDriverWait(driver, 10).until(
-        EC.element_to_be_clickable((By.XPATH, "//button[.//svg[@data-key='delete'] or contains(@title,'Delete') or .//span[contains(normalize-space(.),'Delete')]]"))
+    delete_btn = ListViewPage(driver).wait_for_first_visible(
+        ListViewPage.DELETE_BUTTON_LOCATORS, "delete_btn", 10
     )
-    driver.execute_script("arguments[0].click();", delete_btn)
-    confirm_delete_btn = WebDriverWait(driver, 10).until(
+    ListViewPage(driver).js_click(delete_btn)
+    confirm_delete_btn = adaptive_wait(driver, "confirm_delete_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "(//button[contains(text(),'Delete')])"))
     )
     driver.execute_script("arguments[0].click();", confirm_delete_btn)
     time.sleep(12)
 
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.CONFERENCE_SEARCH_TAB)
+    print("Tab is ready.")
 
-    select_list_view_btn = WebDriverWait(driver, 10).until(
+    select_list_view_btn = adaptive_wait(driver, "select_list_view_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "//button[@title='Select a List View']"))
     )
     driver.execute_script("arguments[0].click();", select_list_view_btn)
     time.sleep(1.2)
-    views_after_delete = WebDriverWait(driver, 10).until(
-        EC.presence_of_all_elements_located((By.XPATH, "//div[@role='main']//li//a[1]"))
-    )
-    names_after = [el.text.strip() for el in views_after_delete]
-    assert new_list_view_name not in names_after, f"List view '{new_list_view_name}' still appears after deletion"
+    assert not ListViewPage(driver).view_exists(new_list_view_name), f"List view '{new_list_view_name}' still appears after deletion"
     print(f"    [✓] List view '{new_list_view_name}' was deleted successfully and no longer appears.")
 
     with allure.step(f"After deletion - list view removed: {new_list_view_name}"):
@@ -355,6 +327,8 @@ def test_conference_search_tab_fields_display_functionality(driver, base_url, cr
             attachment_type=allure.attachment_type.PNG
         )
 
+    field_snapshots.mark_verified()
+
     # Final
     print("\n[✔] Test completed successfully. Summary:")
     print(f"    - Original columns: {', '.join(original_column_names)}")
@@ -2,8 +2,10 @@ import time
 import allure
 from login_page import LoginPage
 from config.urls import URLs, get_url
+from pages import locators
+from pages.list_view_page import ListViewPage
+from utils.timeouts import adaptive_wait
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pytest
 @pytest.mark.conference_search
@@ -20,7 +22,7 @@ import pytest
 @pytest.mark.dakota_international_portal
 
 
-def test_conference_search_tab_lazy_loading(driver, base_url, credentials):
+def test_conference_search_tab_lazy_loading(driver, base_url, credentials, lazy_load_metrics):
     """
     End-to-end test for Conference Search tab lazy loading functionality:
         - Login
@@ -38,8 +40,7 @@ def test_conference_search_tab_lazy_loading(driver, base_url, credentials):
             * If >= 2000 records loaded → PASS
         - All steps include Allure screenshots
     """
-    wait = WebDriverWait(driver, 20)
-    TARGET_RECORDS = 2000
+    TARGET_RECORDS = lazy_load_metrics.target_records
     MAX_SCROLL_ATTEMPTS_WITHOUT_LOAD = 5
     SCROLL_WAIT_TIME = 2
     AGGRESSIVE_SCROLL_ATTEMPTS = 5
@@ -56,35 +57,22 @@ def test_conference_search_tab_lazy_loading(driver, base_url, credentials):
     print("Step 2: Navigating to Conference Search tab...")
     driver.get(get_url(base_url, URLs.CONFERENCE_SEARCH_TAB))
 
-    # Wait for the "Dakota Marketplace" link to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' link to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' link is clickable.")
-
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.CONFERENCE_SEARCH_TAB)
+    print("Tab is ready.")
     time.sleep(3)
 
     with allure.step("After navigating to Conference Search tab"):
         allure.attach(driver.get_screenshot_as_png(), name='after_navigate_conference_search.png', attachment_type=allure.attachment_type.PNG)
 
     print("Step 3: Checking if Unpin is needed and performing if available...")
-    try:
-        unpin_btn = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@title='Unpin this List View']"))
-        )
-        driver.execute_script("arguments[0].click();", unpin_btn)
-        time.sleep(1)
-        driver.refresh()
-        wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    if ListViewPage(driver).ensure_unpinned(URLs.CONFERENCE_SEARCH_TAB, trust_baseline=True):
         print("  Unpinned List View.")
-    except Exception:
+    else:
         print("  Unpin not required or button not found.")
 
     print("Step 4: Storing header...")
-    header_element = wait.until(
+    header_element = adaptive_wait(driver, "list_view_header", 20).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     )
     stored_header = header_element.text.strip()
@@ -92,11 +80,10 @@ def test_conference_search_tab_lazy_loading(driver, base_url, credentials):
     time.sleep(3)
 
     print("Step 5: Locating initial records...")
-    wait.until(EC.presence_of_element_located((By.XPATH, "//tbody")))
+    adaptive_wait(driver, "grid_body", 20).until(EC.presence_of_element_located((By.XPATH, "//tbody")))
     time.sleep(2)
 
-    initial_records = driver.find_elements(By.XPATH, "//tbody/tr/td[1]")
-    initial_count = len(initial_records)
+    initial_count = locators.count(driver, locators.GRID_ROW_CELLS)
     print(f"  Initial count of loaded records: {initial_count}")
 
     if initial_count == 0:
@@ -113,22 +100,16 @@ def test_conference_search_tab_lazy_loading(driver, base_url, credentials):
     total_scroll_attempts = 0
     max_scroll_attempts = 500
 
+    lazy_load_metrics.begin(initial_count)
     while current_count < TARGET_RECORDS and scroll_attempts_without_load < MAX_SCROLL_ATTEMPTS_WITHOUT_LOAD and total_scroll_attempts < max_scroll_attempts:
         print(f"  Current record count: {current_count} (Target: {TARGET_RECORDS})")
-        
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(SCROLL_WAIT_TIME)
-        
-        driver.execute_script("window.scrollBy(0, 500);")
-        time.sleep(SCROLL_WAIT_TIME)
-        
+
+        # Scroll to the bottom (nudging once if needed) and wait for the next page to render
         total_scroll_attempts += 1
         
-        time.sleep(1)
-        
+        # Check for new records
         try:
-            current_records = driver.find_elements(By.XPATH, "//tbody/tr/td[1]")
-            current_count = len(current_records)
+            current_count = lazy_load_metrics.scroll_for_next_page(driver, previous_count, SCROLL_WAIT_TIME)
             
             if current_count > previous_count:
                 print(f"    [OK] New records loaded! Count increased from {previous_count} to {current_count} (+{current_count - previous_count})")
@@ -161,8 +142,7 @@ def test_conference_search_tab_lazy_loading(driver, base_url, credentials):
                     
                     time.sleep(2)
                     try:
-                        check_records = driver.find_elements(By.XPATH, "//tbody/tr/td[1]")
-                        check_count = len(check_records)
+                        check_count = locators.count(driver, locators.GRID_ROW_CELLS)
                         if check_count > current_count:
                             current_count = check_count
                             previous_count = check_count
@@ -181,6 +161,7 @@ def test_conference_search_tab_lazy_loading(driver, base_url, credentials):
     print(f"  Final record count: {current_count}")
     print(f"  Target was: {TARGET_RECORDS}")
     print(f"  Total scroll attempts: {total_scroll_attempts}")
+    lazy_load_metrics.finish(current_count)
 
     with allure.step(f"Final state - {current_count} records loaded"):
         allure.attach(driver.get_screenshot_as_png(), name=f'final_{current_count}_records.png', attachment_type=allure.attachment_type.PNG)
@@ -225,8 +206,7 @@ def test_conference_search_tab_lazy_loading(driver, base_url, credentials):
                     time.sleep(1.5)
                 
                 time.sleep(3)
-                final_check_records = driver.find_elements(By.XPATH, "//tbody/tr/td[1]")
-                final_check_count = len(final_check_records)
+                final_check_count = locators.count(driver, locators.GRID_ROW_CELLS)
                 
                 if final_check_count > current_count:
                     print(f"  [OK] Found more records after aggressive scroll! Count: {final_check_count}")
@@ -258,11 +238,10 @@ def test_conference_search_tab_lazy_loading(driver, base_url, credentials):
             )
 
     print("\nStep 9: Verifying record accessibility...")
-    final_records = driver.find_elements(By.XPATH, "//tbody/tr/td[1]")
-    visible_count = len([r for r in final_records if r.is_displayed()])
+    visible_count = locators.count(driver, locators.GRID_ROW_CELLS, visible=True)
     print(f"  Visible records: {visible_count} out of {current_count} total")
     
-    current_header = wait.until(
+    current_header = adaptive_wait(driver, "list_view_header", 20).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     print(f"  Header verification: {current_header}")
@@ -1,11 +1,13 @@
 import time
 import allure
 import re
-import random
 from login_page import LoginPage
+from pages import locators
+from pages.list_view_page import ListViewPage
 from config.urls import URLs, get_url
+from utils.list_view_sweeper import automation_view_name
+from utils.timeouts import adaptive_wait
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pytest
 @pytest.mark.all_documents
@@ -32,7 +34,6 @@ def test_all_documents_list_view_crud(driver, base_url, credentials):
         - Verify deletion
         - Include Allure screenshots for key steps
     """
-    wait = WebDriverWait(driver, 20)
 
     print("[Step 1] Logging in to the application...")
     username, password = credentials
@@ -43,82 +44,61 @@ def test_all_documents_list_view_crud(driver, base_url, credentials):
     print("[Step 2] Navigating to All Documents tab...")
     driver.get(get_url(base_url, URLs.ALL_DOCUMENTS))
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
-
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.ALL_DOCUMENTS)
+    print("Tab is ready.")
 
     print("[Step 3] Checking for 'Unpin this List View' button...")
-    try:
-        unpin_btn = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@title='Unpin this List View']"))
-        )
-        driver.execute_script("arguments[0].click();", unpin_btn)
-        time.sleep(1)
-        driver.refresh()
-        wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    if ListViewPage(driver).ensure_unpinned(URLs.ALL_DOCUMENTS):
         print("  Unpinned List View.")
-    except Exception:
+    else:
         print("  Unpin not required, or the button was not found.")
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.ALL_DOCUMENTS)
+    print("Tab is ready.")
 
     print("[Step 4] Capturing original header for verification...")
-    original_header = wait.until(
+    original_header = adaptive_wait(driver, "list_view_header", 20).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     original_base = re.split(r'\s*\(', original_header, 1)[0].strip()
     time.sleep(1)
 
     print("[Step 5] Capturing original table column texts...")
-    initial_cols = [el.text.strip() for el in driver.find_elements(By.XPATH, "//div[@class='slds-truncate']")]
+    initial_cols = locators.texts(driver, locators.GRID_CELL_LABELS)
 
     print("Screenshot: Before saving a list view")
     with allure.step("Before saving new All Documents list view"):
         allure.attach(driver.get_screenshot_as_png(), attachment_type=allure.attachment_type.PNG)
 
     print("[Step 6] Performing 'Save As' to create a custom list view...")
-    save_as_btn = WebDriverWait(driver, 10).until(
+    save_as_btn = adaptive_wait(driver, "save_as_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "(//button[normalize-space(.)='Save As'])[1]"))
     )
     driver.execute_script("arguments[0].click();", save_as_btn)
     time.sleep(3)
-    new_list_view_name = f"Automation by Mani {random.randint(1000, 9999)}"
+    new_list_view_name = automation_view_name()
     print(f"  New List View Name: {new_list_view_name}")
 
-    name_input = WebDriverWait(driver, 10).until(
+    name_input = adaptive_wait(driver, "name_input", 10).until(
         EC.visibility_of_element_located((By.XPATH, "//input[@name='enter-list-view-name']"))
     )
     name_input.clear()
     name_input.send_keys(new_list_view_name)
 
-    save_btn = WebDriverWait(driver, 10).until(
+    save_btn = adaptive_wait(driver, "save_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "(//button[normalize-space(.)='Save'])[2]"))
     )
     driver.execute_script("arguments[0].click();", save_btn)
     time.sleep(6)
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.ALL_DOCUMENTS)
+    print("Tab is ready.")
 
     print("  Checking whether the new list view loads with the correct name...")
-    saved_header = WebDriverWait(driver, 12).until(
+    saved_header = adaptive_wait(driver, "saved_header", 12).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     saved_base = re.split(r'\s*\(', saved_header, 1)[0].strip()
@@ -128,73 +108,59 @@ def test_all_documents_list_view_crud(driver, base_url, credentials):
         allure.attach(driver.get_screenshot_as_png(), name=f'{new_list_view_name}_after_save.png', attachment_type=allure.attachment_type.PNG)
 
     print("[Step 7] Renaming the list view...")
-    rename_list_view_btn = WebDriverWait(driver, 10).until(
+    rename_list_view_btn = adaptive_wait(driver, "rename_list_view_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "//button[@title='Rename List View']"))
     )
     driver.execute_script("arguments[0].click();", rename_list_view_btn)
     time.sleep(5)
-    renamed_name = f"Automation by Mani {random.randint(1000, 9999)}"
+    renamed_name = automation_view_name()
     print(f"  Renamed List View Name: {renamed_name}")
-    rename_input = WebDriverWait(driver, 10).until(
+    rename_input = adaptive_wait(driver, "rename_input", 10).until(
         EC.visibility_of_element_located((By.XPATH, "//input[@name='enter-list-view-name']"))
     )
     rename_input.clear()
     rename_input.send_keys(renamed_name)
-    rename_confirm_btn = WebDriverWait(driver, 10).until(
+    rename_confirm_btn = adaptive_wait(driver, "rename_confirm_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "//button[normalize-space()='Rename']"))
     )
     driver.execute_script("arguments[0].click();", rename_confirm_btn)
     time.sleep(6)
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.ALL_DOCUMENTS)
+    print("Tab is ready.")
 
     with allure.step(f"After rename to: {renamed_name}"):
         allure.attach(driver.get_screenshot_as_png(), name=f'{renamed_name}_after_rename.png', attachment_type=allure.attachment_type.PNG)
 
     print("  Checking whether the rename was successful...")
-    renamed_header = WebDriverWait(driver, 10).until(
+    renamed_header = adaptive_wait(driver, "renamed_header", 10).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     renamed_base = re.split(r'\s*\(', renamed_header, 1)[0].strip()
     assert renamed_base == renamed_name
 
     print("[Step 8] Deleting the list view and confirming deletion...")
-    delete_btn = WebDriverWait(driver, 30).until(
-        EC.element_to_be_clickable((By.XPATH, "//button[.//svg[@data-key='delete'] or contains(@title,'Delete') or .//span[contains(normalize-space(.),'Delete')]]"))
+    delete_btn = ListViewPage(driver).wait_for_first_visible(
+        ListViewPage.DELETE_BUTTON_LOCATORS, "delete_btn", 30
     )
-    driver.execute_script("arguments[0].click();", delete_btn)
-    confirm_delete_btn = WebDriverWait(driver, 30).until(
+    ListViewPage(driver).js_click(delete_btn)
+    confirm_delete_btn = adaptive_wait(driver, "confirm_delete_btn", 30).until(
         EC.element_to_be_clickable((By.XPATH, "(//button[contains(text(),'Delete')])"))
     )
     driver.execute_script("arguments[0].click();", confirm_delete_btn)
     time.sleep(12)
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
-
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    # Wait for the tab's readiness checks before proceeding
+    ListViewPage(driver).wait_until_ready(URLs.ALL_DOCUMENTS)
+    print("Tab is ready.")
 
     print("[Step 9] Verifying deleted list view is removed from dropdown...")
-    select_list_view_btn = WebDriverWait(driver, 30).until(
+    select_list_view_btn = adaptive_wait(driver, "select_list_view_btn", 30).until(
         EC.element_to_be_clickable((By.XPATH, "//button[@title='Select a List View']"))
     )
     driver.execute_script("arguments[0].click();", select_list_view_btn)
     time.sleep(2)
-    views_after_delete = WebDriverWait(driver, 30).until(
-        EC.presence_of_all_elements_located((By.XPATH, "//div[@role='main']//li//a[1]"))
-    )
-    names_after = [el.text.strip() for el in views_after_delete]
-    assert renamed_base not in names_after
+    assert not ListViewPage(driver).view_exists(renamed_base)
     print("Test completed successfully. The deleted list view no longer appears in the dropdown.")
 
@@ -0,0 +1 @@
+# Page performance tests
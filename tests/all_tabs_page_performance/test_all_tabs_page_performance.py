@@ -0,0 +1,77 @@
+import json
+import allure
+import pytest
+from config.urls import URLs, get_url
+
+pytestmark = [
+    pytest.mark.page_performance,
+    pytest.mark.all_marketplace_access,
+    pytest.mark.dakota_ria_portal,
+    pytest.mark.dakota_transactions_ceos_access,
+    pytest.mark.fa_data_set,
+    pytest.mark.is_deal_team,
+    pytest.mark.dakota_private_markets_access,
+    pytest.mark.dakota_recommends_portal_access,
+    pytest.mark.dakota_family_office_portal,
+    pytest.mark.dakota_private_wealth_portal,
+    pytest.mark.dakota_international_portal,
+]
+
+
+@pytest.mark.parametrize(
+    "url_key",
+    [
+        pytest.param(url_key, id=URLs.TAB_MARKERS[url_key],
+                     marks=getattr(pytest.mark, URLs.TAB_MARKERS[url_key]))
+        for url_key in URLs.ALL_KEYS
+    ],
+)
+def test_tab_page_performance(driver, base_url, credentials, page_performance, url_key):
+    """
+    Measure how fast a tab loads for the current portal.
+    Steps:
+    1. Login to the application.
+    2. Install the in-page performance recorder.
+    3. Navigate to the tab and wait for the grid header row and the list view header.
+    4. Collect Navigation Timing, LCP, long tasks and the time to grid-ready and header.
+    5. Attach the metrics and their trend to the Allure report.
+    6. Assert the metrics are within the tab's budget for this portal.
+    """
+    # login_page imports selenium.webdriver; keep it out of the collection pass.
+    from login_page import LoginPage
+
+    print("Step 1: Logging in...")
+    username, password = credentials
+    login_page = LoginPage(driver)
+    login_page.navigate_to_login(base_url)
+    login_page.login(username, password)
+
+    print("Step 2: Installing the performance recorder...")
+    page_performance.install()
+    print(f"  Recorder source: {page_performance.source}")
+
+    print(f"Step 3: Navigating to {url_key}...")
+    page_performance.navigate(get_url(base_url, url_key))
+    page_performance.wait_until_ready()
+
+    print("Step 4: Collecting page timings...")
+    result = page_performance.record(url_key, page_performance.collect())
+    for metric, value in result["metrics"].items():
+        change = result["trend"].get(metric, {}).get("change_pct")
+        trend_text = f" ({change:+.1f}% vs last {result['trend'][metric]['runs']} runs)" if change is not None else ""
+        print(f"  {metric}: {value}{trend_text}")
+
+    print("Step 5: Attaching metrics...")
+    with allure.step(f"Page performance - {url_key}"):
+        allure.attach(
+            json.dumps(result, indent=2),
+            name=f"{URLs.TAB_MARKERS[url_key]}_page_performance",
+            attachment_type=allure.attachment_type.JSON,
+        )
+
+    print("Step 6: Checking budget...")
+    assert not result["budget_breaches"], (
+        f"{url_key} is over its page load budget for {result['portal']}: "
+        + "; ".join(result["budget_breaches"])
+    )
+    print("Test passed: Page load is within budget.")
@@ -1,11 +1,12 @@
 import time
 import allure
 import re
-import random
 from login_page import LoginPage
+from pages.list_view_page import ListViewPage
 from config.urls import URLs, get_url
+from utils.list_view_sweeper import automation_view_name
+from utils.timeouts import adaptive_wait
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pytest
 @pytest.mark.accounts
@@ -37,50 +38,33 @@ def test_accounts_pin_unpin_functionality(driver, base_url, credentials):
         - Delete the list view
         - Include Allure screenshots for all key steps
     """
-    wait = WebDriverWait(driver, 20)
 
     print("[Step 1] Logging in...")
     username, password = credentials
     login_page = LoginPage(driver)
     login_page.navigate_to_login(base_url)
     login_page.login(username, password)
+    list_view_page = ListViewPage(driver)
 
     print("[Step 2] Navigating to Accounts tab...")
     driver.get(get_url(base_url, URLs.ACCOUNTS_DEFAULT))
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
-
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    # Wait for the tab's readiness checks before proceeding
+    list_view_page.wait_until_ready(URLs.ACCOUNTS_DEFAULT)
+    print("Tab is ready.")
 
     print("[Step 3] Checking whether Unpin is needed and clicking it if available...")
-    try:
-        unpin_btn = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@title='Unpin this List View']"))
-        )
-        driver.execute_script("arguments[0].click();", unpin_btn)
-        time.sleep(1)
-        driver.refresh()
-        wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    if list_view_page.ensure_unpinned(URLs.ACCOUNTS_DEFAULT):
         print("  Unpinned List View.")
-    except Exception:
+    else:
         print("  Unpin not required, or the button was not found.")
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
+    # Wait for the tab's readiness checks before proceeding
+    list_view_page.wait_until_ready(URLs.ACCOUNTS_DEFAULT)
+    print("Tab is ready.")
 
     print("[Step 4] Capturing original header...")
-    original_header = wait.until(
+    original_header = adaptive_wait(driver, "list_view_header", 20).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     original_base = re.split(r'\s*\(', original_header, 1)[0].strip()
@@ -93,36 +77,32 @@ def test_accounts_pin_unpin_functionality(driver, base_url, credentials):
         allure.attach(driver.get_screenshot_as_png(), attachment_type=allure.attachment_type.PNG)
 
     print("[Step 5] Creating a new list view...")
-    save_as_btn = WebDriverWait(driver, 10).until(
+    save_as_btn = adaptive_wait(driver, "save_as_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "(//button[normalize-space(.)='Save As'])[1]"))
     )
     driver.execute_script("arguments[0].click();", save_as_btn)
     time.sleep(7)
-    new_list_view_name = f"Automation by Mani {random.randint(1000, 9999)}"
+    new_list_view_name = automation_view_name()
     print(f"  New List View Name: {new_list_view_name}")
 
-    name_input = WebDriverWait(driver, 10).until(
+    name_input = adaptive_wait(driver, "name_input", 10).until(
         EC.visibility_of_element_located((By.XPATH, "//input[@name='enter-list-view-name']"))
     )
     name_input.clear()
     name_input.send_keys(new_list_view_name)
 
-    save_btn = WebDriverWait(driver, 10).until(
+    save_btn = adaptive_wait(driver, "save_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "(//button[normalize-space(.)='Save'])[2]"))
     )
     driver.execute_script("arguments[0].click();", save_btn)
     time.sleep(6)
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
+    # Wait for the tab's readiness checks before proceeding
+    list_view_page.wait_until_ready(URLs.ACCOUNTS_DEFAULT)
+    print("Tab is ready.")
 
     print("  Checking whether the new list view loads with the correct name...")
-    saved_header = WebDriverWait(driver, 12).until(
+    saved_header = adaptive_wait(driver, "saved_header", 12).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     saved_base = re.split(r'\s*\(', saved_header, 1)[0].strip()
@@ -133,7 +113,7 @@ def test_accounts_pin_unpin_functionality(driver, base_url, credentials):
         allure.attach(driver.get_screenshot_as_png(), name=f'{new_list_view_name}_after_create.png', attachment_type=allure.attachment_type.PNG)
 
     print("[Step 6] Pinning the new list view...")
-    pin_btn = WebDriverWait(driver, 10).until(
+    pin_btn = adaptive_wait(driver, "pin_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "//button[@title='Pin this List View']"))
     )
     driver.execute_script("arguments[0].click();", pin_btn)
@@ -145,17 +125,13 @@ def test_accounts_pin_unpin_functionality(driver, base_url, credentials):
 
     print("[Step 7] Refreshing page and verifying the pinned list view appears...")
     driver.refresh()
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    adaptive_wait(driver, "list_view_header", 20).until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
+    # Wait for the tab's readiness checks before proceeding
+    list_view_page.wait_until_ready(URLs.ACCOUNTS_DEFAULT)
+    print("Tab is ready.")
 
-    refreshed_header = wait.until(
+    refreshed_header = adaptive_wait(driver, "list_view_header", 20).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     refreshed_base = re.split(r'\s*\(', refreshed_header, 1)[0].strip()
@@ -166,7 +142,7 @@ def test_accounts_pin_unpin_functionality(driver, base_url, credentials):
         allure.attach(driver.get_screenshot_as_png(), name=f'{refreshed_base}_after_refresh_pinned.png', attachment_type=allure.attachment_type.PNG)
 
     print("[Step 8] Unpinning the list view and refreshing again...")
-    unpin_btn = WebDriverWait(driver, 30).until(
+    unpin_btn = adaptive_wait(driver, "unpin_btn", 30).until(
         EC.element_to_be_clickable((By.XPATH, "//button[@title='Unpin this List View']"))
     )
     driver.execute_script("arguments[0].click();", unpin_btn)
@@ -177,29 +153,22 @@ def test_accounts_pin_unpin_functionality(driver, base_url, credentials):
         allure.attach(driver.get_screenshot_as_png(), name=f'{new_list_view_name}_after_unpin.png', attachment_type=allure.attachment_type.PNG)
 
     driver.refresh()
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    adaptive_wait(driver, "list_view_header", 20).until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
+    # Wait for the tab's readiness checks before proceeding
+    list_view_page.wait_until_ready(URLs.ACCOUNTS_DEFAULT)
+    print("Tab is ready.")
 
     with allure.step(f"After unpin and refresh"):
         allure.attach(driver.get_screenshot_as_png(), name=f'after_unpin_refresh.png', attachment_type=allure.attachment_type.PNG)
     time.sleep(10)
 
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
+    # Wait for the tab's readiness checks before proceeding
+    list_view_page.wait_until_ready(URLs.ACCOUNTS_DEFAULT)
+    print("Tab is ready.")
 
     print("[Step 9] Verifying the original header appears after unpin...")
-    after_unpin_header = wait.until(
+    after_unpin_header = adaptive_wait(driver, "list_view_header", 20).until(
         EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']"))
     ).text.strip()
     after_unpin_base = re.split(r'\s*\(', after_unpin_header, 1)[0].strip()
@@ -211,62 +180,45 @@ def test_accounts_pin_unpin_functionality(driver, base_url, credentials):
 
     print("[Step 10] Deleting the created list view...")
     # Navigate to the created list view first by selecting it from the dropdown
-    select_list_view_btn = WebDriverWait(driver, 10).until(
+    select_list_view_btn = adaptive_wait(driver, "select_list_view_btn", 10).until(
         EC.element_to_be_clickable((By.XPATH, "//button[@title='Select a List View']"))
     )
     driver.execute_script("arguments[0].click();", select_list_view_btn)
     time.sleep(3)
 
     # Find and click the created list view
-    views_list = WebDriverWait(driver, 30).until(
-        EC.presence_of_all_elements_located((By.XPATH, "//div[@role='main']//li//a[1]"))
-    )
-    list_view_found = False
-    for view in views_list:
-        if view.text.strip() == new_list_view_name:
-            driver.execute_script("arguments[0].click();", view)
-            list_view_found = True
-            break
-
-    if not list_view_found:
+    created_view = list_view_page.find_view(new_list_view_name)
+    if created_view is not None:
+        list_view_page.js_click(created_view)
+    else:
         # Close the dropdown if the list view is not found
         driver.execute_script("arguments[0].click();", select_list_view_btn)
         raise Exception(f"Created list view '{new_list_view_name}' not found in dropdown")
 
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    adaptive_wait(driver, "list_view_header", 20).until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
 
     # Delete the list view
-    delete_btn = WebDriverWait(driver, 30).until(
-        EC.element_to_be_clickable((By.XPATH, "//button[.//svg[@data-key='delete'] or contains(@title,'Delete') or .//span[contains(normalize-space(.),'Delete')]]"))
+    delete_btn = list_view_page.wait_for_first_visible(
+        ListViewPage.DELETE_BUTTON_LOCATORS, "delete_btn", 30
     )
-    driver.execute_script("arguments[0].click();", delete_btn)
-    confirm_delete_btn = WebDriverWait(driver, 30).until(
+    list_view_page.js_click(delete_btn)
+    confirm_delete_btn = adaptive_wait(driver, "confirm_delete_btn", 30).until(
         EC.element_to_be_clickable((By.XPATH, "(//button[contains(text(),'Delete')])"))
     )
     driver.execute_script("arguments[0].click();", confirm_delete_btn)
     time.sleep(12)
 
-    # Wait for the "Dakota Marketplace" row to be clickable before proceeding
-    marketplace_link_xpath = "//tr[@class='slds-line-height_reset']"
-    print("Waiting for 'Dakota Marketplace' row to be clickable...")
-    WebDriverWait(driver, 60).until(
-        EC.element_to_be_clickable((By.XPATH, marketplace_link_xpath))
-    )
-    print("'Dakota Marketplace' row is clickable.")
-
-    wait.until(EC.visibility_of_element_located((By.XPATH, "//div[@class='dropdownStyling']")))
+    # Wait for the tab's readiness checks before proceeding
+    list_view_page.wait_until_ready(URLs.ACCOUNTS_DEFAULT)
+    print("Tab is ready.")
 
     print("  Verifying that the deleted list view is removed from the dropdown...")
-    select_list_view_btn = WebDriverWait(driver, 30).until(
+    select_list_view_btn = adaptive_wait(driver, "select_list_view_btn", 30).until(
         EC.element_to_be_clickable((By.XPATH, "//button[@title='Select a List View']"))
     )
     driver.execute_script("arguments[0].click();", select_list_view_btn)
     time.sleep(2)
-    views_after_delete = WebDriverWait(driver, 30).until(
-        EC.presence_of_all_elements_located((By.XPATH, "//div[@role='main']//li//a[1]"))
-    )
-    names_after = [el.text.strip() for el in views_after_delete]
-    assert new_list_view_name not in names_after, f"List view '{new_list_view_name}' still appears in dropdown after deletion"
+    assert not list_view_page.view_exists(new_list_view_name), f"List view '{new_list_view_name}' still appears in dropdown after deletion"
     print(f"  Verified: List view '{new_list_view_name}' successfully deleted and removed from dropdown.")
 
     with allure.step(f"After deletion - list view removed: {new_list_view_name}"):
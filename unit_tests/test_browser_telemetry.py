@@ -0,0 +1,83 @@
+"""Growth ratios and findings of browser telemetry, over hand-built samples."""
+from utils.browser_telemetry import BrowserTelemetry, TelemetrySample
+
+MB = 1048576
+
+
+def _telemetry(*samples):
+    telemetry = BrowserTelemetry(driver=None)
+    telemetry.samples = [
+        TelemetrySample(f"sample {index}", rows, float(index), metrics)
+        for index, (rows, metrics) in enumerate(samples)
+    ]
+    return telemetry
+
+
+def _scroll(**series):
+    """Samples at 100, 550 and 1,000 rows; each keyword is a metric's three values."""
+    rows = (100, 550, 1000)
+    return _telemetry(*(
+        (count, {key: values[index] for key, values in series.items() if values[index] is not None})
+        for index, count in enumerate(rows)
+    ))
+
+
+def test_growth_ratio_compares_late_cost_per_row_with_early():
+    telemetry = _scroll(nodes=(1000, 1450, 2350), listeners=(10, 55, 100))
+    assert telemetry.growth_ratios() == {"nodes": 2.0, "listeners": 1.0}
+
+
+def test_growth_ratio_skips_metrics_missing_or_flat_early():
+    telemetry = _scroll(js_heap_used=(10 * MB, None, 30 * MB), layout_count=(5, 5, 40),
+                        nodes=(1000, 1450, 1900))
+    assert telemetry.growth_ratios() == {"nodes": 1.0}
+
+
+def test_growth_ratio_splits_at_the_sample_nearest_halfway():
+    telemetry = _telemetry(
+        (100, {"nodes": 100}),
+        (300, {"nodes": 300}),
+        (600, {"nodes": 600}),
+        (1000, {"nodes": 1800}),
+    )
+    # Halfway is 550 rows: 600 rows is the middle, 1.0 node/row before it and 3.0 after.
+    assert telemetry.growth_ratios() == {"nodes": 3.0}
+
+
+def test_growth_ratio_ignores_samples_without_rows():
+    telemetry = _telemetry(
+        (None, {"nodes": 50}),
+        (100, {"nodes": 1000}),
+        (550, {"nodes": 1450}),
+        (None, {"nodes": 9000}),
+        (1000, {"nodes": 2350}),
+    )
+    assert telemetry.growth_ratios() == {"nodes": 2.0}
+
+
+def test_growth_ratio_needs_three_samples_over_growing_rows():
+    assert _telemetry((100, {"nodes": 1}), (1000, {"nodes": 10})).growth_ratios() == {}
+    assert _telemetry((100, {"nodes": 1}), (100, {"nodes": 5}), (100, {"nodes": 10})).growth_ratios() == {}
+    assert _telemetry((100, {"nodes": 1}), (1000, {"nodes": 5}), (1000, {"nodes": 10})).growth_ratios() == {}
+
+
+def test_findings_flag_growth_over_the_limit_only():
+    telemetry = _scroll(nodes=(1000, 1450, 2350), listeners=(10, 55, 100))
+    assert telemetry.findings(max_growth_ratio=1.5) == [
+        "nodes grows super-linearly: late rows cost 2.0x early rows (limit 1.5x)"
+    ]
+    assert telemetry.findings(max_growth_ratio=2.0) == []
+    assert telemetry.findings() == []
+
+
+def test_findings_flag_leaked_documents():
+    telemetry = _telemetry((100, {"dom_documents": 1}), (500, {"documents": 2}), (1000, {"dom_documents": 3}))
+    assert telemetry.findings() == ["documents leaked: 1 -> 3 while scrolling"]
+    released = _telemetry((100, {"dom_documents": 2}), (500, {"dom_documents": 3}), (1000, {"dom_documents": 2}))
+    assert released.findings() == []
+
+
+def test_findings_flag_a_js_heap_over_budget():
+    telemetry = _telemetry((100, {"js_heap_used": 120 * MB}), (500, {"js_heap_used": 300 * MB}), (1000, {}))
+    assert telemetry.findings(max_js_heap_mb=256) == ["JS heap peaked at 300 MB (limit 256 MB)"]
+    assert telemetry.findings(max_js_heap_mb=512) == []
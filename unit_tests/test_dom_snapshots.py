@@ -0,0 +1,192 @@
+"""DOM snapshot XML conversion and offline replay, over the fixtures in ``fixtures/dom_snapshots``.
+
+``capture_snapshot.json`` is a trimmed ``DOMSnapshot.captureSnapshot`` result.
+``recording/`` is a three-state recording whose states are checked in as plain
+XML; :func:`recording` gzips them the way a capture run stores them.
+"""
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from lxml import etree
+
+from pages import locators
+from pages.base_page import BasePage
+from pages.list_view_page import ListViewPage
+from utils.dom_snapshots import (
+    BLOCK_ATTR,
+    HIDDEN_ATTR,
+    MANIFEST_NAME,
+    DomCheckpoints,
+    ReplayDriver,
+    ReplayElement,
+    snapshot_to_xml,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "dom_snapshots"
+ACCOUNTS_URL = "https://marketplace.example/s/accounts"
+CONTACTS_URL = "https://marketplace.example/s/contacts"
+VIEW_OPTION = ("xpath", "//li[@role='presentation']")
+
+
+def _capture():
+    return json.loads((FIXTURES / "capture_snapshot.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def recording(tmp_path):
+    directory = tmp_path / "recording"
+    directory.mkdir()
+    shutil.copy(FIXTURES / "recording" / MANIFEST_NAME, directory)
+    for state in (FIXTURES / "recording").glob("*.xml"):
+        with gzip.open(directory / f"{state.name}.gz", "wb") as snapshot_file:
+            snapshot_file.write(state.read_bytes())
+    return directory
+
+
+@pytest.fixture
+def replay(recording):
+    return ReplayDriver(recording)
+
+
+def test_snapshot_to_xml_keeps_the_rendered_tree():
+    xml = snapshot_to_xml(_capture())
+    assert xml == (
+        '<html lang="en" data-replay-block="1"><body data-replay-block="1">'
+        '<div class="dropdownStyling" data-label="Accounts &lt;All&gt; &amp; more" data-replay-block="1">'
+        'All Accounts</div>'
+        '<span class="assistiveText" data-replay-hidden="1"></span>'
+        '<c-grid><span class="slds-truncate">Row 1</span></c-grid>'
+        '<b data-replay-hidden="1">Draft</b>'
+        '</body></html>'
+    )
+
+
+def test_snapshot_xml_round_trips_through_replay_elements():
+    root = etree.fromstring(snapshot_to_xml(_capture()))
+    header = root.xpath("//div[@class='dropdownStyling']")[0]
+    assert header.get("data-label") == "Accounts <All> & more"
+    # Script bodies, attributes that are not XML names and unrendered text are dropped.
+    assert set(header.keys()) == {"class", "data-label", BLOCK_ATTR}
+    assert not root.xpath("//script")
+    assert "Selected view" not in etree.tostring(root, encoding="unicode")
+
+    body = ReplayElement(None, root.xpath("//body")[0])
+    # Shadow-root content is inlined; hidden elements are not displayed and have no text.
+    assert body.text == "All Accounts\nRow 1"
+    hidden = ReplayElement(None, root.xpath("//b")[0])
+    assert hidden.get_attribute(HIDDEN_ATTR) == "1"
+    assert not hidden.is_displayed()
+    assert hidden.text == ""
+
+
+def test_checkpoints_capture_a_recording_replay_reads_back(tmp_path):
+    class CapturingDriver:
+        current_url = ACCOUNTS_URL
+
+        def execute_cdp_cmd(self, command, params):
+            assert command == "DOMSnapshot.captureSnapshot"
+            return _capture()
+
+    directory = tmp_path / "test_accounts__test_header"
+    checkpoints = DomCheckpoints(CapturingDriver(), "capture", directory)
+    checkpoints.checkpoint("after load")
+    checkpoints.save()
+
+    manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert manifest == [{"name": "after load", "url": ACCOUNTS_URL, "file": "00_after_load.xml.gz"}]
+    replay = ReplayDriver(directory)
+    assert replay.current_url == ACCOUNTS_URL
+    assert replay.find_element("class name", "dropdownStyling").text == "All Accounts"
+
+
+def test_get_moves_to_the_first_later_state_recorded_at_that_url(replay):
+    replay.get(CONTACTS_URL)
+    assert replay.index == 2
+    assert replay.find_element("xpath", "//td").text == "Dana Park"
+
+
+def test_get_does_not_go_back_to_earlier_states(replay):
+    replay.show("contacts")
+    replay.get(ACCOUNTS_URL)
+    assert replay.index == 2
+    assert replay.current_url == CONTACTS_URL
+
+
+def test_get_of_the_current_url_stays_on_the_current_state(replay):
+    replay.get(ACCOUNTS_URL)
+    assert replay.index == 0
+    assert replay.find_elements(*VIEW_OPTION) == []
+    assert replay.index == 0
+
+
+def test_get_of_an_unrecorded_url_counts_as_an_action(replay):
+    replay.get("https://marketplace.example/s/unknown")
+    assert replay.index == 0
+    assert [option.text for option in replay.find_elements(*VIEW_OPTION)] == ["All Accounts", "My Accounts"]
+    assert replay.index == 1
+
+
+def test_a_miss_without_an_action_does_not_advance(replay):
+    assert replay.find_elements(*VIEW_OPTION) == []
+    assert replay.index == 0
+
+
+def test_a_miss_after_a_click_advances_to_the_next_state(replay):
+    replay.find_element("xpath", "//button[@title='Select a List View']").click()
+    options = replay.find_elements(*VIEW_OPTION)
+    assert [option.text for option in options] == ["All Accounts", "My Accounts"]
+    assert replay.index == 1
+    # The advance used up the action: the next miss stays on this state.
+    assert replay.find_elements("xpath", "//td[.='Dana Park']") == []
+    assert replay.index == 1
+
+
+def test_a_hit_after_an_action_stays_on_the_current_state(replay):
+    replay.execute_script("arguments[0].click();", None)
+    assert replay.find_element("class name", "dropdownStyling").text == "All Accounts"
+    assert replay.index == 0
+
+
+def test_a_miss_on_the_last_state_stays_there(replay):
+    replay.show("contacts")
+    replay.refresh()
+    assert replay.find_elements(*VIEW_OPTION) == []
+    assert replay.index == 2
+
+
+def test_show_jumps_to_a_named_checkpoint(replay):
+    replay.show("view_menu")
+    assert replay.index == 1
+    with pytest.raises(LookupError, match="No DOM snapshot named 'missing'"):
+        replay.show("missing")
+
+
+def test_page_objects_run_unchanged_over_a_replay(replay):
+    # Replay answers the page objects' scripts from the recorded DOM.
+    page = ListViewPage(replay)
+    assert page._readiness_check("no_spinner")(replay) is True
+    assert locators.count(replay, locators.GRID_ROW_CELLS) == 2
+    assert locators.texts(replay, locators.GRID_ROW_CELLS) == ["Acme Capital", "Birch Partners"]
+    assert locators.STATS.drain() == {}
+    button = page.find_first_visible([("id", "missing"), ("xpath", "//button[@title='Select a List View']")])
+    assert button.text == "v"
+
+
+def test_first_visible_advances_the_replay_once_for_all_xpaths(replay):
+    page = BasePage(replay)
+    page.js_click(page.find_first_visible([("xpath", "//button[@title='Select a List View']")]))
+    option = page.find_first_visible([("xpath", "//li[.='Missing']"), ("xpath", "//li[@role='presentation']")])
+    assert option.text == "All Accounts"
+    assert replay.index == 1
+
+
+def test_replay_is_logged_in_as_its_user(recording):
+    from login_page import LoginPage
+
+    replay = ReplayDriver(recording, logged_in_user="load.user@example.com")
+    login_page = LoginPage(replay)
+    assert login_page._already_logged_in("load.user@example.com")
+    assert not login_page._already_logged_in("someone.else@example.com")
@@ -0,0 +1,198 @@
+"""Grid routing, session retries and quit against a stub Selenium Grid on ``127.0.0.1``.
+
+The stub answers ``/status`` and the few W3C WebDriver endpoints a session
+start and quit need, so ``webdriver.Remote`` runs for real without a browser.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException
+
+from utils import driver_factory
+from utils.driver_factory import (
+    _build_options,
+    _check_grid_routing,
+    _create_remote_driver,
+    create_driver,
+    quit_driver,
+    remote_webdriver_url,
+)
+
+
+def _node(browser, availability="UP"):
+    return {"availability": availability, "slots": [{"stereotype": {"browserName": browser}}]}
+
+
+class StubGrid:
+    """``/status`` from ``nodes``; the first ``failures`` session starts fail as a node would."""
+
+    def __init__(self):
+        self.nodes = [_node("chrome")]
+        self.status_code = 200
+        self.failures = 0
+        self.session_attempts = 0
+        self.deleted = []
+        self.dead_sessions = set()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        grid = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code, value):
+                body = json.dumps({"value": value}).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_GET(self):
+                if self.path != "/status":
+                    self._send(404, {"error": "unknown command", "message": self.path, "stacktrace": ""})
+                    return
+                if grid.status_code != 200:
+                    self.send_response(grid.status_code)
+                    self.end_headers()
+                    return
+                self._send(200, {"ready": True, "nodes": grid.nodes})
+
+            def do_POST(self):
+                body = self._read_body()
+                if self.path == "/session":
+                    grid.session_attempts += 1
+                    if grid.session_attempts <= grid.failures:
+                        self._send(500, {"error": "session not created",
+                                         "message": "node could not start the browser", "stacktrace": ""})
+                        return
+                    browser = body["capabilities"]["alwaysMatch"]["browserName"]
+                    self._send(200, {"sessionId": f"session-{grid.session_attempts}",
+                                     "capabilities": {"browserName": browser}})
+                    return
+                if self.path.endswith("/window/rect"):
+                    self._send(200, {"x": 0, "y": 0, "width": body.get("width"), "height": body.get("height")})
+                    return
+                self._send(404, {"error": "unknown command", "message": self.path, "stacktrace": ""})
+
+            def do_DELETE(self):
+                session_id = self.path.rsplit("/", 1)[-1]
+                if session_id in grid.dead_sessions:
+                    self._send(404, {"error": "invalid session id",
+                                     "message": "node went away", "stacktrace": ""})
+                    return
+                grid.deleted.append(session_id)
+                self._send(200, None)
+
+        return Handler
+
+
+@pytest.fixture
+def grid(monkeypatch):
+    for name in ("REMOTE_WEBDRIVER_URL_CHROME", "REMOTE_WEBDRIVER_URL_FIREFOX", "REMOTE_PLATFORM_NAME",
+                 "REMOTE_BROWSER_VERSION", "CHROME_BINARY", "FIREFOX_BINARY", "REMOTE_SESSION_RETRIES"):
+        monkeypatch.delenv(name, raising=False)
+    stub = StubGrid().start()
+    monkeypatch.setenv("REMOTE_WEBDRIVER_URL", stub.url + "/")
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def backoffs(monkeypatch):
+    slept = []
+    monkeypatch.setattr(driver_factory.time, "sleep", slept.append)
+    return slept
+
+
+def _options(browser):
+    return _build_options(browser, 800, 600, True)
+
+
+def test_remote_url_prefers_the_browser_specific_variable(grid, monkeypatch):
+    assert remote_webdriver_url("chrome") == grid.url
+    monkeypatch.setenv("REMOTE_WEBDRIVER_URL_FIREFOX", "http://firefox-grid:4444/")
+    assert remote_webdriver_url("firefox") == "http://firefox-grid:4444"
+    monkeypatch.delenv("REMOTE_WEBDRIVER_URL")
+    assert remote_webdriver_url("chrome") is None
+
+
+def test_routing_accepts_a_browser_a_live_node_offers(grid):
+    _check_grid_routing(grid.url, _options("chrome"))
+
+
+def test_routing_rejects_a_browser_no_live_node_offers(grid):
+    grid.nodes = [_node("chrome"), _node("firefox", availability="DOWN")]
+    with pytest.raises(RuntimeError, match="no live node for 'firefox'.*nodes offer: chrome"):
+        _check_grid_routing(grid.url, _options("firefox"))
+
+
+@pytest.mark.parametrize("nodes, status_code", [([], 200), ([_node("chrome")], 503)])
+def test_routing_defers_to_the_grid_without_nodes_or_status(grid, nodes, status_code):
+    # An autoscaling Grid with no nodes yet, or an unreadable /status, queues the request.
+    grid.nodes = nodes
+    grid.status_code = status_code
+    _check_grid_routing(grid.url, _options("firefox"))
+
+
+def test_session_is_retried_with_growing_backoff(grid, backoffs):
+    grid.failures = 2
+    browser_driver = _create_remote_driver("chrome", _options("chrome"), grid.url)
+    assert browser_driver.session_id == "session-3"
+    assert grid.session_attempts == 3
+    assert backoffs == [driver_factory.REMOTE_RETRY_BACKOFF_SECONDS * 1,
+                        driver_factory.REMOTE_RETRY_BACKOFF_SECONDS * 2]
+    quit_driver(browser_driver)
+
+
+def test_last_session_failure_is_raised(grid, backoffs, monkeypatch):
+    monkeypatch.setenv("REMOTE_SESSION_RETRIES", "1")
+    grid.failures = 5
+    with pytest.raises(SessionNotCreatedException, match="node could not start the browser"):
+        _create_remote_driver("chrome", _options("chrome"), grid.url)
+    assert grid.session_attempts == 2
+    assert len(backoffs) == 1
+
+
+def test_routing_failure_starts_no_session(grid):
+    with pytest.raises(RuntimeError, match="no live node"):
+        create_driver("firefox")
+    assert grid.session_attempts == 0
+
+
+def test_create_driver_uses_the_grid_and_quit_ends_the_session(grid, monkeypatch):
+    monkeypatch.setenv("BROWSER_WIDTH", "1280")
+    monkeypatch.setenv("BROWSER_HEIGHT", "720")
+    browser_driver = create_driver("chrome")
+    assert browser_driver.session_id == "session-1"
+    quit_driver(browser_driver)
+    assert grid.deleted == ["session-1"]
+
+
+def test_quit_tolerates_a_node_that_went_away(grid, caplog):
+    browser_driver = create_driver("chrome")
+    grid.dead_sessions.add(browser_driver.session_id)
+    quit_driver(browser_driver)
+    assert grid.deleted == []
+    assert "did not quit cleanly" in caplog.text
@@ -0,0 +1,68 @@
+"""Percentile, degradation and scaling-curve math of the lazy-loading metrics."""
+import pytest
+
+from utils.lazy_load_metrics import LazyLoadMetrics, PageLoad, _p90
+
+
+def _metrics(pages, target_records=2000):
+    return LazyLoadMetrics("accounts_default", "uat", target_records, pages=pages)
+
+
+def _pages(seconds_per_page, rows_per_page=100, start=100):
+    pages, elapsed = [], 0.0
+    for index, seconds in enumerate(seconds_per_page):
+        elapsed += seconds
+        before = start + index * rows_per_page
+        pages.append(PageLoad(before, before + rows_per_page, seconds, elapsed))
+    return pages
+
+
+@pytest.mark.parametrize("values, expected", [
+    ([4.0], 4.0),
+    ([3.0, 1.0, 2.0], 3.0),
+    ([10.0, 1.0, 9.0, 2.0, 8.0, 3.0, 7.0, 4.0, 6.0, 5.0], 9.0),
+    ([float(value) for value in range(1, 21)], 18.0),
+])
+def test_p90_is_the_nearest_rank_value(values, expected):
+    assert _p90(values) == expected
+
+
+def test_degradation_needs_enough_pages():
+    assert _metrics(_pages([1.0, 1.0, 2.0]))._degradation() is None
+
+
+def test_degradation_compares_the_last_quarter_with_the_first():
+    # Eight pages: quarters of two; early median 1.0s, late median 2.5s per 100 rows.
+    metrics = _metrics(_pages([1.0, 1.0, 1.2, 1.4, 1.6, 1.8, 2.0, 3.0]))
+    assert metrics._degradation() == 2.5
+
+
+def test_degradation_uses_time_per_row_not_per_page():
+    # Late pages take twice as long but bring twice the rows: no degradation.
+    early = _pages([1.0, 1.0], rows_per_page=100)
+    late = _pages([2.0, 2.0], rows_per_page=200, start=300)
+    assert _metrics(early + late)._degradation() == 1.0
+
+
+def test_degradation_is_undefined_without_early_time():
+    assert _metrics(_pages([0.0, 0.0, 1.0, 1.0]))._degradation() is None
+
+
+def test_scaling_curve_reports_the_page_that_crossed_each_point():
+    pages = [PageLoad(100, 200, 1.0, 1.0), PageLoad(200, 550, 2.0, 3.0)]
+    curve = _metrics(pages, target_records=500)._scaling_curve(final_count=550)
+    # 100 rows were loaded up front and 1,000 is past both the target and the final count.
+    assert curve == [{"rows": 500, "seconds_to_reach": 3.0, "page_seconds": 2.0, "seconds_per_100_rows": 0.571}]
+
+
+def test_scaling_curve_skips_points_never_reached():
+    pages = _pages([1.0] * 9)  # 100 -> 1,000 rows
+    curve = _metrics(pages, target_records=2000)._scaling_curve(final_count=1000)
+    assert [point["rows"] for point in curve] == [500, 1000]
+    assert curve[-1]["seconds_to_reach"] == 9.0
+
+
+def test_scaling_curve_extends_past_the_target_when_more_rows_loaded():
+    pages = _pages([1.0] * 20, rows_per_page=100, start=0)  # 0 -> 2,000 rows
+    curve = _metrics(pages, target_records=1000)._scaling_curve(final_count=2000)
+    assert [point["rows"] for point in curve] == [100, 500, 1000, 2000]
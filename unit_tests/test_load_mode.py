@@ -0,0 +1,50 @@
+"""Scenario-mix parsing and the real-environment guard of the load mode."""
+import pytest
+
+from utils.load_mode import (
+    DEFAULT_MIX,
+    REAL_TARGET_MAX_USERS,
+    STANDIN_TARGET,
+    LoadTargetError,
+    check_target,
+    parse_mix,
+)
+
+
+def test_parse_mix_reads_weights():
+    assert parse_mix(DEFAULT_MIX) == {"browse_tab": 5, "lazy_scroll": 3, "field_modal": 2}
+
+
+def test_parse_mix_defaults_a_bare_scenario_to_weight_one():
+    assert parse_mix(" browse_tab , lazy_scroll=0,,") == {"browse_tab": 1, "lazy_scroll": 0}
+
+
+@pytest.mark.parametrize("text, message", [
+    ("browse_tab=2,checkout=1", "Unknown load scenario 'checkout'"),
+    ("browse_tab=two", "Weight for 'browse_tab' must be a whole number, got 'two'"),
+    ("browse_tab=1.5", "must be a whole number"),
+    ("browse_tab=3,field_modal=-1", "Weight for 'field_modal' must not be negative"),
+    ("browse_tab=0,lazy_scroll=0", "needs at least one scenario with a positive weight"),
+    ("", "needs at least one scenario with a positive weight"),
+])
+def test_parse_mix_rejects_bad_mixes(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_mix(text)
+
+
+def test_standin_target_needs_no_confirmation():
+    check_target(STANDIN_TARGET, None, [1, 50, 100])
+
+
+def test_real_target_needs_its_name_repeated():
+    with pytest.raises(LoadTargetError, match="--confirm-target uat_fa_data_set"):
+        check_target("uat_fa_data_set", None, [1])
+    with pytest.raises(LoadTargetError, match="Refusing to put load on 'uat_fa_data_set'"):
+        check_target("uat_fa_data_set", "prod", [1])
+    check_target("uat_fa_data_set", "uat_fa_data_set", [1, REAL_TARGET_MAX_USERS])
+
+
+def test_real_target_caps_concurrent_users():
+    with pytest.raises(LoadTargetError, match=rf"At most {REAL_TARGET_MAX_USERS} .*asked for 10"):
+        check_target("uat_fa_data_set", "uat_fa_data_set", [1, 10, 5])
+
@@ -0,0 +1,47 @@
+"""Which sessions ``LoginPage`` reuses and which it logs out before filling the form."""
+import pytest
+
+from login_page import LoginPage
+from utils.api_login import STRATEGY_ENV
+
+
+class FormOpened(Exception):
+    pass
+
+
+class LeasedDriver:
+    """A session the driver broker logged in as ``logged_in_user``; stops at the first navigation."""
+
+    def __init__(self, logged_in_user):
+        self.logged_in_user = logged_in_user
+        self.cookies_deleted = False
+
+    def get(self, url):
+        raise FormOpened(url)
+
+    def delete_all_cookies(self):
+        self.cookies_deleted = True
+
+
+@pytest.fixture(autouse=True)
+def ui_strategy(monkeypatch):
+    monkeypatch.setenv(STRATEGY_ENV, "ui")
+
+
+def test_the_leased_user_skips_the_form():
+    driver = LeasedDriver("load.user@example.com")
+    login_page = LoginPage(driver)
+    login_page.navigate_to_login("https://site.example.com/s/login")
+    login_page.login("load.user@example.com", "secret")
+    assert not driver.cookies_deleted
+    assert driver.logged_in_user == "load.user@example.com"
+
+
+def test_another_user_logs_out_the_leased_session_and_opens_the_form():
+    driver = LeasedDriver("load.user@example.com")
+    login_page = LoginPage(driver)
+    login_page.navigate_to_login("https://site.example.com/s/login")
+    with pytest.raises(FormOpened, match="https://site.example.com/s/login"):
+        login_page.login("someone.else@example.com", "secret")
+    assert driver.cookies_deleted
+    assert driver.logged_in_user is None
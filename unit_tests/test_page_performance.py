@@ -0,0 +1,54 @@
+"""Budget checks and trend against previous runs for the page performance suite."""
+from utils.page_performance import TREND_WINDOW, budget_breaches, trend
+
+
+def _runs(*values, metric="grid_ready_ms"):
+    return [{"run_id": f"run-{index}", "metrics": {metric: value}} for index, value in enumerate(values)]
+
+
+def test_budget_breaches_report_metrics_over_their_limit():
+    metrics = {"grid_ready_ms": 4200.4, "header_ms": 900.0, "lcp_ms": 2500.0}
+    budget = {"max_grid_ready_ms": 3000, "max_header_ms": 1500, "max_lcp_ms": 2500}
+    # At the limit is within budget.
+    assert budget_breaches(metrics, budget) == ["grid_ready_ms 4200ms is over the 3000ms budget"]
+
+
+def test_budget_breaches_skip_unbudgeted_and_unmeasured_metrics():
+    metrics = {"grid_ready_ms": 9000.0, "total_blocking_ms": None, "ttfb_ms": 5000.0}
+    budget = {"max_total_blocking_ms": 200, "max_ttfb_ms": 100}
+    assert budget_breaches(metrics, budget) == []
+
+
+def test_budget_breaches_follow_metric_order():
+    metrics = {"load_event_ms": 9000.0, "lcp_ms": 6000.0, "grid_ready_ms": 5000.0}
+    budget = {"max_load_event_ms": 8000, "max_lcp_ms": 4000, "max_grid_ready_ms": 3000}
+    assert [breach.split()[0] for breach in budget_breaches(metrics, budget)] == [
+        "grid_ready_ms", "lcp_ms", "load_event_ms",
+    ]
+
+
+def test_trend_compares_with_the_median_of_previous_runs():
+    result = trend({"grid_ready_ms": 3300.0}, _runs(2900.0, 3100.0, 3000.0))
+    assert result == {"grid_ready_ms": {"baseline_ms": 3000.0, "runs": 3, "change_pct": 10.0}}
+
+
+def test_trend_uses_only_the_latest_window_of_runs():
+    previous = _runs(*([9999.0] * 5 + [1000.0] * TREND_WINDOW))
+    result = trend({"grid_ready_ms": 900.0}, previous)
+    assert result["grid_ready_ms"] == {"baseline_ms": 1000.0, "runs": TREND_WINDOW, "change_pct": -10.0}
+
+
+def test_trend_skips_runs_and_metrics_without_a_value():
+    previous = _runs(1000.0, None) + [{"run_id": "old"}] + _runs(3000.0, metric="lcp_ms")
+    result = trend({"grid_ready_ms": 1500.0, "header_ms": 800.0, "lcp_ms": None}, previous)
+    # header_ms has no history and lcp_ms was not measured this run.
+    assert result == {"grid_ready_ms": {"baseline_ms": 1000.0, "runs": 1, "change_pct": 50.0}}
+
+
+def test_trend_has_no_change_against_a_zero_baseline():
+    result = trend({"total_blocking_ms": 120.0}, _runs(0.0, 0.0, metric="total_blocking_ms"))
+    assert result == {"total_blocking_ms": {"baseline_ms": 0.0, "runs": 2, "change_pct": None}}
+
+
+def test_trend_is_empty_on_the_first_run():
+    assert trend({"grid_ready_ms": 1200.0}, []) == {}
@@ -0,0 +1,55 @@
+"""Which tabs may skip the pin probe after the session-start normalization."""
+import pytest
+
+from pages.list_view_page import ListViewPage
+from utils.session_normalizer import (
+    NORMALIZED_TABS_ENV,
+    TabBaseline,
+    normalized_tabs,
+    publish_normalized,
+    withdraw_normalized,
+)
+
+
+class ProbingDriver:
+    """Answers the unpin-button probe with "nothing pinned" and counts the probes."""
+
+    def __init__(self):
+        self.probes = 0
+
+    def execute_script(self, script, *args):
+        self.probes += 1
+        return None
+
+
+@pytest.fixture(autouse=True)
+def no_baseline(monkeypatch):
+    monkeypatch.delenv(NORMALIZED_TABS_ENV, raising=False)
+
+
+def test_only_tabs_that_reached_the_baseline_are_published():
+    publish_normalized([
+        TabBaseline("accounts_default", default_view="All Accounts"),
+        TabBaseline("contact_default", error="No window opened"),
+        TabBaseline("my_accounts", was_pinned=True),
+    ])
+    assert normalized_tabs() == ["accounts_default", "my_accounts"]
+    withdraw_normalized()
+    assert normalized_tabs() == []
+
+
+def test_trusting_the_baseline_skips_the_probe_on_normalized_tabs():
+    publish_normalized([TabBaseline("accounts_default")])
+    driver = ProbingDriver()
+    page = ListViewPage(driver)
+    assert page.ensure_unpinned("accounts_default", trust_baseline=True) is False
+    assert driver.probes == 0
+    page.ensure_unpinned("contact_default", trust_baseline=True)
+    assert driver.probes == 1
+
+
+def test_the_probe_runs_unless_the_baseline_is_trusted():
+    publish_normalized([TabBaseline("accounts_default")])
+    driver = ProbingDriver()
+    assert ListViewPage(driver).ensure_unpinned("accounts_default") is False
+    assert driver.probes == 1
@@ -0,0 +1,27 @@
+"""Every module under ``tests/`` imports.
+
+``--collect-only`` reads test names from the AST manifest
+(:mod:`utils.test_manifest`) without importing the modules, so a broken import
+would only show when its tests run. This imports each of them the way pytest
+would: as ``<suite package>.<module>`` with ``tests/`` on ``sys.path``.
+"""
+import importlib
+from pathlib import Path
+
+import pytest
+
+TESTS_DIR = Path(__file__).resolve().parent.parent / "tests"
+MODULES = sorted(
+    ".".join(path.relative_to(TESTS_DIR).with_suffix("").parts)
+    for path in TESTS_DIR.glob("*/test_*.py")
+)
+
+
+def test_suites_have_modules():
+    assert MODULES
+
+
+@pytest.mark.parametrize("module_name", MODULES)
+def test_module_imports(module_name, monkeypatch):
+    monkeypatch.syspath_prepend(str(TESTS_DIR))
+    importlib.import_module(module_name)
@@ -0,0 +1,27 @@
+"""Adaptive waits: per-predicate keys and learned timeouts."""
+from selenium.webdriver.support.wait import WebDriverWait
+
+from utils.timeouts import TimeoutPolicy
+
+
+def _policy(tmp_path):
+    return TimeoutPolicy("uat", tmp_path / "readiness_latency.json", min_samples=3)
+
+
+def test_a_shared_wait_is_still_a_webdriver_wait(tmp_path):
+    policy = _policy(tmp_path)
+    wait = policy.wait(object(), "fixture_wait", 30)
+    assert isinstance(wait, WebDriverWait)
+    assert wait.until(lambda _: "ready") == "ready"
+    assert policy.samples("-", "fixture_wait")
+
+
+def test_calling_a_wait_keys_it_by_predicate(tmp_path):
+    policy = _policy(tmp_path)
+    shared = policy.wait(object(), "fixture_wait", 30, tab="accounts_default")
+    save_btn = shared("save_btn", 10)
+    assert (save_btn.predicate, save_btn.default, save_btn.tab) == ("save_btn", 10, "accounts_default")
+    assert shared("header").default == 30
+    save_btn.until(lambda _: True)
+    assert policy.samples("accounts_default", "save_btn")
+    assert not policy.samples("accounts_default", "fixture_wait")
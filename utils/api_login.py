@@ -0,0 +1,158 @@
+"""Login without the UI form: get a session over the API, then open the site through frontdoor.
+
+``config.json`` picks the strategy per portal under ``login``: the ``default``
+entry overlaid with the portal's (``LOGIN_STRATEGY`` overrides both):
+
+* ``ui``: the Experience Cloud login form (:class:`login_page.LoginPage`).
+* ``soap``: SOAP ``login()`` with the portal user's username and password, on
+  the site's ``/services/Soap/u/<api_version>`` endpoint.
+* ``oauth``: OAuth 2.0 username-password flow on the site's
+  ``/services/oauth2/token``; the connected app's client id and secret are read
+  from the env vars named by ``oauth_client_id_env`` / ``oauth_client_secret_env``.
+
+Either API strategy ends with the browser opening
+``<site>/secur/frontdoor.jsp?sid=...&retURL=/<site>/s/``, which turns the
+session id into site cookies, so the test starts on the home page logged in.
+The local stand-in (:mod:`utils.standin_marketplace`) serves all three
+endpoints.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from typing import Dict, Optional
+from xml.sax.saxutils import escape
+
+from config.settings import login_settings, parse_environment_name
+
+STRATEGY_ENV = "LOGIN_STRATEGY"
+STRATEGIES = ("ui", "soap", "oauth")
+REQUEST_TIMEOUT_SECONDS = 30
+
+_SOAP_NS = {
+    "soapenv": "http://schemas.xmlsoap.org/soap/envelope/",
+    "sf": "urn:partner.soap.sforce.com",
+}
+
+_SOAP_LOGIN = """<?xml version="1.0" encoding="utf-8"?>
+<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns:urn="urn:partner.soap.sforce.com">
+  <soapenv:Body>
+    <urn:login>
+      <urn:username>{username}</urn:username>
+      <urn:password>{password}</urn:password>
+    </urn:login>
+  </soapenv:Body>
+</soapenv:Envelope>
+"""
+
+
+class ApiLoginError(RuntimeError):
+    """The API refused the credentials or did not return a session."""
+
+
+def login_strategy(portal: Optional[str] = None) -> Dict[str, str]:
+    """Login settings for ``portal`` (default: the ``ENV`` portal), with ``LOGIN_STRATEGY`` applied."""
+    if portal is None:
+        portal = parse_environment_name()[1]
+    settings = login_settings(portal)
+    override = os.environ.get(STRATEGY_ENV, "").strip().lower()
+    if override:
+        settings["strategy"] = override
+    if settings.get("strategy", "ui") not in STRATEGIES:
+        raise ValueError(
+            f"Unknown login strategy '{settings['strategy']}'. Supported: {', '.join(STRATEGIES)}"
+        )
+    return settings
+
+
+def site_root(base_url: str) -> str:
+    """``https://host/dakotaMarketplace/s/`` -> ``https://host/dakotaMarketplace``."""
+    parts = urllib.parse.urlsplit(base_url)
+    path = parts.path.rstrip("/")
+    if path.endswith("/s"):
+        path = path[: -len("/s")]
+    return urllib.parse.urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+
+
+def frontdoor_url(base_url: str, session_id: str) -> str:
+    ret_url = urllib.parse.urlsplit(base_url).path or "/"
+    query = urllib.parse.urlencode({"sid": session_id, "retURL": ret_url})
+    return f"{site_root(base_url)}/secur/frontdoor.jsp?{query}"
+
+
+def _post(url: str, body: bytes, headers: Dict[str, str]) -> bytes:
+    request = urllib.request.Request(url, data=body, headers=headers, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
+            return response.read()
+    except urllib.error.HTTPError as exc:
+        # SOAP faults and OAuth errors come back as 4xx/5xx with a readable body.
+        return exc.read()
+
+
+def soap_session(base_url: str, username: str, password: str, api_version: str = "59.0") -> str:
+    """Session id from SOAP ``login()`` on the site's endpoint."""
+    body = _SOAP_LOGIN.format(username=escape(username), password=escape(password))
+    payload = _post(
+        f"{site_root(base_url)}/services/Soap/u/{api_version}",
+        body.encode("utf-8"),
+        {"Content-Type": "text/xml; charset=utf-8", "SOAPAction": "login"},
+    )
+    try:
+        root = ET.fromstring(payload)
+    except ET.ParseError as exc:
+        raise ApiLoginError(f"SOAP login returned no XML: {payload[:200]!r}") from exc
+    fault = root.find(".//soapenv:Fault/faultstring", _SOAP_NS)
+    if fault is not None:
+        raise ApiLoginError(f"SOAP login refused: {fault.text}")
+    session_id = root.find(".//sf:sessionId", _SOAP_NS)
+    if session_id is None or not (session_id.text or "").strip():
+        raise ApiLoginError("SOAP login response has no sessionId")
+    return session_id.text.strip()
+
+
+def oauth_session(base_url: str, username: str, password: str,
+                  client_id: str, client_secret: str) -> str:
+    """Access token from the OAuth 2.0 username-password flow."""
+    body = urllib.parse.urlencode({
+        "grant_type": "password",
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "username": username,
+        "password": password,
+    }).encode("utf-8")
+    payload = _post(
+        f"{site_root(base_url)}/services/oauth2/token",
+        body,
+        {"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    try:
+        token = json.loads(payload)
+    except ValueError as exc:
+        raise ApiLoginError(f"OAuth token response is not JSON: {payload[:200]!r}") from exc
+    if "access_token" not in token:
+        raise ApiLoginError(
+            f"OAuth login refused: {token.get('error', 'unknown')} {token.get('error_description', '')}".strip()
+        )
+    return token["access_token"]
+
+
+def session_id_for(strategy: Dict[str, str], base_url: str, username: str, password: str) -> str:
+    """Session id for ``strategy`` (``soap`` or ``oauth``)."""
+    if strategy["strategy"] == "soap":
+        return soap_session(base_url, username, password, strategy.get("api_version", "59.0"))
+    if strategy["strategy"] == "oauth":
+        client_id = os.environ.get(strategy.get("oauth_client_id_env", ""), "")
+        client_secret = os.environ.get(strategy.get("oauth_client_secret_env", ""), "")
+        if not client_id or not client_secret:
+            raise ApiLoginError(
+                f"OAuth login needs {strategy.get('oauth_client_id_env')} and "
+                f"{strategy.get('oauth_client_secret_env')} set"
+            )
+        return oauth_session(base_url, username, password, client_id, client_secret)
+    raise ValueError(f"'{strategy['strategy']}' is not an API login strategy")
@@ -0,0 +1,187 @@
+"""Browser memory and DOM-growth telemetry sampled during a test.
+
+:class:`BrowserTelemetry` reads CDP ``Performance.getMetrics`` (JS heap, DOM
+nodes, event listeners, layout and style-recalc counts) and
+``Memory.getDOMCounters`` on Chrome and Edge, forcing a garbage collection
+first so heap numbers are comparable between samples. Other browsers fall back
+to what page script can see (``performance.memory`` and an element count).
+
+:meth:`BrowserTelemetry.findings` flags the patterns that run agents out of
+memory over a long scroll: metrics whose cost per loaded row grows as more
+rows are loaded (super-linear growth), documents that accumulate (a leak), and
+a JS heap over its budget.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+# Performance.getMetrics name -> sample key.
+PERFORMANCE_METRICS = {
+    "JSHeapUsedSize": "js_heap_used",
+    "JSHeapTotalSize": "js_heap_total",
+    "Nodes": "nodes",
+    "JSEventListeners": "listeners",
+    "LayoutCount": "layout_count",
+    "RecalcStyleCount": "recalc_style_count",
+    "Documents": "documents",
+}
+# Memory.getDOMCounters name -> sample key.
+DOM_COUNTERS = {
+    "documents": "dom_documents",
+    "nodes": "dom_nodes",
+    "jsEventListeners": "dom_listeners",
+}
+# Metrics checked for super-linear growth against rows loaded.
+GROWTH_METRICS = ("js_heap_used", "nodes", "listeners", "layout_count", "recalc_style_count")
+
+_JS_SAMPLE_SCRIPT = """
+const memory = performance.memory || {};
+return {
+    js_heap_used: memory.usedJSHeapSize || null,
+    js_heap_total: memory.totalJSHeapSize || null,
+    nodes: document.getElementsByTagName('*').length,
+};
+"""
+
+
+@dataclass
+class TelemetrySample:
+    label: str
+    rows: Optional[int]
+    # Seconds since the first sample.
+    elapsed: float
+    metrics: Dict[str, float] = field(default_factory=dict)
+
+
+class BrowserTelemetry:
+    """Samples of one browser's memory and DOM counters, labelled by step."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.samples: List[TelemetrySample] = []
+        self.source: Optional[str] = None
+        self.sampling_seconds = 0.0
+        self._started: Optional[float] = None
+
+    def _detect_source(self) -> str:
+        try:
+            self.driver.execute_cdp_cmd("Performance.enable", {})
+        except (AttributeError, WebDriverException):
+            return "script"
+        return "cdp"
+
+    def _read_cdp(self) -> Dict[str, float]:
+        try:
+            self.driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+        except WebDriverException as exc:
+            logging.debug("Garbage collection before telemetry sample failed: %s", exc)
+        metrics = {}
+        for metric in self.driver.execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", []):
+            key = PERFORMANCE_METRICS.get(metric.get("name"))
+            if key:
+                metrics[key] = metric.get("value")
+        counters = self.driver.execute_cdp_cmd("Memory.getDOMCounters", {})
+        for name, key in DOM_COUNTERS.items():
+            if name in counters:
+                metrics[key] = counters[name]
+        return metrics
+
+    def sample(self, label: str, rows: Optional[int] = None) -> Optional[TelemetrySample]:
+        """Record the browser's counters now; ``None`` (logged) if the browser can't report them."""
+        started = time.monotonic()
+        if self._started is None:
+            self._started = started
+        if self.source is None:
+            self.source = self._detect_source()
+        try:
+            if self.source == "cdp":
+                metrics = self._read_cdp()
+            else:
+                metrics = {
+                    key: value
+                    for key, value in self.driver.execute_script(_JS_SAMPLE_SCRIPT).items()
+                    if value is not None
+                }
+        except WebDriverException as exc:
+            logging.warning("Browser telemetry sample '%s' failed: %s", label, exc)
+            return None
+        finally:
+            self.sampling_seconds += time.monotonic() - started
+        sample = TelemetrySample(label, rows, round(started - self._started, 3), metrics)
+        self.samples.append(sample)
+        return sample
+
+    def growth_ratios(self) -> Dict[str, float]:
+        """Per metric: cost per row over the second half of the rows divided by the first half's.
+
+        About 1.0 means the metric grows linearly with rows loaded; well above
+        1.0 means each new page costs more than the previous ones.
+        """
+        samples = [sample for sample in self.samples if sample.rows is not None]
+        if len(samples) < 3 or samples[-1].rows <= samples[0].rows:
+            return {}
+        first, last = samples[0], samples[-1]
+        halfway = (first.rows + last.rows) / 2
+        middle = min(samples[1:-1], key=lambda sample: abs(sample.rows - halfway))
+        if not first.rows < middle.rows < last.rows:
+            return {}
+        ratios = {}
+        for key in GROWTH_METRICS:
+            values = [sample.metrics.get(key) for sample in (first, middle, last)]
+            if None in values:
+                continue
+            early = (values[1] - values[0]) / (middle.rows - first.rows)
+            late = (values[2] - values[1]) / (last.rows - middle.rows)
+            if early > 0:
+                ratios[key] = round(late / early, 2)
+        return ratios
+
+    def findings(self, max_growth_ratio: Optional[float] = None,
+                 max_js_heap_mb: Optional[float] = None) -> List[str]:
+        found = []
+        if max_growth_ratio is not None:
+            for key, ratio in self.growth_ratios().items():
+                if ratio > max_growth_ratio:
+                    found.append(
+                        f"{key} grows super-linearly: late rows cost {ratio}x early rows "
+                        f"(limit {max_growth_ratio}x)"
+                    )
+        documents = [
+            sample.metrics.get("dom_documents", sample.metrics.get("documents"))
+            for sample in self.samples
+        ]
+        documents = [value for value in documents if value is not None]
+        if len(documents) >= 2 and documents[-1] > documents[0]:
+            found.append(f"documents leaked: {documents[0]:.0f} -> {documents[-1]:.0f} while scrolling")
+        if max_js_heap_mb is not None:
+            peak = max((sample.metrics.get("js_heap_used") or 0 for sample in self.samples), default=0)
+            if peak / 1048576 > max_js_heap_mb:
+                found.append(f"JS heap peaked at {peak / 1048576:.0f} MB (limit {max_js_heap_mb:.0f} MB)")
+        return found
+
+    def as_dict(self) -> dict:
+        return {
+            "source": self.source,
+            "sampling_seconds": round(self.sampling_seconds, 3),
+            "samples": [asdict(sample) for sample in self.samples],
+            "growth_ratios": self.growth_ratios(),
+        }
+
+    def to_csv(self) -> str:
+        """One row per sample, one column per metric, for charting growth against rows."""
+        keys = sorted({key for sample in self.samples for key in sample.metrics})
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(["label", "rows", "elapsed", *keys])
+        for sample in self.samples:
+            writer.writerow([sample.label, sample.rows, sample.elapsed,
+                             *(sample.metrics.get(key, "") for key in keys)])
+        return output.getvalue()
@@ -0,0 +1,281 @@
+"""Asyncio engine that drives several page targets of one Chrome over DevTools.
+
+Selenium sends one command at a time per session, so read-only checks for 34
+tabs run back to back even though each is mostly waiting on the server. This
+engine attaches to the browser behind an already logged-in Selenium session,
+opens extra page targets in the same browser context (so they share cookies),
+and runs read-only page work on them concurrently.
+
+One browser-level WebSocket carries every target's traffic using flattened
+sessions. ``websocket-client`` (already installed with selenium) is blocking, so
+a reader thread resolves asyncio futures on the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+import urllib.request
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, TypeVar
+
+import websocket
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 4
+COMMAND_TIMEOUT_SECONDS = 60.0
+# Set on a page's current document before navigating, so the wait can tell the new one apart.
+NAVIGATION_MARK = "__cdpNavigationMark"
+
+_navigation_marks = itertools.count(1)
+
+
+class CdpError(RuntimeError):
+    """DevTools returned an error or the connection dropped."""
+
+
+def debugger_address(driver) -> str:
+    """``host:port`` of the DevTools endpoint behind a Chrome or Edge Selenium session."""
+    capabilities = driver.capabilities
+    for options_key in ("goog:chromeOptions", "ms:edgeOptions"):
+        address = capabilities.get(options_key, {}).get("debuggerAddress")
+        if address:
+            return address
+    raise CdpError(
+        f"Browser '{capabilities.get('browserName')}' does not expose a DevTools "
+        "debugger address; the CDP engine needs Chrome or Edge."
+    )
+
+
+class CdpConnection:
+    """Browser-level DevTools WebSocket shared by every attached target."""
+
+    def __init__(self, ws_url: str, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._ws = websocket.create_connection(ws_url, timeout=None, suppress_origin=True)
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_loop, name="cdp-reader", daemon=True)
+        self._reader.start()
+
+    def _read_loop(self) -> None:
+        while not self._closed:
+            try:
+                raw = self._ws.recv()
+            except Exception as exc:
+                if not self._closed:
+                    logging.warning("DevTools connection dropped: %s", exc)
+                    self._loop.call_soon_threadsafe(self._fail_all, exc)
+                return
+            if not raw:
+                continue
+            message = json.loads(raw)
+            # Events (no "id") are not needed by the read-only workloads.
+            if "id" in message:
+                self._loop.call_soon_threadsafe(self._resolve, message)
+
+    def _resolve(self, message: dict) -> None:
+        future = self._pending.pop(message["id"], None)
+        if future is None or future.done():
+            return
+        if "error" in message:
+            future.set_exception(CdpError(message["error"].get("message", str(message["error"]))))
+        else:
+            future.set_result(message.get("result", {}))
+
+    def _fail_all(self, exc: Exception) -> None:
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(CdpError(f"DevTools connection closed: {exc}"))
+        self._pending.clear()
+
+    async def send(self, method: str, params: Optional[dict] = None,
+                   session_id: Optional[str] = None) -> dict:
+        message_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[message_id] = future
+        payload: Dict[str, Any] = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            payload["sessionId"] = session_id
+        with self._send_lock:
+            self._ws.send(json.dumps(payload))
+        return await asyncio.wait_for(future, COMMAND_TIMEOUT_SECONDS)
+
+    def close(self) -> None:
+        self._closed = True
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+
+class CdpPage:
+    """One page target attached with a flattened DevTools session."""
+
+    def __init__(self, connection: CdpConnection, target_id: str, session_id: str):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    async def send(self, method: str, params: Optional[dict] = None) -> dict:
+        return await self.connection.send(method, params, session_id=self.session_id)
+
+    async def evaluate(self, expression: str) -> Any:
+        """Evaluate ``expression`` (awaiting promises) and return its JSON value."""
+        result = await self.send(
+            "Runtime.evaluate",
+            {"expression": expression, "returnByValue": True, "awaitPromise": True},
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            text = details.get("exception", {}).get("description") or details.get("text")
+            raise CdpError(f"Page script failed: {text}")
+        return result.get("result", {}).get("value")
+
+    async def wait_for(self, expression: str, timeout: float = 60.0,
+                       poll_interval: float = 0.25) -> Any:
+        """Poll ``expression`` until it returns a truthy value."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                value = await self.evaluate(expression)
+            except CdpError:
+                # Navigations tear down the execution context mid-poll.
+                value = None
+            if value:
+                return value
+            if time.monotonic() > deadline:
+                raise asyncio.TimeoutError(f"Timed out after {timeout}s waiting for: {expression}")
+            await asyncio.sleep(poll_interval)
+
+    async def navigate(self, url: str, timeout: float = 60.0) -> None:
+        """Open ``url`` and wait until the new document has loaded.
+
+        On a reused page the previous document stays (and reports ``complete``)
+        until the navigation commits, so that document is marked first and only
+        an unmarked document counts as loaded.
+        """
+        mark = json.dumps(f"nav-{next(_navigation_marks)}")
+        await self.evaluate(f"window.{NAVIGATION_MARK} = {mark}")
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CdpError(f"Navigation to {url} failed: {result['errorText']}")
+        if result.get("loaderId"):
+            committed = f"window.{NAVIGATION_MARK} !== {mark}"
+        else:
+            # Same-document navigation (only the fragment changed): the document keeps its mark.
+            committed = f"location.href === {json.dumps(url)}"
+        await self.wait_for(f"{committed} && document.readyState === 'complete'", timeout)
+
+
+class CdpBrowser:
+    """Entry point: attach to a running browser and open concurrent page targets."""
+
+    def __init__(self, connection: CdpConnection, browser_context_id: Optional[str]):
+        self.connection = connection
+        self.browser_context_id = browser_context_id
+        self._pages: list[CdpPage] = []
+
+    @classmethod
+    async def attach(cls, address: str) -> "CdpBrowser":
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=10) as response:
+            version = json.load(response)
+        return await cls.connect(version["webSocketDebuggerUrl"])
+
+    @classmethod
+    async def connect(cls, ws_url: str) -> "CdpBrowser":
+        connection = CdpConnection(ws_url, asyncio.get_running_loop())
+        # Reuse the context of an existing page so new targets share its cookies.
+        targets = await connection.send("Target.getTargets")
+        page_contexts = [
+            info.get("browserContextId")
+            for info in targets.get("targetInfos", [])
+            if info.get("type") == "page"
+        ]
+        return cls(connection, page_contexts[0] if page_contexts else None)
+
+    @classmethod
+    async def attach_to_driver(cls, driver) -> "CdpBrowser":
+        # Grid sessions proxy the node's browser endpoint; the debugger address is node-local.
+        grid_endpoint = driver.capabilities.get("se:cdp")
+        if grid_endpoint:
+            return await cls.connect(grid_endpoint)
+        return await cls.attach(debugger_address(driver))
+
+    async def new_page(self) -> CdpPage:
+        params: Dict[str, Any] = {"url": "about:blank"}
+        if self.browser_context_id:
+            params["browserContextId"] = self.browser_context_id
+        target = await self.connection.send("Target.createTarget", params)
+        attached = await self.connection.send(
+            "Target.attachToTarget", {"targetId": target["targetId"], "flatten": True}
+        )
+        page = CdpPage(self.connection, target["targetId"], attached["sessionId"])
+        await page.send("Page.enable")
+        await page.send("Runtime.enable")
+        self._pages.append(page)
+        return page
+
+    async def close_page(self, page: CdpPage) -> None:
+        try:
+            await self.connection.send("Target.closeTarget", {"targetId": page.target_id})
+        finally:
+            if page in self._pages:
+                self._pages.remove(page)
+
+    async def close(self) -> None:
+        for page in list(self._pages):
+            try:
+                await self.close_page(page)
+            except CdpError:
+                pass
+        self.connection.close()
+
+    async def map_pages(self, items: Iterable[T], job: Callable[[CdpPage, T], Awaitable[Any]],
+                        concurrency: int = DEFAULT_CONCURRENCY) -> Dict[T, Any]:
+        """Run ``job(page, item)`` for every item on at most ``concurrency`` pages.
+
+        Results map each item to its return value, or to the exception it raised,
+        so one slow or broken tab does not abort the others.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+        results: Dict[T, Any] = {}
+
+        async def worker() -> None:
+            page = await self.new_page()
+            try:
+                while not queue.empty():
+                    item = queue.get_nowait()
+                    try:
+                        results[item] = await job(page, item)
+                    except Exception as exc:
+                        results[item] = exc
+            finally:
+                await self.close_page(page)
+
+        workers = min(concurrency, queue.qsize()) or 1
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
+
+
+def run_against_driver(driver, items: Iterable[T],
+                       job: Callable[[CdpPage, T], Awaitable[Any]],
+                       concurrency: int = DEFAULT_CONCURRENCY) -> Dict[T, Any]:
+    """Synchronous helper for pytest fixtures: attach, fan out ``job``, detach."""
+
+    async def _run() -> Dict[T, Any]:
+        browser = await CdpBrowser.attach_to_driver(driver)
+        try:
+            return await browser.map_pages(items, job, concurrency)
+        finally:
+            await browser.close()
+
+    return asyncio.run(_run())
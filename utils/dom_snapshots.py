@@ -0,0 +1,425 @@
+"""DOM snapshot capture and offline replay of the read-only suites.
+
+``DOM_SNAPSHOT=capture``: at each ``dom_snapshots.checkpoint(name)`` the test's
+page is captured with CDP ``DOMSnapshot.captureSnapshot`` (Chrome/Edge),
+reduced to the rendered element tree and stored gzipped under
+``HISTORY_DIR/dom_snapshots/<env>/<test>/``.
+
+``DOM_SNAPSHOT=replay``: the ``driver`` fixture hands the test a
+:class:`ReplayDriver` over those files instead of a browser, so assertion and
+normalization changes can be iterated on in milliseconds. The replayed page
+moves to the next recorded state after an action (click, refresh, navigation)
+when the current one has nothing matching a lookup; ``time.sleep`` and wait
+timeouts run on a virtual clock. Replay runs no JavaScript: the page objects'
+lookup scripts (first visible element, locator evaluation, spinner check) are
+answered from the recorded DOM, so page objects need no replay cases. Replay
+needs ``lxml``.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+
+from utils.history import history_dir
+
+DOM_SNAPSHOT_ENV = "DOM_SNAPSHOT"
+DOM_SNAPSHOT_MODES = ("off", "capture", "replay")
+DOM_SNAPSHOT_DIR_ENV = "DOM_SNAPSHOT_DIR"
+MANIFEST_NAME = "manifest.json"
+
+HIDDEN_ATTR = "data-replay-hidden"
+BLOCK_ATTR = "data-replay-block"
+_CAPTURED_STYLES = ["display", "visibility"]
+_INLINE_DISPLAYS = {"inline", "inline-block", "inline-flex", "inline-grid", "contents", ""}
+_XML_NAME = re.compile(r"^[A-Za-z_][\w.\-]*$")
+
+# 1x1 transparent PNG returned for screenshots during replay.
+_BLANK_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000b49444154789c6360000200000500017a5eab3f0000000049454e44ae426082"
+)
+
+
+def dom_snapshot_mode() -> str:
+    mode = os.environ.get(DOM_SNAPSHOT_ENV, "off").strip().lower() or "off"
+    if mode not in DOM_SNAPSHOT_MODES:
+        raise ValueError(
+            f"{DOM_SNAPSHOT_ENV} must be one of {', '.join(DOM_SNAPSHOT_MODES)}, got '{mode}'."
+        )
+    return mode
+
+
+def snapshot_root(environment: str) -> Path:
+    raw = os.environ.get(DOM_SNAPSHOT_DIR_ENV, "").strip()
+    return (Path(raw) if raw else history_dir() / "dom_snapshots") / environment
+
+
+def _safe_name(text: str) -> str:
+    return re.sub(r"[^\w.\-]+", "_", text).strip("_")
+
+
+def recording_name(node) -> str:
+    """Directory name for a test item, e.g. ``test_accounts_tab_column__test_verify_...``."""
+    return _safe_name(f"{node.path.stem}__{node.name}")
+
+
+def snapshot_to_xml(snapshot: dict) -> str:
+    """Rendered element tree of a ``DOMSnapshot.captureSnapshot`` result as XML.
+
+    Only the main document is kept. Elements without a layout box (or with
+    ``visibility: hidden``) are marked with ``data-replay-hidden``, block-level
+    elements with ``data-replay-block``, and text nodes keep their rendered
+    text. Shadow roots are inlined into their host.
+    """
+    strings = snapshot["strings"]
+    document = snapshot["documents"][0]
+    nodes = document["nodes"]
+    layout = document["layout"]
+
+    def string(index) -> str:
+        return strings[index] if isinstance(index, int) and index >= 0 else ""
+
+    styles: Dict[int, List[str]] = {}
+    rendered_text: Dict[int, str] = {}
+    for position, node_index in enumerate(layout["nodeIndex"]):
+        styles[node_index] = [string(value) for value in layout["styles"][position]]
+        if position < len(layout.get("text", [])) and layout["text"][position] >= 0:
+            rendered_text[node_index] = string(layout["text"][position])
+
+    parents = nodes["parentIndex"]
+    children: Dict[int, List[int]] = {}
+    for index, parent in enumerate(parents):
+        children.setdefault(parent, []).append(index)
+
+    def render(index: int, out: List[str]) -> None:
+        node_type = nodes["nodeType"][index]
+        if node_type == 3:
+            if index in rendered_text:
+                out.append(escape(rendered_text[index]))
+            return
+        if node_type == 11:
+            for child in children.get(index, []):
+                render(child, out)
+            return
+        if node_type != 1:
+            for child in children.get(index, []):
+                render(child, out)
+            return
+        name = string(nodes["nodeName"][index]).lower()
+        if not _XML_NAME.match(name) or name in {"script", "style", "template", "noscript"}:
+            return
+        attributes = nodes["attributes"][index]
+        parts = [name]
+        for key, value in zip(attributes[::2], attributes[1::2]):
+            key = string(key)
+            if _XML_NAME.match(key) and not key.startswith("xmlns"):
+                parts.append(f"{key}={quoteattr(string(value))}")
+        display, visibility = (styles.get(index) or ["none", "hidden"])[:2]
+        if index not in styles or visibility in {"hidden", "collapse"}:
+            parts.append(f'{HIDDEN_ATTR}="1"')
+        elif display not in _INLINE_DISPLAYS:
+            parts.append(f'{BLOCK_ATTR}="1"')
+        out.append(f"<{' '.join(parts)}>")
+        for child in children.get(index, []):
+            render(child, out)
+        out.append(f"</{name}>")
+
+    out: List[str] = []
+    for root in children.get(-1, []):
+        render(root, out)
+    return "".join(out)
+
+
+class DomCheckpoints:
+    """Per-test checkpoints: captured in ``capture`` mode, replayed in ``replay`` mode."""
+
+    def __init__(self, driver, mode: str, directory: Path):
+        self.driver = driver
+        self.mode = mode
+        self.directory = directory
+        self.entries: List[dict] = []
+        self._staging = directory.with_name(directory.name + ".partial")
+
+    def checkpoint(self, name: str) -> None:
+        if self.mode == "replay":
+            self.driver.show(name)
+        elif self.mode == "capture":
+            self._capture(name)
+
+    def _capture(self, name: str) -> None:
+        try:
+            snapshot = self.driver.execute_cdp_cmd(
+                "DOMSnapshot.captureSnapshot", {"computedStyles": _CAPTURED_STYLES}
+            )
+        except Exception as exc:
+            # Firefox has no CDP; a failed capture must not fail the test itself.
+            logging.warning("DOM snapshot '%s' not captured: %s", name, exc)
+            return
+        if not self.entries:
+            shutil.rmtree(self._staging, ignore_errors=True)
+            self._staging.mkdir(parents=True)
+        file_name = f"{len(self.entries):02d}_{_safe_name(name)}.xml.gz"
+        with gzip.open(self._staging / file_name, "wt", encoding="utf-8") as snapshot_file:
+            snapshot_file.write(snapshot_to_xml(snapshot))
+        self.entries.append({"name": name, "url": self.driver.current_url, "file": file_name})
+
+    def save(self) -> None:
+        """Replace the test's previous recording with this run's checkpoints."""
+        if self.mode != "capture" or not self.entries:
+            return
+        with (self._staging / MANIFEST_NAME).open("w", encoding="utf-8") as manifest_file:
+            json.dump(self.entries, manifest_file, indent=1)
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.replace(self._staging, self.directory)
+
+
+def _xpath_literal(value: str) -> str:
+    return f"'{value}'" if "'" not in value else f'"{value}"'
+
+
+def _by_to_xpath(by: str, value: str) -> str:
+    if by == "xpath":
+        return value
+    if by == "id":
+        return f".//*[@id={_xpath_literal(value)}]"
+    if by == "name":
+        return f".//*[@name={_xpath_literal(value)}]"
+    if by == "tag name":
+        return f".//{value}"
+    if by == "class name":
+        return f".//*[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')]"
+    if by == "css selector":
+        try:
+            from lxml.cssselect import CSSSelector
+        except ImportError as exc:
+            raise InvalidSelectorException(f"CSS selectors in replay need cssselect: {exc}")
+        return CSSSelector(value).path
+    raise InvalidSelectorException(f"Locator strategy '{by}' is not supported in replay")
+
+
+class ReplayElement:
+    def __init__(self, driver: "ReplayDriver", node):
+        self._driver = driver
+        self._node = node
+
+    @property
+    def tag_name(self) -> str:
+        return self._node.tag
+
+    @property
+    def text(self) -> str:
+        if not self.is_displayed():
+            return ""
+        lines = [line.strip() for line in _rendered_text(self._node).split("\n")]
+        return "\n".join(line for line in lines if line)
+
+    def is_displayed(self) -> bool:
+        return self._node.get(HIDDEN_ATTR) is None
+
+    def is_enabled(self) -> bool:
+        return self._node.get("disabled") is None
+
+    def is_selected(self) -> bool:
+        return self._node.get("checked") is not None or self._node.get("selected") is not None
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self._node.get(name)
+
+    get_dom_attribute = get_attribute
+
+    def click(self) -> None:
+        self._driver.acted()
+
+    def send_keys(self, *value) -> None:
+        self._driver.acted()
+
+    def clear(self) -> None:
+        pass
+
+    def find_elements(self, by: str = "id", value: Optional[str] = None) -> List["ReplayElement"]:
+        xpath = _by_to_xpath(by, value)
+        if xpath.startswith("/"):
+            xpath = "." + xpath
+        return [ReplayElement(self._driver, node) for node in self._node.xpath(xpath)]
+
+    def find_element(self, by: str = "id", value: Optional[str] = None) -> "ReplayElement":
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"Replay: no element for {by}={value!r}")
+        return found[0]
+
+
+def _rendered_text(node) -> str:
+    parts = [node.text or ""]
+    for child in node:
+        if child.get(HIDDEN_ATTR) is None:
+            inner = _rendered_text(child)
+            parts.append(f"\n{inner}\n" if child.get(BLOCK_ATTR) is not None else inner)
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+class ReplayDriver:
+    """In-memory stand-in for a WebDriver over one test's recorded DOM states."""
+
+    session_id = "replay"
+
+    def __init__(self, directory: Path, logged_in_user: Optional[str] = None):
+        from lxml import etree
+
+        # Recordings start after login: like a leased session, replay is already logged in.
+        self.logged_in_user = logged_in_user
+
+        with (directory / MANIFEST_NAME).open(encoding="utf-8") as manifest_file:
+            self.entries = json.load(manifest_file)
+        self.documents = []
+        for entry in self.entries:
+            with gzip.open(directory / entry["file"], "rb") as snapshot_file:
+                self.documents.append(etree.fromstring(snapshot_file.read()))
+        self.index = 0
+        self._acted = False
+
+    # Navigation and state
+
+    @property
+    def current_url(self) -> str:
+        return self.entries[self.index]["url"]
+
+    @property
+    def title(self) -> str:
+        titles = self.documents[self.index].xpath("//title/text()")
+        return titles[0] if titles else ""
+
+    def acted(self) -> None:
+        self._acted = True
+
+    def show(self, name: str) -> None:
+        for index, entry in enumerate(self.entries):
+            if entry["name"] == name:
+                self.index = index
+                self._acted = False
+                return
+        raise LookupError(f"No DOM snapshot named '{name}' was recorded for this test")
+
+    def get(self, url: str) -> None:
+        for index in range(self.index, len(self.entries)):
+            if self.entries[index]["url"] == url:
+                self.index = index
+                self._acted = False
+                return
+        self._acted = True
+
+    def refresh(self) -> None:
+        self._acted = True
+
+    def execute_script(self, script: str, *args):
+        answer = _page_scripts().get(script)
+        if answer is not None:
+            return answer(self, *args)
+        if "click" in script:
+            self._acted = True
+        if "readyState" in script:
+            return "complete"
+        return None
+
+    def get_screenshot_as_png(self) -> bytes:
+        return _BLANK_PNG
+
+    def save_screenshot(self, filename) -> bool:
+        Path(filename).write_bytes(_BLANK_PNG)
+        return True
+
+    def set_window_size(self, width, height) -> None:
+        pass
+
+    def delete_all_cookies(self) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
+    # Lookups
+
+    def find_elements(self, by: str = "id", value: Optional[str] = None) -> List[ReplayElement]:
+        xpath = _by_to_xpath(by, value)
+        nodes = self.documents[self.index].xpath(xpath)
+        if not nodes and self._acted and self.index + 1 < len(self.documents):
+            # The page changed after the last action: move on to the next recorded state.
+            self.index += 1
+            self._acted = False
+            nodes = self.documents[self.index].xpath(xpath)
+        return [ReplayElement(self, node) for node in nodes]
+
+    def find_element(self, by: str = "id", value: Optional[str] = None) -> ReplayElement:
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"Replay: no element for {by}={value!r}")
+        return found[0]
+
+    # Page-object scripts
+
+    def _first_visible(self, locators) -> Optional[ReplayElement]:
+        # A miss can advance the replay to the next recorded state, so XPaths are
+        # looked up together as one union rather than one state per locator.
+        if all(by == "xpath" for by, _ in locators):
+            locators = [("xpath", " | ".join(value for _, value in locators))]
+        for by, value in locators:
+            for element in self.find_elements(by, value):
+                if element.is_displayed() and element.is_enabled():
+                    return element
+        return None
+
+    def _evaluate_locator(self, css, xpath, root, shadow, mode) -> dict:
+        # No "ms": replayed lookups are not counted in the locator timings.
+        elements = self.find_elements("xpath", xpath)
+        if mode == "count":
+            return {"value": len(elements)}
+        if mode == "visible_count":
+            return {"value": sum(1 for element in elements if element.is_displayed())}
+        if mode == "texts":
+            return {"value": [text for text in (element.text.strip() for element in elements) if text]}
+        return {"value": elements}
+
+
+@lru_cache(maxsize=1)
+def _page_scripts() -> Dict[str, Callable]:
+    """Page-object script -> how :class:`ReplayDriver` answers it from the recorded DOM."""
+    from pages import base_page, list_view_page, locators
+
+    return {
+        base_page._FIRST_VISIBLE_SCRIPT: ReplayDriver._first_visible,
+        locators._EVALUATE_SCRIPT: ReplayDriver._evaluate_locator,
+        # Snapshots are recorded on settled pages.
+        list_view_page._NO_SPINNER_SCRIPT: lambda driver: True,
+    }
+
+
+@contextmanager
+def virtual_clock():
+    """Make ``time.sleep`` instant; ``time.monotonic``/``time.time`` advance by the skipped time."""
+    real_sleep, real_monotonic, real_time = time.sleep, time.monotonic, time.time
+    skipped = [0.0]
+
+    def sleep(seconds: float) -> None:
+        skipped[0] += max(float(seconds), 0.0)
+
+    time.sleep = sleep
+    time.monotonic = lambda: real_monotonic() + skipped[0]
+    time.time = lambda: real_time() + skipped[0]
+    try:
+        yield
+    finally:
+        time.sleep, time.monotonic, time.time = real_sleep, real_monotonic, real_time
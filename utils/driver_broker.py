@@ -0,0 +1,514 @@
+"""Driver broker: a side process that keeps warm, logged-in browser sessions.
+
+Without it every xdist worker starts a browser and logs in for every test, and
+whatever it had warmed up dies with the worker. With ``DRIVER_BROKER=1`` the
+controller starts this module as a separate process in ``pytest_configure``.
+The broker keeps ``DRIVER_BROKER_SIZE`` sessions per environment (one
+environment per portal, e.g. ``uat_fa_data_set``) started and logged in, and
+workers lease them over a local socket. A worker attaches to the leased session
+through the WebDriver endpoint that owns it (the broker's local driver service,
+or the Grid), so a lease costs one socket round trip instead of a browser start
+plus a login.
+
+Released sessions are recycled in the background: extra windows are closed and
+the login is checked (and redone if it expired) before the session goes back to
+the idle pool. Sessions that fail either step are quit and replaced. Idle
+sessions are pinged every ``KEEPALIVE_INTERVAL`` seconds so they don't time out
+while waiting (:mod:`utils.session_keepalive`).
+
+Protocol: one JSON object per line on a TCP connection to ``127.0.0.1``, one
+request and one response per connection.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+BROKER_ENV = "DRIVER_BROKER"
+BROKER_ADDRESS_ENV = "DRIVER_BROKER_ADDRESS"
+BROKER_SIZE_ENV = "DRIVER_BROKER_SIZE"
+LEASE_TIMEOUT_ENV = "DRIVER_BROKER_LEASE_TIMEOUT"
+
+DEFAULT_LEASE_TIMEOUT_SECONDS = 300.0
+STARTUP_TIMEOUT_SECONDS = 60.0
+WARM_FAILURE_LIMIT = 3
+WARM_RETRY_BACKOFF_SECONDS = 5.0
+LOG_PATH = Path(__file__).resolve().parent.parent / "reports" / "driver_broker.log"
+# By.CSS_SELECTOR, spelled out to keep selenium.webdriver out of conftest's imports.
+MARKETPLACE_LINK = ("css selector", "a[title='Dakota Marketplace']")
+
+
+class BrokerError(RuntimeError):
+    """The broker could not provide a session."""
+
+
+@dataclass
+class _Session:
+    driver: object
+    environment: str
+    username: str
+    started: float = field(default_factory=time.monotonic)
+    leases: int = 0
+    checked: float = field(default_factory=time.monotonic)
+
+
+class SessionPool:
+    """Warm sessions for one environment, refilled in the background."""
+
+    def __init__(self, environment: str, browser_name: str, size: int,
+                 executor: ThreadPoolExecutor):
+        from utils.session_keepalive import SessionKeeper, keepalive_interval
+
+        self.environment = environment
+        self.browser_name = browser_name
+        self.size = size
+        self._executor = executor
+        self._cond = threading.Condition()
+        self._idle: Deque[_Session] = deque()
+        self._leased: Dict[str, _Session] = {}
+        self._pending = 0  # sessions being started or recycled
+        self._consecutive_failures = 0
+        self._closed = False
+        self.stats = {"leases": 0, "lease_wait_total": 0.0, "started": 0,
+                      "recycled": 0, "relogins": 0, "discarded": 0, "start_failures": 0}
+        self.keeper = SessionKeeper.for_environment(environment)
+        self.keepalive_interval = keepalive_interval()
+
+    # -- capacity -----------------------------------------------------------
+    def _ensure_capacity(self) -> None:
+        """Start sessions until idle + leased + pending reaches ``size`` (call with lock held)."""
+        if self._closed or self._consecutive_failures >= WARM_FAILURE_LIMIT:
+            return
+        missing = self.size - (len(self._idle) + len(self._leased) + self._pending)
+        for _ in range(max(0, missing)):
+            self._pending += 1
+            self._executor.submit(self._warm_one)
+
+    def start(self) -> None:
+        with self._cond:
+            self._ensure_capacity()
+        if self.keepalive_interval:
+            threading.Thread(target=self._keepalive_loop, name=f"keepalive-{self.environment}",
+                             daemon=True).start()
+
+    def _login(self, browser_driver, runtime: dict) -> None:
+        from login_page import LoginPage
+
+        login_page = LoginPage(browser_driver)
+        login_page.navigate_to_login(runtime["url"])
+        login_page.login(runtime["username"], runtime["password"])
+
+    def _warm_one(self) -> None:
+        from config.settings import resolve_runtime_config
+        from utils.driver_factory import create_driver, quit_driver
+
+        browser_driver = None
+        try:
+            runtime = resolve_runtime_config(self.environment)
+            browser_driver = create_driver(self.browser_name)
+            self._login(browser_driver, runtime)
+            self.keeper.remember(browser_driver)
+        except Exception as exc:
+            logging.warning("Broker could not warm a %s session: %s", self.environment, exc)
+            if browser_driver is not None:
+                quit_driver(browser_driver)
+            with self._cond:
+                self._pending -= 1
+                self._consecutive_failures += 1
+                if not getattr(exc, "retryable", True):
+                    # e.g. LoginRejectedError: every further attempt would be rejected too.
+                    self._consecutive_failures = WARM_FAILURE_LIMIT
+                self.stats["start_failures"] += 1
+                self._cond.notify_all()
+            time.sleep(WARM_RETRY_BACKOFF_SECONDS)
+            with self._cond:
+                self._ensure_capacity()
+            return
+        with self._cond:
+            self._pending -= 1
+            self._consecutive_failures = 0
+            self.stats["started"] += 1
+            session = _Session(browser_driver, self.environment, runtime["username"])
+            if self._closed:
+                quit_driver(browser_driver)
+                return
+            self._idle.append(session)
+            self._cond.notify_all()
+
+    # -- lease / release ----------------------------------------------------
+    def lease(self, timeout: float) -> tuple[str, _Session]:
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._cond:
+            self._ensure_capacity()
+            while not self._idle:
+                if self._consecutive_failures >= WARM_FAILURE_LIMIT and not self._pending:
+                    raise BrokerError(
+                        f"Broker gave up warming {self.environment} sessions after "
+                        f"{WARM_FAILURE_LIMIT} consecutive failures; see {LOG_PATH}."
+                    )
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise BrokerError(f"No warm {self.environment} session within {timeout:.0f}s")
+                self._cond.wait(remaining)
+            session = self._idle.popleft()
+            lease_id = uuid.uuid4().hex
+            session.leases += 1
+            self._leased[lease_id] = session
+            self.stats["leases"] += 1
+            self.stats["lease_wait_total"] += time.monotonic() - started
+        return lease_id, session
+
+    def release(self, lease_id: str) -> None:
+        with self._cond:
+            session = self._leased.pop(lease_id, None)
+            if session is None:
+                return
+            self._pending += 1
+        self._executor.submit(self._recycle, session)
+
+    def _recycle(self, session: _Session) -> None:
+        """Return a released session to a clean, logged-in state, or replace it."""
+        from selenium.webdriver.support import expected_conditions as EC
+
+        from config.settings import resolve_runtime_config
+        from pages.base_page import BasePage
+        from utils.driver_factory import quit_driver
+
+        browser_driver = session.driver
+        try:
+            handles = browser_driver.window_handles
+            for handle in handles[1:]:
+                browser_driver.switch_to.window(handle)
+                browser_driver.close()
+            browser_driver.switch_to.window(handles[0])
+            runtime = resolve_runtime_config(self.environment)
+            browser_driver.get(runtime["url"])
+            try:
+                BasePage(browser_driver).wait_for("broker_session_check", 15).until(
+                    EC.presence_of_element_located(MARKETPLACE_LINK)
+                )
+            except WebDriverException:
+                # Session expired while leased or idle: log in again in place.
+                self.keeper.reauthenticate(browser_driver, "recycle")
+                with self._cond:
+                    self.stats["relogins"] += 1
+        except Exception as exc:
+            logging.warning("Broker discarded a %s session: %s", self.environment, exc)
+            quit_driver(browser_driver)
+            with self._cond:
+                self._pending -= 1
+                self.stats["discarded"] += 1
+                self._ensure_capacity()
+                self._cond.notify_all()
+            return
+        with self._cond:
+            self._pending -= 1
+            self.stats["recycled"] += 1
+            if self._closed:
+                quit_driver(browser_driver)
+                return
+            session.checked = time.monotonic()
+            self._idle.append(session)
+            self._cond.notify_all()
+
+    # -- keepalive ----------------------------------------------------------
+    def _keepalive_loop(self) -> None:
+        """Every interval, take out idle sessions not checked since and ping them."""
+        while True:
+            with self._cond:
+                self._cond.wait(self.keepalive_interval)
+                if self._closed:
+                    return
+                due = [session for session in self._idle
+                       if time.monotonic() - session.checked >= self.keepalive_interval]
+                for session in due:
+                    self._idle.remove(session)
+                    self._pending += 1
+            for session in due:
+                self._executor.submit(self._keep_alive, session)
+
+    def _keep_alive(self, session: _Session) -> None:
+        from utils.driver_factory import quit_driver
+
+        try:
+            if self.keeper.keep_alive(session.driver):
+                with self._cond:
+                    self.stats["relogins"] += 1
+        except Exception as exc:
+            logging.warning("Broker discarded an expired %s session: %s", self.environment, exc)
+            quit_driver(session.driver)
+            with self._cond:
+                self._pending -= 1
+                self.stats["discarded"] += 1
+                self._ensure_capacity()
+                self._cond.notify_all()
+            return
+        with self._cond:
+            self._pending -= 1
+            if self._closed:
+                quit_driver(session.driver)
+                return
+            session.checked = time.monotonic()
+            self._idle.append(session)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        from utils.driver_factory import quit_driver
+
+        with self._cond:
+            self._closed = True
+            sessions = list(self._idle) + list(self._leased.values())
+            self._idle.clear()
+            self._leased.clear()
+            self._cond.notify_all()
+        for session in sessions:
+            quit_driver(session.driver)
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            leases = self.stats["leases"]
+            return {
+                **self.stats,
+                **{f"keepalive_{name}": count for name, count in self.keeper.stats.items()},
+                "avg_lease_wait": round(self.stats["lease_wait_total"] / leases, 3) if leases else 0.0,
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "pending": self._pending,
+            }
+
+
+class DriverBroker:
+    """Pools keyed by environment; one browser type per run."""
+
+    def __init__(self, browser_name: str, size: int):
+        self.browser_name = browser_name
+        self.size = size
+        self._executor = ThreadPoolExecutor(max_workers=max(2, min(size, 8)),
+                                            thread_name_prefix="broker")
+        self._pools: Dict[str, SessionPool] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, environment: str) -> SessionPool:
+        with self._lock:
+            pool = self._pools.get(environment)
+            if pool is None:
+                pool = SessionPool(environment, self.browser_name, self.size, self._executor)
+                self._pools[environment] = pool
+                pool.start()
+            return pool
+
+    def handle(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "lease":
+            pool = self.pool(request["environment"])
+            lease_id, session = pool.lease(float(request.get("timeout", DEFAULT_LEASE_TIMEOUT_SECONDS)))
+            from utils.driver_factory import executor_url
+
+            return {
+                "lease_id": lease_id,
+                "environment": session.environment,
+                "executor_url": executor_url(session.driver),
+                "session_id": session.driver.session_id,
+                "capabilities": session.driver.caps,
+                "username": session.username,
+            }
+        if op == "release":
+            self.pool(request["environment"]).release(request["lease_id"])
+            return {}
+        if op == "stats":
+            with self._lock:
+                return {"pools": {env: pool.snapshot() for env, pool in self._pools.items()}}
+        raise BrokerError(f"Unknown broker op '{op}'")
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+            if request.get("op") == "shutdown":
+                response = {"ok": True}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                response = {"ok": True, **self.server.broker.handle(request)}
+        except Exception as exc:
+            response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+# -- client side (xdist workers and the controller) -------------------------
+
+def _request(address: str, payload: dict, timeout: float) -> dict:
+    host, port = address.rsplit(":", 1)
+    with socket.create_connection((host, int(port)), timeout=timeout) as conn:
+        conn.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+        with conn.makefile("r", encoding="utf-8") as reader:
+            line = reader.readline()
+    if not line:
+        raise BrokerError("Broker closed the connection without answering")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise BrokerError(response.get("error", "unknown broker error"))
+    return response
+
+
+class BrokerClient:
+    """Leases warm sessions from a running broker."""
+
+    def __init__(self, address: str):
+        self.address = address
+
+    @classmethod
+    def from_env(cls) -> Optional["BrokerClient"]:
+        address = os.environ.get(BROKER_ADDRESS_ENV, "").strip()
+        return cls(address) if address else None
+
+    def lease(self, environment: str, timeout: Optional[float] = None):
+        """Driver attached to a warm, logged-in session for ``environment``."""
+        from utils.driver_factory import attach_driver
+
+        if timeout is None:
+            timeout = float(os.environ.get(LEASE_TIMEOUT_ENV, DEFAULT_LEASE_TIMEOUT_SECONDS))
+        response = _request(
+            self.address,
+            {"op": "lease", "environment": environment, "timeout": timeout},
+            timeout + 10,
+        )
+        browser_driver = attach_driver(
+            response["executor_url"], response["session_id"], response["capabilities"]
+        )
+        # LoginPage skips the form for this user; the broker already logged in.
+        browser_driver.logged_in_user = response["username"]
+        browser_driver.broker_lease = (response["environment"], response["lease_id"])
+        return browser_driver
+
+    def release(self, browser_driver) -> None:
+        environment, lease_id = browser_driver.broker_lease
+        _request(
+            self.address,
+            {"op": "release", "environment": environment, "lease_id": lease_id},
+            30,
+        )
+
+    def stats(self) -> dict:
+        return _request(self.address, {"op": "stats"}, 30)["pools"]
+
+    def shutdown(self) -> None:
+        _request(self.address, {"op": "shutdown"}, 30)
+
+
+def broker_enabled() -> bool:
+    from utils.driver_factory import env_flag
+
+    return env_flag(BROKER_ENV)
+
+
+def start_broker(browser_name: str, environment: str, size: int) -> subprocess.Popen:
+    """Start the broker process, warm ``environment`` and export its address for workers."""
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    log_file = LOG_PATH.open("a", encoding="utf-8")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "utils.driver_broker",
+         "--browser", browser_name, "--size", str(size), "--warm", environment],
+        cwd=str(Path(__file__).resolve().parent.parent),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=log_file,
+        text=True,
+    )
+    log_file.close()
+    ready: list[str] = []
+    reader = threading.Thread(target=lambda: ready.append(process.stdout.readline()), daemon=True)
+    reader.start()
+    reader.join(STARTUP_TIMEOUT_SECONDS)
+    line = ready[0].strip() if ready else ""
+    if not line.startswith("READY "):
+        process.kill()
+        raise BrokerError(f"Driver broker did not start (see {LOG_PATH})")
+    address = line.split(" ", 1)[1]
+    # Set before xdist spawns workers so they inherit the address.
+    os.environ[BROKER_ADDRESS_ENV] = address
+    logging.info("Driver broker listening on %s (%d sessions per environment)", address, size)
+    return process
+
+
+def stop_broker(process: subprocess.Popen) -> None:
+    client = BrokerClient.from_env()
+    try:
+        if client is not None:
+            client.shutdown()
+        process.wait(timeout=60)
+    except (OSError, BrokerError, subprocess.TimeoutExpired) as exc:
+        logging.warning("Driver broker did not stop cleanly: %s", exc)
+        process.kill()
+    finally:
+        os.environ.pop(BROKER_ADDRESS_ENV, None)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Warm browser session broker")
+    parser.add_argument("--browser", default="chrome")
+    parser.add_argument("--size", type=int, default=2)
+    parser.add_argument("--warm", action="append", default=[],
+                        help="Environment to start warming immediately (repeatable)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    broker = DriverBroker(args.browser, args.size)
+    server = _Server(("127.0.0.1", 0), _Handler)
+    server.broker = broker
+    for environment in args.warm:
+        broker.pool(environment)
+
+    host, port = server.server_address
+    print(f"READY {host}:{port}", flush=True)
+    # From here on, page-object prints go to the log instead of the unread pipe.
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def _watch_parent() -> None:
+        # The controller holds our stdin; EOF means it exited without shutting us down.
+        sys.stdin.read()
+        server.shutdown()
+
+    threading.Thread(target=_watch_parent, daemon=True).start()
+    try:
+        server.serve_forever()
+    finally:
+        broker.close()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,580 @@
+"""Browser session construction shared by fixtures and session-level hooks.
+
+``conftest.driver`` builds one browser per test through :func:`create_driver`;
+session hooks (for example the list-view sweeper) use the same function so every
+browser gets the same viewport, headless and binary settings, whether it runs on
+this machine or on a Selenium Grid node. With ``DRIVER_PRESPAWN`` set,
+:class:`DriverPrespawner` starts the next test's browser while the current one
+runs.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import urllib.request
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+# selenium.webdriver, the browser services and webdriver-manager are imported
+# inside the functions that start a browser: conftest imports this module, and
+# a --collect-only pass should not pay for them.
+
+SUPPORTED_BROWSERS = ("chrome", "edge", "firefox")
+
+DEFAULT_BROWSER_WIDTH = 1920
+DEFAULT_BROWSER_HEIGHT = 1080
+
+REMOTE_URL_ENV = "REMOTE_WEBDRIVER_URL"
+DEFAULT_REMOTE_RETRIES = 2
+REMOTE_RETRY_BACKOFF_SECONDS = 5
+
+BINARY_ENV_VARS = {
+    "chrome": "CHROME_BINARY",
+    "edge": "EDGE_BINARY",
+    "firefox": "FIREFOX_BINARY",
+}
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _resolve_viewport_size() -> tuple[int, int]:
+    width_raw = os.environ.get("BROWSER_WIDTH", str(DEFAULT_BROWSER_WIDTH)).strip()
+    height_raw = os.environ.get("BROWSER_HEIGHT", str(DEFAULT_BROWSER_HEIGHT)).strip()
+    try:
+        width = int(width_raw)
+        height = int(height_raw)
+    except ValueError as exc:
+        raise ValueError(
+            "BROWSER_WIDTH and BROWSER_HEIGHT must be valid integers."
+        ) from exc
+    if width <= 0 or height <= 0:
+        raise ValueError("BROWSER_WIDTH and BROWSER_HEIGHT must be greater than zero.")
+    return width, height
+
+
+def _is_headless_mode() -> bool:
+    # Default to headless on Jenkins unless explicitly overridden.
+    default_headless = bool(os.environ.get("JENKINS_URL"))
+    return env_flag("HEADLESS", default=default_headless)
+
+
+def resolve_browser_name(cli_browser: str | None = None) -> str:
+    browser = (cli_browser or os.environ.get("BROWSER") or "chrome").strip().lower()
+    if browser not in SUPPORTED_BROWSERS:
+        raise ValueError(
+            f"Unsupported browser '{browser}'. Supported browsers: chrome, edge, firefox"
+        )
+    return browser
+
+
+def _build_common_browser_args(options):
+    options.add_argument("--start-maximized")
+    options.add_argument("--disable-infobars")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--no-sandbox")
+
+
+def _resolve_browser_binary(browser_name: str) -> str | None:
+    env_var = BINARY_ENV_VARS[browser_name]
+    explicit_binary = os.environ.get(env_var, "").strip()
+    if explicit_binary:
+        if not Path(explicit_binary).exists():
+            raise FileNotFoundError(
+                f"{env_var} is set but file does not exist: {explicit_binary}"
+            )
+        return explicit_binary
+
+    if browser_name == "chrome":
+        names = ["chrome", "google-chrome", "google-chrome-stable", "chrome.exe"]
+        candidates = [
+            r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+            r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+        ]
+    elif browser_name == "edge":
+        names = ["msedge", "msedge.exe", "microsoft-edge"]
+        candidates = [
+            r"C:\Program Files\Microsoft\Edge\Application\msedge.exe",
+            r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+        ]
+    else:  # firefox
+        names = ["firefox", "firefox.exe"]
+        candidates = [
+            r"C:\Program Files\Mozilla Firefox\firefox.exe",
+            r"C:\Program Files (x86)\Mozilla Firefox\firefox.exe",
+        ]
+
+    for name in names:
+        resolved = shutil.which(name)
+        if resolved:
+            return resolved
+    for candidate in candidates:
+        if Path(candidate).exists():
+            return candidate
+    return None
+
+
+def _effective_browser_for_driver(requested: str) -> str:
+    """On CI agents without Firefox, fall back to Chrome so jobs do not fail at fixture setup."""
+    if requested != "firefox":
+        return requested
+    if _resolve_browser_binary("firefox") is not None:
+        return requested
+    ci = env_flag("CI") or bool(os.environ.get("JENKINS_URL"))
+    if ci:
+        logging.warning(
+            "Requested Firefox but no Firefox binary was found; using Chrome on this agent."
+        )
+        return "chrome"
+    return requested
+
+
+def _apply_browser_binary_option(browser_name, options):
+    binary = _resolve_browser_binary(browser_name)
+    if not binary:
+        env_hint = BINARY_ENV_VARS[browser_name]
+        raise RuntimeError(
+            f"Could not find installed {browser_name} browser binary on this machine. "
+            f"Install {browser_name} or set {env_hint} to the browser executable path."
+        )
+    options.binary_location = binary
+    logging.info("Using %s binary: %s", browser_name, binary)
+
+
+def _build_options(browser_name: str, viewport_width: int, viewport_height: int,
+                   is_headless: bool):
+    """Browser options shared by local and Grid sessions."""
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.edge.options import Options as EdgeOptions
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+    if browser_name == "chrome":
+        options = ChromeOptions()
+        _build_common_browser_args(options)
+        options.add_argument(f"--window-size={viewport_width},{viewport_height}")
+        if is_headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--remote-allow-origins=*")  # Chrome 111+ fix
+    elif browser_name == "edge":
+        options = EdgeOptions()
+        _build_common_browser_args(options)
+        options.add_argument(f"--window-size={viewport_width},{viewport_height}")
+        if is_headless:
+            options.add_argument("--headless=new")
+    elif browser_name == "firefox":
+        options = FirefoxOptions()
+        options.add_argument(f"--width={viewport_width}")
+        options.add_argument(f"--height={viewport_height}")
+        if is_headless:
+            options.add_argument("-headless")
+    else:
+        raise ValueError(f"Driver setup failed for browser '{browser_name}'")
+    return options
+
+
+def _create_local_driver(browser_name: str, options):
+    from selenium import webdriver
+
+    _apply_browser_binary_option(browser_name, options)
+    if browser_name == "chrome":
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        try:
+            service = ChromeService(ChromeDriverManager().install())
+        except Exception as exc:
+            logging.warning(
+                "ChromeDriverManager failed: %s. Falling back to system ChromeDriver.", exc
+            )
+            service = ChromeService()
+        return webdriver.Chrome(service=service, options=options)
+    if browser_name == "edge":
+        from selenium.webdriver.edge.service import Service as EdgeService
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+        try:
+            service = EdgeService(EdgeChromiumDriverManager().install())
+        except Exception as exc:
+            logging.warning(
+                "EdgeDriverManager failed: %s. Falling back to system EdgeDriver.", exc
+            )
+            service = EdgeService()
+        return webdriver.Edge(service=service, options=options)
+    from selenium.webdriver.firefox.service import Service as FirefoxService
+    from webdriver_manager.firefox import GeckoDriverManager
+
+    try:
+        service = FirefoxService(GeckoDriverManager().install())
+    except Exception as exc:
+        logging.warning(
+            "GeckoDriverManager failed: %s. Falling back to system geckodriver.", exc
+        )
+        service = FirefoxService()
+    return webdriver.Firefox(service=service, options=options)
+
+
+def remote_webdriver_url(browser_name: str) -> str | None:
+    """Grid endpoint for ``browser_name``; ``REMOTE_WEBDRIVER_URL_<BROWSER>`` wins over the shared one."""
+    for name in (f"{REMOTE_URL_ENV}_{browser_name.upper()}", REMOTE_URL_ENV):
+        value = os.environ.get(name, "").strip()
+        if value:
+            return value.rstrip("/")
+    return None
+
+
+def _grid_browser_names(remote_url: str) -> set[str] | None:
+    """Browser names offered by the Grid's live nodes, or ``None`` when ``/status`` is unreadable."""
+    try:
+        with urllib.request.urlopen(f"{remote_url}/status", timeout=10) as response:
+            status = json.load(response).get("value", {})
+    except (OSError, ValueError) as exc:
+        logging.warning("Could not read Grid status from %s: %s", remote_url, exc)
+        return None
+    names = set()
+    for node in status.get("nodes", []):
+        if node.get("availability", "UP") != "UP":
+            continue
+        for slot in node.get("slots", []):
+            browser = slot.get("stereotype", {}).get("browserName")
+            if browser:
+                names.add(browser.lower())
+    return names
+
+
+def _check_grid_routing(remote_url: str, options) -> None:
+    """Fail fast when the Grid has live nodes but none can serve this browser."""
+    wanted = options.capabilities["browserName"].lower()
+    offered = _grid_browser_names(remote_url)
+    # No readable status, or no nodes yet (autoscaling Grid): let the Grid queue the request.
+    if not offered or wanted in offered:
+        return
+    raise RuntimeError(
+        f"Selenium Grid at {remote_url} has no live node for '{wanted}' "
+        f"(nodes offer: {', '.join(sorted(offered))}). "
+        f"Start a matching node or set {REMOTE_URL_ENV}_<BROWSER> to a Grid that has one."
+    )
+
+
+def _apply_remote_capabilities(browser_name: str, options) -> None:
+    # Binary overrides name a path on the node, so only explicit values are forwarded.
+    binary = os.environ.get(BINARY_ENV_VARS[browser_name], "").strip()
+    if binary:
+        options.binary_location = binary
+    platform_name = os.environ.get("REMOTE_PLATFORM_NAME", "").strip()
+    if platform_name:
+        options.platform_name = platform_name
+    browser_version = os.environ.get("REMOTE_BROWSER_VERSION", "").strip()
+    if browser_version:
+        options.browser_version = browser_version
+
+
+def _first_line(exc: Exception) -> str:
+    text = str(exc).strip()
+    return text.splitlines()[0] if text else type(exc).__name__
+
+
+def _create_remote_driver(browser_name: str, options, remote_url: str):
+    """Start a Grid session, retrying when a node fails to create it."""
+    from selenium import webdriver
+
+    _apply_remote_capabilities(browser_name, options)
+    _check_grid_routing(remote_url, options)
+    retries = max(0, int(os.environ.get("REMOTE_SESSION_RETRIES", DEFAULT_REMOTE_RETRIES)))
+    for attempt in range(retries + 1):
+        try:
+            browser_driver = webdriver.Remote(command_executor=remote_url, options=options)
+        except WebDriverException as exc:  # includes SessionNotCreatedException from the node
+            if attempt == retries:
+                raise
+            logging.warning(
+                "Grid session for %s failed on attempt %d/%d: %s",
+                browser_name, attempt + 1, retries + 1, _first_line(exc),
+            )
+            time.sleep(REMOTE_RETRY_BACKOFF_SECONDS * (attempt + 1))
+            continue
+        logging.info(
+            "Grid session %s for %s on %s", browser_driver.session_id, browser_name, remote_url
+        )
+        return browser_driver
+
+
+def create_driver(browser_name: str):
+    """Start a browser session for ``browser_name`` with the run's viewport settings.
+
+    Sessions are created on a Selenium Grid when ``REMOTE_WEBDRIVER_URL`` (or
+    ``REMOTE_WEBDRIVER_URL_<BROWSER>``) is set, otherwise on this machine.
+    """
+    remote_url = remote_webdriver_url(browser_name)
+    # The missing-Firefox fallback only applies to local browsers; the Grid decides remotely.
+    effective_browser = browser_name if remote_url else _effective_browser_for_driver(browser_name)
+    viewport_width, viewport_height = _resolve_viewport_size()
+    options = _build_options(
+        effective_browser, viewport_width, viewport_height, _is_headless_mode()
+    )
+    if remote_url:
+        browser_driver = _create_remote_driver(effective_browser, options, remote_url)
+    else:
+        browser_driver = _create_local_driver(effective_browser, options)
+
+    # Enforce viewport after session starts for consistent rendering/click targets.
+    browser_driver.set_window_size(viewport_width, viewport_height)
+    return browser_driver
+
+
+def quit_driver(browser_driver) -> None:
+    """Quit ``browser_driver``; a node that already died must not fail the test's teardown."""
+    try:
+        browser_driver.quit()
+    except WebDriverException as exc:
+        logging.warning("Browser session did not quit cleanly: %s", _first_line(exc))
+
+
+def executor_url(browser_driver) -> str:
+    """URL of the WebDriver endpoint serving ``browser_driver`` (local driver service or Grid)."""
+    return browser_driver.command_executor._client_config.remote_server_addr
+
+
+def attach_driver(command_executor: str, session_id: str, capabilities: dict):
+    """Drive a session another process created, e.g. one leased from the driver broker."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.edge.options import Options as EdgeOptions
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+    class AttachedDriver(webdriver.Remote):
+        """Remote client bound to the existing session instead of starting a new one."""
+
+        def start_session(self, _capabilities: dict) -> None:
+            self.session_id = session_id
+            self.caps = capabilities
+
+    browser = str(capabilities.get("browserName", "chrome")).lower()
+    if "edge" in browser:
+        options = EdgeOptions()
+    elif browser == "firefox":
+        options = FirefoxOptions()
+    else:
+        options = ChromeOptions()
+    return AttachedDriver(command_executor=command_executor, options=options)
+
+
+PRESPAWN_ENV = "DRIVER_PRESPAWN"
+PRESPAWN_LOGIN_ENV = "DRIVER_PRESPAWN_LOGIN"
+PRESPAWN_MIN_FREE_MB_ENV = "DRIVER_PRESPAWN_MIN_FREE_MB"
+MAX_PRESPAWN_DEPTH = 3
+DEFAULT_PRESPAWN_MIN_FREE_MB = 1500
+# A pre-logged-in browser left idle this long may have lost its session; start over.
+PRESPAWN_MAX_IDLE_SECONDS = 900.0
+PRESPAWN_FAILURE_LIMIT = 3
+PRESPAWN_MEMORY_RECHECK_SECONDS = 5.0
+# How long a test waits for a browser that is already half started before starting its own.
+PRESPAWN_TAKE_TIMEOUT_SECONDS = 120.0
+# Test id of the background login's step timings, which belong to no test.
+PRESPAWN_TEST_ID = "driver-prespawn"
+
+
+def prespawn_depth() -> int:
+    """Browsers kept started ahead of the next test (``DRIVER_PRESPAWN``; 0 is off)."""
+    raw = os.environ.get(PRESPAWN_ENV, "0").strip().lower()
+    if raw in {"", "0", "false", "no", "off"}:
+        return 0
+    if raw in {"1", "true", "yes", "on"}:
+        return 1
+    try:
+        depth = int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{PRESPAWN_ENV} must be a whole number, got '{raw}'.") from exc
+    if not 0 <= depth <= MAX_PRESPAWN_DEPTH:
+        raise ValueError(f"{PRESPAWN_ENV} must be between 0 and {MAX_PRESPAWN_DEPTH}, got {depth}.")
+    return depth
+
+
+def prespawn_min_free_mb() -> int:
+    raw = os.environ.get(PRESPAWN_MIN_FREE_MB_ENV, str(DEFAULT_PRESPAWN_MIN_FREE_MB)).strip()
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{PRESPAWN_MIN_FREE_MB_ENV} must be a whole number of MB, got '{raw}'.") from exc
+
+
+def available_memory_mb() -> int | None:
+    """Memory available to new processes on this machine, or None where it can't be read."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class DriverPrespawner:
+    """Starts the next test's browser on a background thread while the current test runs.
+
+    Up to ``depth`` browsers are kept started (and, with ``login``, logged in).
+    :meth:`take` hands one over, or waits for the one being started, and the
+    worker immediately starts its replacement, so the next test's browser start
+    overlaps with this test instead of following its teardown. Local browsers
+    are only started while at least ``min_free_mb`` of memory is available;
+    Grid sessions don't use this machine's memory and are not checked. Without
+    a ``keeper``, a browser idle for :data:`PRESPAWN_MAX_IDLE_SECONDS` is
+    discarded.
+    """
+
+    def __init__(self, browser_name: str, depth: int, *,
+                 login: Optional[Callable[[object], str]] = None,
+                 min_free_mb: int = DEFAULT_PRESPAWN_MIN_FREE_MB,
+                 keeper=None, keepalive_interval: float = PRESPAWN_MAX_IDLE_SECONDS):
+        self.browser_name = browser_name
+        self.depth = depth
+        self.login = login
+        self.min_free_mb = min_free_mb
+        # SessionKeeper for logged-in browsers: pinged instead of discarded when idle for
+        # keepalive_interval, and their navigations re-login if the session expired.
+        self.keeper = keeper
+        self.keepalive_interval = keepalive_interval
+        self._cond = threading.Condition()
+        self._idle: Deque[tuple[object, float]] = deque()
+        self._building = False
+        self._closed = False
+        self._consecutive_failures = 0
+        self.stats = {"started": 0, "hits": 0, "misses": 0, "discarded": 0,
+                      "start_failures": 0, "low_memory_waits": 0}
+        self._thread = threading.Thread(target=self._run, name="driver-prespawn", daemon=True)
+
+    def start(self) -> "DriverPrespawner":
+        self._thread.start()
+        return self
+
+    def _memory_allows(self) -> bool:
+        if remote_webdriver_url(self.browser_name):
+            return True
+        available = available_memory_mb()
+        return available is None or available >= self.min_free_mb
+
+    def _wants_more(self) -> bool:
+        return (
+            not self._closed
+            and len(self._idle) < self.depth
+            and self._consecutive_failures < PRESPAWN_FAILURE_LIMIT
+        )
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._wants_more():
+                    if self._closed:
+                        return
+                    self._cond.wait()
+                if not self._memory_allows():
+                    self.stats["low_memory_waits"] += 1
+                    self._cond.wait(PRESPAWN_MEMORY_RECHECK_SECONDS)
+                    continue
+                self._building = True
+            browser_driver = self._build()
+            with self._cond:
+                self._building = False
+                unwanted = browser_driver if self._closed else None
+                if browser_driver is not None and not self._closed:
+                    self._idle.append((browser_driver, time.monotonic()))
+                self._cond.notify_all()
+            if unwanted is not None:
+                # Outside the lock: quitting can take seconds and take() must not wait on it.
+                quit_driver(unwanted)
+
+    def _build(self):
+        from utils.timeouts import get_policy
+
+        browser_driver = None
+        try:
+            browser_driver = create_driver(self.browser_name)
+            if self.login is not None:
+                # Not part of the running test: its waits get no tab and no test budget.
+                with get_policy().outside_test():
+                    # LoginPage skips the form for this user, as for broker sessions.
+                    browser_driver.logged_in_user = self.login(browser_driver)
+        except Exception as exc:
+            logging.warning("Could not pre-start a %s browser: %s", self.browser_name, _first_line(exc))
+            if browser_driver is not None:
+                quit_driver(browser_driver)
+            with self._cond:
+                self._consecutive_failures += 1
+                if not getattr(exc, "retryable", True):
+                    # e.g. LoginRejectedError: every further attempt would be rejected too.
+                    self._consecutive_failures = PRESPAWN_FAILURE_LIMIT
+                self.stats["start_failures"] += 1
+            return None
+        with self._cond:
+            self._consecutive_failures = 0
+            self.stats["started"] += 1
+        return browser_driver
+
+    def _usable(self, browser_driver, started: float) -> bool:
+        idle_seconds = time.monotonic() - started
+        if self.keeper is None and idle_seconds > PRESPAWN_MAX_IDLE_SECONDS:
+            return False
+        try:
+            if self.keeper is not None and idle_seconds >= self.keepalive_interval:
+                # Idle long enough to have timed out: ping, and log back in if it did.
+                self.keeper.keep_alive(browser_driver)
+            else:
+                browser_driver.current_url
+        except Exception as exc:
+            logging.info("Discarding a pre-started browser: %s", _first_line(exc))
+            return False
+        return True
+
+    def take(self, timeout: float = PRESPAWN_TAKE_TIMEOUT_SECONDS):
+        """A started browser for the next test, or None when none is ready in time."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while not self._idle:
+                    remaining = deadline - time.monotonic()
+                    if not self._building or remaining <= 0:
+                        self.stats["misses"] += 1
+                        return None
+                    self._cond.wait(remaining)
+                browser_driver, started = self._idle.popleft()
+                self._cond.notify_all()
+            if self._usable(browser_driver, started):
+                with self._cond:
+                    self.stats["hits"] += 1
+                if self.keeper is not None:
+                    from utils.session_keepalive import attach_keeper
+
+                    attach_keeper(browser_driver, self.keeper)
+                return browser_driver
+            with self._cond:
+                self.stats["discarded"] += 1
+            quit_driver(browser_driver)
+
+    def close(self) -> None:
+        """Stop starting browsers and quit the ones nobody took."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(PRESPAWN_TAKE_TIMEOUT_SECONDS)
+        with self._cond:
+            leftovers = [browser_driver for browser_driver, _ in self._idle]
+            self._idle.clear()
+        for browser_driver in leftovers:
+            quit_driver(browser_driver)
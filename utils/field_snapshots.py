@@ -0,0 +1,218 @@
+"""Versioned snapshots of each tab's field lists with content hashes.
+
+The fields-comparison and fields-display suites extract "Select Fields To
+Display" and the Additional Filter field list on every run. Those lists are
+kept here, one JSON file per ``(env, portal, tab)`` under
+``HISTORY_DIR/field_snapshots``. A new version is appended only when a list's
+content hash changes, so the store doubles as a change log between builds.
+
+Each suite also records the hash it last *passed* on. With
+``FIELD_SNAPSHOT_MODE=quick`` a fields-display test skips its UI steps (field
+selection, saving a view, header checks) when the lists it has read match
+that hash, so only tabs whose metadata changed go through them. The
+fields-comparison suite does not skip: by the time its lists are read, only
+an in-memory comparison is left.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pytest
+
+from utils.history import file_lock, history_dir, write_json_atomic
+
+SNAPSHOT_DIR_NAME = "field_snapshots"
+SNAPSHOT_MODE_ENV = "FIELD_SNAPSHOT_MODE"
+SNAPSHOT_MODES = ("full", "quick", "off")
+MAX_VERSIONS = 20
+
+
+def snapshot_mode() -> str:
+    """``full`` (default: record and check everything), ``quick`` or ``off``."""
+    mode = os.environ.get(SNAPSHOT_MODE_ENV, "full").strip().lower() or "full"
+    if mode not in SNAPSHOT_MODES:
+        raise ValueError(
+            f"{SNAPSHOT_MODE_ENV} must be one of {', '.join(SNAPSHOT_MODES)}, got '{mode}'."
+        )
+    return mode
+
+
+def content_hash(value) -> str:
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class SnapshotChange:
+    """One tab whose field lists differ from the previous version."""
+
+    env: str
+    portal: str
+    tab: str
+    version: int
+    previous_version: Optional[int]
+    added: Dict[str, List[str]] = field(default_factory=dict)
+    removed: Dict[str, List[str]] = field(default_factory=dict)
+    reordered: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        if self.previous_version is None:
+            return f"{self.env}/{self.portal}/{self.tab}: first snapshot (v{self.version})"
+        parts = []
+        for name in sorted(set(self.added) | set(self.removed) | set(self.reordered)):
+            added, removed = self.added.get(name, []), self.removed.get(name, [])
+            if added or removed:
+                detail = ", ".join([f"+{item}" for item in added] + [f"-{item}" for item in removed])
+                parts.append(f"{name} [{detail}]")
+            else:
+                parts.append(f"{name} [reordered]")
+        return (
+            f"{self.env}/{self.portal}/{self.tab}: v{self.previous_version} -> v{self.version}: "
+            + "; ".join(parts)
+        )
+
+
+class FieldSnapshotStore:
+    """JSON files of snapshot versions, one per ``(env, portal, tab)``."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or history_dir() / SNAPSHOT_DIR_NAME
+
+    def path(self, env: str, portal: str, tab: str) -> Path:
+        return self.root / env / portal / f"{tab}.json"
+
+    def load(self, env: str, portal: str, tab: str) -> dict:
+        try:
+            with self.path(env, portal, tab).open(encoding="utf-8") as snapshot_file:
+                return json.load(snapshot_file)
+        except (FileNotFoundError, ValueError):
+            return {"env": env, "portal": portal, "tab": tab, "verified": {}, "versions": []}
+
+    def latest(self, env: str, portal: str, tab: str) -> Optional[dict]:
+        versions = self.load(env, portal, tab)["versions"]
+        return versions[-1] if versions else None
+
+    def save(self, env: str, portal: str, tab: str, lists: Dict[str, List[str]], *,
+             run_id: str, verified_check: Optional[str] = None) -> Optional[dict]:
+        """Merge ``lists`` into the latest version; append a version if any hash changed.
+
+        Returns the new version, or ``None`` when nothing changed. With
+        ``verified_check`` the resulting hash is recorded as that suite's last
+        passing state.
+        """
+        path = self.path(env, portal, tab)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(path):
+            data = self.load(env, portal, tab)
+            previous = data["versions"][-1] if data["versions"] else None
+            merged = dict(previous["lists"]) if previous else {}
+            merged.update(lists)
+            list_hashes = {name: content_hash(items) for name, items in merged.items()}
+            created = None
+            if previous is None or list_hashes != previous["list_hashes"]:
+                created = {
+                    "version": (previous["version"] + 1) if previous else 1,
+                    "hash": content_hash(merged),
+                    "list_hashes": list_hashes,
+                    "lists": merged,
+                    "run_id": run_id,
+                    "captured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                }
+                data["versions"] = (data["versions"] + [created])[-MAX_VERSIONS:]
+            if verified_check:
+                data["verified"][verified_check] = {
+                    name: list_hashes[name] for name in lists
+                }
+            if created is not None or verified_check:
+                write_json_atomic(path, data)
+        return created
+
+    def changes_for_run(self, run_id: str) -> List[SnapshotChange]:
+        """Tabs that got a new version during run ``run_id``, with a per-list diff."""
+        changes: List[SnapshotChange] = []
+        for path in sorted(self.root.glob("*/*/*.json")):
+            with path.open(encoding="utf-8") as snapshot_file:
+                data = json.load(snapshot_file)
+            versions = data.get("versions", [])
+            for index, version in enumerate(versions):
+                if version.get("run_id") != run_id:
+                    continue
+                previous = versions[index - 1] if index > 0 else None
+                changes.append(_diff(data, previous, version))
+        return changes
+
+
+def _diff(data: dict, previous: Optional[dict], current: dict) -> SnapshotChange:
+    change = SnapshotChange(
+        data["env"], data["portal"], data["tab"], current["version"],
+        previous["version"] if previous else None,
+    )
+    if previous is None:
+        return change
+    for name, items in current["lists"].items():
+        before = previous["lists"].get(name, [])
+        if current["list_hashes"][name] == previous["list_hashes"].get(name):
+            continue
+        added = [item for item in items if item not in before]
+        removed = [item for item in before if item not in items]
+        if added or removed:
+            change.added[name] = added
+            change.removed[name] = removed
+        else:
+            change.reordered.append(name)
+    return change
+
+
+class TabFieldSnapshot:
+    """A test's view of its tab's snapshot; written once at teardown."""
+
+    def __init__(self, store: FieldSnapshotStore, env: str, portal: str, tab: str,
+                 check: str, run_id: str, mode: str):
+        self.store = store
+        self.env = env
+        self.portal = portal
+        self.tab = tab
+        self.check = check
+        self.run_id = run_id
+        self.mode = mode
+        self.lists: Dict[str, List[str]] = {}
+        self.verified = False
+        self._stored = store.load(env, portal, tab)
+
+    def record(self, **lists: Iterable[str]) -> None:
+        """Keep extracted lists, e.g. ``record(select_fields=[...])``."""
+        for name, items in lists.items():
+            self.lists[name] = list(items)
+
+    def changed(self) -> bool:
+        """Whether the lists recorded so far differ from the last version this check passed on."""
+        verified = self._stored["verified"].get(self.check, {})
+        return any(verified.get(name) != content_hash(items) for name, items in self.lists.items())
+
+    def skip_if_unchanged(self) -> None:
+        """In quick mode, skip the rest of the test when this check already passed on these lists."""
+        if self.mode == "quick" and self.lists and not self.changed():
+            version = self.store.latest(self.env, self.portal, self.tab) or {}
+            pytest.skip(
+                f"{SNAPSHOT_MODE_ENV}=quick: {', '.join(sorted(self.lists))} unchanged for "
+                f"{self.tab} since v{version.get('version', '?')}, which passed {self.check}."
+            )
+
+    def mark_verified(self) -> None:
+        """Call after the test's final assertion: the recorded lists passed this check."""
+        self.verified = True
+
+    def flush(self) -> Optional[dict]:
+        if self.mode == "off" or not self.lists:
+            return None
+        return self.store.save(
+            self.env, self.portal, self.tab, self.lists,
+            run_id=self.run_id, verified_check=self.check if self.verified else None,
+        )
@@ -0,0 +1,53 @@
+"""Files kept between runs under ``HISTORY_DIR`` (default ``<repo>/history``).
+
+Learned timeouts and field-list snapshots live here. xdist workers write the
+same files, so writers take :func:`file_lock` and replace files atomically.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_HISTORY_DIR = Path(__file__).resolve().parent.parent / "history"
+
+
+def history_dir() -> Path:
+    raw = os.environ.get("HISTORY_DIR", "").strip()
+    return Path(raw) if raw else DEFAULT_HISTORY_DIR
+
+
+@contextmanager
+def file_lock(path: Path, timeout: float = 10.0):
+    """Best-effort cross-process lock so xdist workers merge history safely."""
+    lock_path = path.with_suffix(path.suffix + ".lock")
+    deadline = time.monotonic() + timeout
+    fd = None
+    while fd is None:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if time.monotonic() > deadline:
+                # A crashed worker left the lock behind; take it over.
+                logging.warning("Stale lock %s; overriding.", lock_path)
+                lock_path.unlink(missing_ok=True)
+                continue
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        lock_path.unlink(missing_ok=True)
+
+
+def write_json_atomic(path: Path, data) -> None:
+    """Write ``data`` next to ``path`` and rename it into place (call with the lock held)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as history_file:
+        json.dump(data, history_file, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -0,0 +1,304 @@
+"""Throughput and scaling metrics for the lazy-loading suite.
+
+The lazy-loading tests used to reduce a scroll session to pass/fail. The
+:class:`LazyLoadMetrics` a test gets from the ``lazy_load_metrics`` fixture
+drives the scroll itself: it counts rows with one script call, polls for the
+next page instead of sleeping a fixed interval, and times every page from the
+scroll that triggered it to its last rendered row. At the end of the loop
+:meth:`LazyLoadMetrics.finish` reports rows per second, time per page, the
+scaling curve (page latency once 100, 500, 1,000, 2,000 … rows are loaded) and
+how much slower late pages are than early ones, checks them against the tab's
+budget in ``config.json`` and appends them to the step-timing export.
+
+Every ``LAZY_LOAD_SAMPLE_EVERY_ROWS`` rows (default 500, ``0`` to disable)
+the session also samples the browser's memory and DOM counters with
+:class:`utils.browser_telemetry.BrowserTelemetry`; leaks and super-linear
+growth are reported alongside the budget breaches.
+
+``LAZY_LOAD_TARGET_RECORDS`` raises the 2,000-row target (e.g. to 10,000) to
+see where the grid starts degrading; ``LAZY_LOAD_BUDGETS`` is ``warn``
+(default: report breaches), ``enforce`` (fail the test) or ``off``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from pages import locators
+from pages.locators import Locator
+from utils.browser_telemetry import BrowserTelemetry
+from utils.step_timings import record_step
+
+TARGET_RECORDS_ENV = "LAZY_LOAD_TARGET_RECORDS"
+DEFAULT_TARGET_RECORDS = 2000
+SAMPLE_EVERY_ROWS_ENV = "LAZY_LOAD_SAMPLE_EVERY_ROWS"
+DEFAULT_SAMPLE_EVERY_ROWS = 500
+BUDGET_MODE_ENV = "LAZY_LOAD_BUDGETS"
+BUDGET_MODES = ("warn", "enforce", "off")
+STEP_NAME = "lazy_loading"
+
+# Rows-loaded points reported on the scaling curve (up to the target).
+SCALE_POINTS = (100, 500, 1000, 2000, 5000, 10000)
+POLL_INTERVAL = 0.1
+# A page has finished rendering once the row count holds this long.
+SETTLE_SECONDS = 0.3
+# Pages compared at each end of the session when computing degradation.
+MIN_PAGES_FOR_DEGRADATION = 4
+
+def lazy_load_target_records() -> int:
+    raw = os.environ.get(TARGET_RECORDS_ENV, "").strip()
+    if not raw:
+        return DEFAULT_TARGET_RECORDS
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{TARGET_RECORDS_ENV} must be a whole number, got '{raw}'.") from exc
+    if value <= 0:
+        raise ValueError(f"{TARGET_RECORDS_ENV} must be greater than zero.")
+    return value
+
+
+def sample_every_rows() -> int:
+    """Rows between browser telemetry samples; ``0`` turns sampling off."""
+    raw = os.environ.get(SAMPLE_EVERY_ROWS_ENV, "").strip()
+    if not raw:
+        return DEFAULT_SAMPLE_EVERY_ROWS
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{SAMPLE_EVERY_ROWS_ENV} must be a whole number, got '{raw}'.") from exc
+    if value < 0:
+        raise ValueError(f"{SAMPLE_EVERY_ROWS_ENV} must not be negative.")
+    return value
+
+
+def budget_mode() -> str:
+    """``warn`` (default), ``enforce`` or ``off``."""
+    mode = os.environ.get(BUDGET_MODE_ENV, "warn").strip().lower() or "warn"
+    if mode not in BUDGET_MODES:
+        raise ValueError(f"{BUDGET_MODE_ENV} must be one of {', '.join(BUDGET_MODES)}, got '{mode}'.")
+    return mode
+
+
+@dataclass
+class PageLoad:
+    """One lazily loaded page: rows before and after, and how long it took."""
+
+    rows_before: int
+    rows_after: int
+    seconds: float
+    # Seconds since the session began when the page's last row appeared.
+    elapsed: float
+
+    @property
+    def rows(self) -> int:
+        return self.rows_after - self.rows_before
+
+    @property
+    def seconds_per_100_rows(self) -> float:
+        return self.seconds * 100.0 / self.rows
+
+
+def _p90(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, -(-9 * len(ordered) // 10) - 1)]
+
+
+@dataclass
+class LazyLoadMetrics:
+    """Times each page of one tab's lazy-loading session."""
+
+    url_key: str
+    environment: str
+    target_records: int
+    budget: Dict[str, float] = field(default_factory=dict)
+    mode: str = "warn"
+    row_locator: Locator = locators.GRID_ROW_CELLS
+    telemetry: Optional[BrowserTelemetry] = None
+    sample_every_rows: int = DEFAULT_SAMPLE_EVERY_ROWS
+    pages: List[PageLoad] = field(default_factory=list)
+    initial_count: int = 0
+    started: Optional[float] = None
+    _next_sample: int = 0
+    _sampling_offset: float = 0.0
+
+    def count_rows(self, driver) -> int:
+        return locators.count(driver, self.row_locator)
+
+    def _sample_telemetry(self, label: str, rows: int) -> None:
+        if self.telemetry is None or self.sample_every_rows <= 0:
+            return
+        self.telemetry.sample(label, rows)
+        self._next_sample = (rows // self.sample_every_rows + 1) * self.sample_every_rows
+
+    def begin(self, initial_count: int) -> None:
+        self.initial_count = initial_count
+        self.pages = []
+        self._sample_telemetry("initial", initial_count)
+        self._sampling_offset = self.telemetry.sampling_seconds if self.telemetry is not None else 0.0
+        self.started = time.monotonic()
+
+    def _wait_for_growth(self, driver, previous: int, timeout: float) -> Tuple[int, Optional[float]]:
+        """Poll until rows appear and settle; ``(count, time of last growth or None)``."""
+        deadline = time.monotonic() + timeout
+        count, grown_at = previous, None
+        while True:
+            current = self.count_rows(driver)
+            now = time.monotonic()
+            if current > count:
+                count, grown_at = current, now
+            elif grown_at is not None and now - grown_at >= SETTLE_SECONDS:
+                return count, grown_at
+            # Keep following a page that is still rendering, for at most one more timeout.
+            if now >= deadline + (timeout if grown_at is not None else 0):
+                return count, grown_at
+            time.sleep(POLL_INTERVAL)
+
+    def scroll_for_next_page(self, driver, previous_count: int, wait_seconds: float) -> int:
+        """Scroll to the bottom, nudge once if nothing loads, and return the row count.
+
+        Waits at most about as long as the fixed sleeps it replaces, but returns
+        as soon as a new page has rendered.
+        """
+        if self.started is None:
+            self.begin(previous_count)
+        scrolled = time.monotonic()
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        count, grown_at = self._wait_for_growth(driver, previous_count, wait_seconds)
+        if grown_at is None:
+            driver.execute_script("window.scrollBy(0, 500);")
+            count, grown_at = self._wait_for_growth(driver, previous_count, wait_seconds + 1)
+        if grown_at is not None:
+            self.pages.append(PageLoad(
+                previous_count, count,
+                round(grown_at - scrolled, 3), round(grown_at - self.started, 3),
+            ))
+            if count >= self._next_sample:
+                self._sample_telemetry(f"{count} rows", count)
+        return count
+
+    def _scaling_curve(self, final_count: int) -> List[dict]:
+        points = []
+        for rows in SCALE_POINTS:
+            if rows > max(self.target_records, final_count):
+                break
+            page = next((page for page in self.pages if page.rows_after >= rows), None)
+            if page is None or page.rows_before >= rows:
+                # Already loaded up front, or never reached.
+                continue
+            points.append({
+                "rows": rows,
+                "seconds_to_reach": page.elapsed,
+                "page_seconds": page.seconds,
+                "seconds_per_100_rows": round(page.seconds_per_100_rows, 3),
+            })
+        return points
+
+    def _degradation(self) -> Optional[float]:
+        """Late pages' median seconds per 100 rows over early pages'; ``None`` with too few pages."""
+        if len(self.pages) < MIN_PAGES_FOR_DEGRADATION:
+            return None
+        quarter = len(self.pages) // 4
+        early = statistics.median(page.seconds_per_100_rows for page in self.pages[:quarter])
+        late = statistics.median(page.seconds_per_100_rows for page in self.pages[-quarter:])
+        return round(late / early, 2) if early > 0 else None
+
+    def summary(self, final_count: int) -> dict:
+        elapsed = time.monotonic() - self.started if self.started is not None else 0.0
+        if self.telemetry is not None:
+            # Time spent sampling is not time spent loading rows.
+            elapsed = max(0.0, elapsed - (self.telemetry.sampling_seconds - self._sampling_offset))
+        loaded = final_count - self.initial_count
+        page_seconds = [page.seconds for page in self.pages]
+        return {
+            "initial_count": self.initial_count,
+            "final_count": final_count,
+            "target_records": self.target_records,
+            "rows_loaded": loaded,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(loaded / elapsed, 1) if elapsed > 0 else 0.0,
+            "pages": len(self.pages),
+            "median_page_seconds": round(statistics.median(page_seconds), 3) if page_seconds else None,
+            "p90_page_seconds": round(_p90(page_seconds), 3) if page_seconds else None,
+            "degradation": self._degradation(),
+            "scaling_curve": self._scaling_curve(final_count),
+            "page_loads": [asdict(page) for page in self.pages],
+            "telemetry": self.telemetry.as_dict() if self.telemetry is not None else None,
+        }
+
+    def breaches(self, summary: dict) -> List[str]:
+        found = []
+        minimum = self.budget.get("min_rows_per_second")
+        if minimum is not None and summary["rows_loaded"] > 0 and summary["rows_per_second"] < minimum:
+            found.append(f"{summary['rows_per_second']} rows/s is below the {minimum} rows/s budget")
+        maximum = self.budget.get("max_page_seconds")
+        if maximum is not None and summary["p90_page_seconds"] is not None and summary["p90_page_seconds"] > maximum:
+            found.append(f"p90 page time {summary['p90_page_seconds']}s is over the {maximum}s budget")
+        max_degradation = self.budget.get("max_degradation")
+        if max_degradation is not None and summary["degradation"] is not None and summary["degradation"] > max_degradation:
+            found.append(
+                f"late pages are {summary['degradation']}x slower than early ones "
+                f"(budget {max_degradation}x)"
+            )
+        if self.telemetry is not None:
+            found.extend(self.telemetry.findings(
+                self.budget.get("max_growth_ratio"), self.budget.get("max_js_heap_mb")
+            ))
+        return found
+
+    def finish(self, final_count: int) -> dict:
+        """Print, attach and export the session's metrics; enforce the budget if configured."""
+        import allure
+
+        if self.telemetry is not None and self.sample_every_rows > 0:
+            last = self.telemetry.samples[-1] if self.telemetry.samples else None
+            if last is None or last.rows != final_count:
+                self._sample_telemetry("final", final_count)
+        summary = self.summary(final_count)
+        breaches = self.breaches(summary) if self.mode != "off" else []
+        summary["budget"] = self.budget
+        summary["budget_breaches"] = breaches
+
+        print(f"  Throughput: {summary['rows_per_second']} rows/s "
+              f"({summary['rows_loaded']} rows in {summary['elapsed_seconds']}s)")
+        print(f"  Pages: {summary['pages']}, median {summary['median_page_seconds']}s, "
+              f"p90 {summary['p90_page_seconds']}s, degradation {summary['degradation']}")
+        for point in summary["scaling_curve"]:
+            print(f"    {point['rows']} rows: page took {point['page_seconds']}s "
+                  f"({point['seconds_per_100_rows']}s/100 rows), reached at {point['seconds_to_reach']}s")
+        telemetry = summary["telemetry"]
+        if telemetry and telemetry["samples"]:
+            final_metrics = telemetry["samples"][-1]["metrics"]
+            heap = final_metrics.get("js_heap_used")
+            heap_text = f"{heap / 1048576:.0f} MB" if heap else "n/a"
+            counts = {key: f"{final_metrics[key]:.0f}" if key in final_metrics else "?" for key in ("nodes", "listeners")}
+            print(f"  Browser ({telemetry['source']}, {len(telemetry['samples'])} samples): heap {heap_text}, "
+                  f"{counts['nodes']} nodes, {counts['listeners']} listeners")
+            for key, ratio in telemetry["growth_ratios"].items():
+                print(f"    {key}: late rows cost {ratio}x early rows")
+        for breach in breaches:
+            print(f"  [BUDGET] {self.url_key}: {breach}")
+
+        allure.attach(
+            json.dumps(summary, indent=2), name="lazy_loading_metrics.json",
+            attachment_type=allure.attachment_type.JSON,
+        )
+        if telemetry and telemetry["samples"]:
+            allure.attach(
+                self.telemetry.to_csv(), name="browser_telemetry.csv",
+                attachment_type=allure.attachment_type.CSV,
+            )
+        record_step(
+            STEP_NAME, summary["elapsed_seconds"],
+            tab=self.url_key, environment=self.environment, **summary,
+        )
+        if breaches and self.mode == "enforce":
+            raise AssertionError(
+                f"Lazy loading budget exceeded for {self.url_key}: " + "; ".join(breaches)
+            )
+        return summary
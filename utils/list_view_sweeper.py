@@ -0,0 +1,100 @@
+"""Run-scoped names for automation list views and a bulk sweeper for leaked ones.
+
+CRUD, pin/unpin and fields-display tests create list views and delete them at
+the end; a failure anywhere in between leaks one. Every view this run creates is
+named ``Automation by Mani <run id> <nnnn>`` so the sweeper can delete exactly
+this run's leftovers, in one logged-in session with one page load per tab,
+without touching views that belong to a concurrent run.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import secrets
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+from selenium.common.exceptions import WebDriverException
+
+AUTOMATION_VIEW_PREFIX = "Automation by Mani"
+RUN_ID_ENV = "AUTOMATION_RUN_ID"
+
+# Suites whose tests create list views and can therefore leak one.
+VIEW_CREATING_MARKERS = ("list_view_crud", "pin_unpin", "fields_display")
+
+
+def run_id() -> str:
+    """Short id shared by the controller and every xdist worker of this run."""
+    value = os.environ.get(RUN_ID_ENV, "").strip()
+    if not value:
+        value = secrets.token_hex(3)
+        # Set before xdist spawns workers so they inherit the same id.
+        os.environ[RUN_ID_ENV] = value
+    return value
+
+
+def run_view_prefix() -> str:
+    return f"{AUTOMATION_VIEW_PREFIX} {run_id()} "
+
+
+def automation_view_name() -> str:
+    """Name for a list view created by this run, e.g. ``Automation by Mani 3fa9c1 4821``."""
+    return f"{run_view_prefix()}{random.randint(1000, 9999)}"
+
+
+@dataclass
+class SweepResult:
+    deleted: Dict[str, List[str]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def deleted_count(self) -> int:
+        return sum(len(names) for names in self.deleted.values())
+
+
+class ListViewSweeper:
+    """Deletes this run's automation list views across tabs in one session."""
+
+    def __init__(self, driver, base_url: str, prefix: str | None = None):
+        from pages.list_view_page import ListViewPage
+
+        self.driver = driver
+        self.base_url = base_url
+        self.prefix = prefix or run_view_prefix()
+        self.page = ListViewPage(driver)
+
+    def _matching_views(self) -> List[str]:
+        self.page.open_view_dropdown()
+        return [name for name in self.page.view_names() if name.startswith(self.prefix)]
+
+    def sweep_tab(self, url_key: str) -> List[str]:
+        """Delete every matching view on ``url_key``; the tab is loaded once."""
+        self.page.open(self.base_url, url_key)
+        deleted: List[str] = []
+        leaked = self._matching_views()
+        while leaked:
+            name = leaked[0]
+            self.page.select_view(name)
+            self.page.delete_current_view()
+            deleted.append(name)
+            print(f"[Sweeper] Deleted leaked list view '{name}' on {url_key}.")
+            remaining = self._matching_views()
+            if name in remaining:
+                raise RuntimeError(f"List view '{name}' still listed after delete")
+            leaked = remaining
+        return deleted
+
+    def sweep(self, url_keys: Iterable[str]) -> SweepResult:
+        result = SweepResult()
+        for url_key in url_keys:
+            try:
+                deleted = self.sweep_tab(url_key)
+            except (WebDriverException, LookupError, RuntimeError) as exc:
+                logging.warning("List view sweep failed on %s: %s", url_key, exc)
+                result.errors[url_key] = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+                continue
+            if deleted:
+                result.deleted[url_key] = deleted
+        return result
@@ -0,0 +1,342 @@
+"""Concurrent-user load mode built on the login and list-view page objects.
+
+``python -m utils.load_mode --users 1,5,10`` runs each concurrency level in
+turn: N headless browsers log in and then repeatedly play scenarios picked from
+a weighted mix until each has run ``--iterations`` of them. Scenarios:
+
+* ``browse_tab``: open a random tab and read its list view header.
+* ``lazy_scroll``: open a tab and lazy-load ``--scroll-pages`` more pages.
+* ``field_modal``: open a tab, open "Select Fields To Display", read the
+  fields and cancel.
+
+Every step is timed; the report gives p50/p90/p95/p99 per step at each
+concurrency level, so latency can be read against concurrency. It is printed,
+written to ``reports/load/load_<run id>.json`` and summarised in the
+step-timing export.
+
+The default target is the local stand-in (:mod:`utils.standin_marketplace`),
+started in-process. Pointing the load at a real environment (``--target
+uat_fa_data_set`` etc.) needs ``--confirm-target`` repeating the environment
+name, and is capped at :data:`REAL_TARGET_MAX_USERS` concurrent users.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config.settings import resolve_runtime_config
+from config.urls import URLs
+from utils.list_view_sweeper import run_id
+from utils.step_timings import record_step
+
+STANDIN_TARGET = "standin"
+STANDIN_CREDENTIALS = ("load.user@example.com", "stand-in")
+DEFAULT_MIX = "browse_tab=5,lazy_scroll=3,field_modal=2"
+DEFAULT_LEVELS = "1,5,10"
+REAL_TARGET_MAX_USERS = 5
+PERCENTILES = (50, 90, 95, 99)
+REPORT_DIR = Path(__file__).resolve().parent.parent / "reports" / "load"
+
+
+class LoadTargetError(ValueError):
+    """The load run would hit a real environment without an explicit confirmation."""
+
+
+@dataclass
+class StepSample:
+    concurrency: int
+    user: int
+    scenario: str
+    step: str
+    seconds: float
+    ok: bool = True
+    error: str = ""
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """``"browse_tab=5,lazy_scroll=3"`` -> weights; unknown scenarios are an error."""
+    mix: Dict[str, int] = {}
+    for part in filter(None, (piece.strip() for piece in text.split(","))):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown load scenario '{name}'. Known: {', '.join(sorted(SCENARIOS))}")
+        try:
+            mix[name] = int(weight or 1)
+        except ValueError as exc:
+            raise ValueError(f"Weight for '{name}' must be a whole number, got '{weight}'.") from exc
+        if mix[name] < 0:
+            raise ValueError(f"Weight for '{name}' must not be negative.")
+    if not any(mix.values()):
+        raise ValueError("The scenario mix needs at least one scenario with a positive weight.")
+    return mix
+
+
+def parse_levels(text: str) -> List[int]:
+    levels = [int(piece) for piece in text.split(",") if piece.strip()]
+    if not levels or min(levels) < 1:
+        raise ValueError(f"Concurrency levels must be positive whole numbers, got '{text}'.")
+    return levels
+
+
+def check_target(target: str, confirm: Optional[str], levels: Sequence[int]) -> None:
+    """Refuse a real environment unless it was named twice and the load stays small."""
+    if target == STANDIN_TARGET:
+        return
+    if confirm != target:
+        raise LoadTargetError(
+            f"Refusing to put load on '{target}'. Re-run with --confirm-target {target} "
+            f"if you really mean to load the real marketplace."
+        )
+    if max(levels) > REAL_TARGET_MAX_USERS:
+        raise LoadTargetError(
+            f"At most {REAL_TARGET_MAX_USERS} concurrent users against a real environment "
+            f"(asked for {max(levels)})."
+        )
+
+
+class LoadUser:
+    """One headless browser playing scenarios against the target."""
+
+    def __init__(self, driver, base_url: str, concurrency: int, user: int,
+                 tabs: Sequence[str], scroll_pages: int, rng: random.Random):
+        from pages.list_view_page import ListViewPage
+
+        self.driver = driver
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.user = user
+        self.tabs = tabs
+        self.scroll_pages = scroll_pages
+        self.rng = rng
+        self.page = ListViewPage(driver)
+        self.samples: List[StepSample] = []
+        self._scenario = ""
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as exc:
+            message = (getattr(exc, "msg", None) or str(exc)).strip().splitlines()
+            self.samples.append(StepSample(
+                self.concurrency, self.user, self._scenario, name,
+                round(time.monotonic() - started, 3), False,
+                message[0] if message else type(exc).__name__,
+            ))
+            raise
+        self.samples.append(StepSample(
+            self.concurrency, self.user, self._scenario, name, round(time.monotonic() - started, 3)
+        ))
+
+    def login(self, username: str, password: str) -> None:
+        from login_page import LoginPage
+
+        self._scenario = "login"
+        with self.step("login"):
+            login_page = LoginPage(self.driver)
+            login_page.navigate_to_login(self.base_url)
+            login_page.login(username, password)
+
+    def _open_random_tab(self) -> str:
+        url_key = self.rng.choice(self.tabs)
+        with self.step("open_tab"):
+            self.page.open(self.base_url, url_key)
+        return url_key
+
+    def browse_tab(self) -> None:
+        self._open_random_tab()
+        with self.step("read_header"):
+            self.page.header_text()
+
+    def lazy_scroll(self) -> None:
+        from utils.lazy_load_metrics import LazyLoadMetrics
+
+        url_key = self._open_random_tab()
+        metrics = LazyLoadMetrics(url_key, "load", 0)
+        count = metrics.count_rows(self.driver)
+        metrics.begin(count)
+        for _ in range(self.scroll_pages):
+            with self.step("lazy_page"):
+                new_count = metrics.scroll_for_next_page(self.driver, count, 2)
+            if new_count <= count:
+                break
+            count = new_count
+
+    def field_modal(self) -> None:
+        from utils.tab_crawler import TabCrawler
+
+        self._open_random_tab()
+        with self.step("field_modal"):
+            TabCrawler(self.driver, self.base_url).read_select_fields()
+
+    def run(self, mix: Dict[str, int], iterations: int) -> None:
+        names = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in names]
+        for _ in range(iterations):
+            self._scenario = self.rng.choices(names, weights)[0]
+            try:
+                getattr(self, self._scenario)()
+            except Exception as exc:
+                logging.warning("User %d: %s failed: %s", self.user, self._scenario, exc)
+
+
+SCENARIOS: Dict[str, Callable[[LoadUser], None]] = {
+    "browse_tab": LoadUser.browse_tab,
+    "lazy_scroll": LoadUser.lazy_scroll,
+    "field_modal": LoadUser.field_modal,
+}
+
+
+def _run_user(browser_name: str, base_url: str, credentials: Tuple[str, str], concurrency: int,
+              user: int, tabs: Sequence[str], mix: Dict[str, int], iterations: int,
+              scroll_pages: int, seed: int, start_gate: threading.Barrier) -> List[StepSample]:
+    from utils.driver_factory import create_driver, quit_driver
+
+    driver = create_driver(browser_name)
+    load_user = LoadUser(driver, base_url, concurrency, user, tabs, scroll_pages,
+                         random.Random(seed * 1000 + user))
+    try:
+        load_user.login(*credentials)
+        # Start the measured scenarios together so the level really runs N users at once.
+        start_gate.wait()
+        load_user.run(mix, iterations)
+    except threading.BrokenBarrierError:
+        pass
+    except Exception as exc:
+        logging.warning("User %d did not start: %s", user, exc)
+        start_gate.abort()
+    finally:
+        quit_driver(driver)
+    return load_user.samples
+
+
+def run_level(browser_name: str, base_url: str, credentials: Tuple[str, str], concurrency: int,
+              tabs: Sequence[str], mix: Dict[str, int], iterations: int, scroll_pages: int,
+              seed: int = 0) -> List[StepSample]:
+    start_gate = threading.Barrier(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"load{concurrency}") as pool:
+        futures = [
+            pool.submit(_run_user, browser_name, base_url, credentials, concurrency, user, tabs,
+                        mix, iterations, scroll_pages, seed, start_gate)
+            for user in range(concurrency)
+        ]
+        return [sample for future in futures for sample in future.result()]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)]
+
+
+def summarize(samples: Sequence[StepSample]) -> List[dict]:
+    """Per ``(concurrency, step)``: count, errors and latency percentiles of the successful runs."""
+    groups: Dict[Tuple[int, str], List[StepSample]] = {}
+    for sample in samples:
+        groups.setdefault((sample.concurrency, sample.step), []).append(sample)
+    rows = []
+    for (concurrency, step), group in sorted(groups.items()):
+        seconds = [sample.seconds for sample in group if sample.ok]
+        row = {"concurrency": concurrency, "step": step, "count": len(group),
+               "errors": sum(1 for sample in group if not sample.ok)}
+        for pct in PERCENTILES:
+            row[f"p{pct}"] = round(_percentile(seconds, pct), 3) if seconds else None
+        rows.append(row)
+    return rows
+
+
+def format_table(rows: Sequence[dict]) -> str:
+    header = f"{'users':>5}  {'step':<12} {'n':>5} {'err':>4} " + " ".join(f"{'p' + str(p):>7}" for p in PERCENTILES)
+    lines = [header]
+    for row in rows:
+        cells = " ".join(
+            f"{row[f'p{p}']:>7.2f}" if row[f"p{p}"] is not None else f"{'-':>7}" for p in PERCENTILES
+        )
+        lines.append(f"{row['concurrency']:>5}  {row['step']:<12} {row['count']:>5} {row['errors']:>4} {cells}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent-user load against the marketplace or the local stand-in")
+    parser.add_argument("--target", default=STANDIN_TARGET,
+                        help=f"'{STANDIN_TARGET}' (default) or an ENV name such as uat_fa_data_set")
+    parser.add_argument("--confirm-target", default=None,
+                        help="Repeat the real ENV name to allow load against it")
+    parser.add_argument("--users", default=DEFAULT_LEVELS, help="Concurrency levels, e.g. 1,5,10")
+    parser.add_argument("--iterations", type=int, default=5, help="Scenarios per user per level")
+    parser.add_argument("--mix", default=os.environ.get("LOAD_SCENARIO_MIX", DEFAULT_MIX))
+    parser.add_argument("--tabs", default="", help="Comma-separated URL keys (default: all tabs)")
+    parser.add_argument("--scroll-pages", type=int, default=5)
+    parser.add_argument("--browser", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--login-strategy", default=None, choices=("ui", "soap", "oauth"),
+                        help="Overrides the portal's login strategy (LOGIN_STRATEGY)")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Stand-in API latency")
+    parser.add_argument("--row-cost-ms", type=float, default=20.0, help="Stand-in latency per 1,000 loaded rows")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    from utils.driver_factory import resolve_browser_name
+    from utils.standin_marketplace import StandinMarketplace
+
+    levels = parse_levels(args.users)
+    mix = parse_mix(args.mix)
+    tabs = [key.strip() for key in args.tabs.split(",") if key.strip()] or list(URLs.ALL_KEYS)
+    check_target(args.target, args.confirm_target, levels)
+    browser_name = resolve_browser_name(args.browser)
+    os.environ["HEADLESS"] = "true"
+    if args.login_strategy:
+        os.environ["LOGIN_STRATEGY"] = args.login_strategy
+
+    standin = None
+    if args.target == STANDIN_TARGET:
+        standin = StandinMarketplace(latency_ms=args.latency_ms, row_cost_ms=args.row_cost_ms)
+        base_url, credentials = standin.start(), STANDIN_CREDENTIALS
+    else:
+        runtime = resolve_runtime_config(args.target)
+        base_url, credentials = runtime["url"], (runtime["username"], runtime["password"])
+    logging.info("Load target %s at %s; levels %s; mix %s", args.target, base_url, levels, mix)
+
+    samples: List[StepSample] = []
+    try:
+        for concurrency in levels:
+            started = time.monotonic()
+            level_samples = run_level(browser_name, base_url, credentials, concurrency, tabs, mix,
+                                      args.iterations, args.scroll_pages, args.seed)
+            samples.extend(level_samples)
+            logging.info("%d user(s): %d steps in %.1fs", concurrency, len(level_samples),
+                         time.monotonic() - started)
+    finally:
+        if standin is not None:
+            standin.stop()
+
+    rows = summarize(samples)
+    print(format_table(rows))
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    report_path = REPORT_DIR / f"load_{run_id()}.json"
+    report_path.write_text(json.dumps({
+        "target": args.target, "base_url": base_url, "levels": levels, "mix": mix,
+        "iterations": args.iterations, "summary": rows,
+        "samples": [asdict(sample) for sample in samples],
+    }, indent=1), encoding="utf-8")
+    for row in rows:
+        record_step(f"load:{row['step']}", row["p50"] or 0.0, test="load_mode", target=args.target, **row)
+    print(f"Load report: {report_path}")
+    return 1 if any(row["errors"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,292 @@
+"""Per-tab page-load measurements for the page performance suite.
+
+:class:`PagePerformanceProbe` installs a small in-page recorder before the tab
+is navigated to (``Page.addScriptToEvaluateOnNewDocument`` on Chrome/Edge; on
+other browsers it is injected right after ``driver.get`` returns). The
+recorder keeps the largest contentful paint and long tasks from
+``PerformanceObserver`` and notes ``performance.now()`` (milliseconds since
+navigation start) when the grid header row and the list view header first
+become visible. :meth:`PagePerformanceProbe.collect` adds Navigation Timing
+and first contentful paint.
+
+Results are checked against ``budgets.page_performance`` in ``config.json``:
+a ``default`` entry overlaid by the portal's, the tab's and then
+``"<portal>/<tab>"``. Each result is appended to the step-timing export and to
+``HISTORY_DIR/page_performance.json``, which keeps the last runs per
+``(env, tab)`` so every result comes with its trend against the previous ones.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import statistics
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from config.settings import budget_for
+from utils.history import file_lock, history_dir, write_json_atomic
+from utils.list_view_sweeper import run_id
+from utils.step_timings import record_step
+
+STEP_NAME = "page_performance"
+HISTORY_FILE_NAME = "page_performance.json"
+HISTORY_RUNS = 30
+# Previous runs a result is compared against.
+TREND_WINDOW = 10
+
+GRID_READY_XPATH = "//tr[@class='slds-line-height_reset']"
+HEADER_XPATH = "//div[@class='dropdownStyling']"
+
+# Metric -> budget key; all in milliseconds.
+BUDGETED_METRICS = {
+    "grid_ready_ms": "max_grid_ready_ms",
+    "header_ms": "max_header_ms",
+    "lcp_ms": "max_lcp_ms",
+    "total_blocking_ms": "max_total_blocking_ms",
+    "load_event_ms": "max_load_event_ms",
+}
+TREND_METRICS = ("grid_ready_ms", "header_ms", "lcp_ms", "total_blocking_ms", "load_event_ms")
+
+_RECORDER_SCRIPT = """
+(() => {
+    if (window.__pagePerformance) {
+        return;
+    }
+    const perf = window.__pagePerformance = {marks: {}, lcp: null, longTasks: []};
+    const watched = %s;
+    const observe = (type, handle) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(handle))
+                .observe({type: type, buffered: true});
+        } catch (e) {
+            perf[type + 'Unsupported'] = true;
+        }
+    };
+    observe('largest-contentful-paint', (entry) => {
+        perf.lcp = entry.renderTime || entry.loadTime || entry.startTime;
+    });
+    observe('longtask', (entry) => perf.longTasks.push([entry.startTime, entry.duration]));
+    const visible = (xpath) => {
+        const node = document.evaluate(xpath, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        return !!node && node.getClientRects().length > 0;
+    };
+    const check = () => {
+        Object.entries(watched).forEach(([name, xpath]) => {
+            if (!(name in perf.marks) && visible(xpath)) {
+                perf.marks[name] = performance.now();
+            }
+        });
+        return Object.keys(perf.marks).length === Object.keys(watched).length;
+    };
+    if (!check()) {
+        const observer = new MutationObserver(() => {
+            if (check()) {
+                observer.disconnect();
+            }
+        });
+        observer.observe(document, {
+            subtree: true, childList: true, attributes: true,
+            attributeFilter: ['class', 'style', 'hidden'],
+        });
+    }
+})();
+""" % json.dumps({"grid_ready": GRID_READY_XPATH, "header": HEADER_XPATH})
+
+_READY_SCRIPT = """
+const perf = window.__pagePerformance;
+return !!perf && 'grid_ready' in perf.marks && 'header' in perf.marks;
+"""
+
+_COLLECT_SCRIPT = """
+const perf = window.__pagePerformance || {marks: {}, lcp: null, longTasks: []};
+const nav = performance.getEntriesByType('navigation')[0];
+const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+return {
+    marks: perf.marks,
+    lcp: perf.lcp,
+    lcp_supported: !perf['largest-contentful-paintUnsupported'],
+    long_tasks: perf.longTasks,
+    long_tasks_supported: !perf.longtaskUnsupported,
+    fcp: fcp ? fcp.startTime : null,
+    navigation: nav ? nav.toJSON() : null,
+};
+"""
+
+
+def _ms(value) -> Optional[float]:
+    return round(float(value), 1) if value is not None else None
+
+
+def page_metrics(raw: dict) -> Dict[str, Optional[float]]:
+    """Flatten what the recorder collected into the suite's metrics (milliseconds)."""
+    navigation = raw.get("navigation") or {}
+    marks = raw.get("marks") or {}
+    grid_ready = marks.get("grid_ready")
+    long_tasks = raw.get("long_tasks") or []
+    # Long tasks until the grid was usable; the main-thread blocking a user would feel.
+    before_ready = [
+        duration for start, duration in long_tasks if grid_ready is None or start < grid_ready
+    ]
+    supported = raw.get("long_tasks_supported", True)
+    return {
+        "ttfb_ms": _ms(navigation.get("responseStart")),
+        "dom_content_loaded_ms": _ms(navigation.get("domContentLoadedEventEnd")),
+        "load_event_ms": _ms(navigation.get("loadEventEnd")),
+        "transfer_kb": _ms((navigation.get("transferSize") or 0) / 1024) if navigation else None,
+        "fcp_ms": _ms(raw.get("fcp")),
+        "lcp_ms": _ms(raw.get("lcp")),
+        "header_ms": _ms(marks.get("header")),
+        "grid_ready_ms": _ms(grid_ready),
+        "long_tasks": len(before_ready) if supported else None,
+        "long_task_ms": _ms(sum(before_ready)) if supported else None,
+        "total_blocking_ms": _ms(sum(max(0.0, d - 50.0) for d in before_ready)) if supported else None,
+    }
+
+
+def budget_breaches(metrics: Dict[str, Optional[float]], budget: Dict[str, float]) -> List[str]:
+    found = []
+    for metric, budget_key in BUDGETED_METRICS.items():
+        limit, value = budget.get(budget_key), metrics.get(metric)
+        if limit is not None and value is not None and value > limit:
+            found.append(f"{metric} {value:.0f}ms is over the {limit:.0f}ms budget")
+    return found
+
+
+class PagePerformanceProbe:
+    """Records one tab load's timings in the browser it is given."""
+
+    def __init__(self, driver, environment: str, portal: str,
+                 history: Optional["PerformanceHistory"] = None):
+        self.driver = driver
+        self.environment = environment
+        self.portal = portal
+        self.history = history or PerformanceHistory()
+        self.source: Optional[str] = None
+        self._script_id: Optional[str] = None
+
+    def install(self) -> None:
+        """Register the recorder for every document this browser loads next."""
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": _RECORDER_SCRIPT}
+            )
+        except (AttributeError, WebDriverException):
+            self.source = "script"
+            return
+        self._script_id = result.get("identifier")
+        self.source = "cdp"
+
+    def uninstall(self) -> None:
+        # Brokered browsers outlive the test; don't leave the recorder behind.
+        if self._script_id is None:
+            return
+        try:
+            self.driver.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument", {"identifier": self._script_id}
+            )
+        except WebDriverException as exc:
+            logging.debug("Could not remove the page performance recorder: %s", exc)
+        self._script_id = None
+
+    def navigate(self, url: str) -> None:
+        if self.source is None:
+            self.install()
+        self.driver.get(url)
+        if self.source == "script":
+            # Too late for anything that happened during the load; marks are upper bounds.
+            self.driver.execute_script(_RECORDER_SCRIPT)
+
+    def wait_until_ready(self, timeout: float = 60) -> None:
+        """Wait until the grid header row and the list view header have both been seen."""
+        from utils.timeouts import adaptive_wait
+
+        adaptive_wait(self.driver, "page_performance_ready", timeout, poll_frequency=0.2).until(
+            lambda driver: driver.execute_script(_READY_SCRIPT),
+            f"page_performance_ready: grid ({GRID_READY_XPATH}) or header ({HEADER_XPATH}) never became visible",
+        )
+
+    def collect(self) -> dict:
+        """Raw recorder output plus Navigation Timing for the current document."""
+        raw = self.driver.execute_script(_COLLECT_SCRIPT)
+        raw["source"] = self.source
+        return raw
+
+    def record(self, url_key: str, raw: dict) -> dict:
+        """Metrics, budget, breaches and trend for ``url_key``; exported and kept in history."""
+        metrics = page_metrics(raw)
+        budget = budget_for(STEP_NAME, self.portal, url_key, f"{self.portal}/{url_key}")
+        result = {
+            "tab": url_key,
+            "environment": self.environment,
+            "portal": self.portal,
+            "source": self.source,
+            "metrics": metrics,
+            "budget": budget,
+            "budget_breaches": budget_breaches(metrics, budget),
+            "trend": trend(metrics, self.history.previous(self.environment, url_key)),
+            "navigation": raw.get("navigation"),
+        }
+        record_step(STEP_NAME, (metrics["grid_ready_ms"] or 0) / 1000.0, **result)
+        try:
+            self.history.append(self.environment, url_key, metrics, run_id())
+        except OSError as exc:
+            logging.warning("Page performance history for %s not saved: %s", url_key, exc)
+        return result
+
+
+class PerformanceHistory:
+    """Last :data:`HISTORY_RUNS` results per ``(env, tab)``, for trend output."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or history_dir() / HISTORY_FILE_NAME
+
+    def _load(self) -> Dict[str, List[dict]]:
+        try:
+            with self.path.open(encoding="utf-8") as history_file:
+                return json.load(history_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logging.warning("Ignoring unreadable page performance history %s: %s", self.path, exc)
+            return {}
+
+    def previous(self, environment: str, url_key: str) -> List[dict]:
+        return self._load().get(f"{environment}|{url_key}", [])
+
+    def append(self, environment: str, url_key: str, metrics: dict, run_id: str) -> None:
+        key = f"{environment}|{url_key}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path):
+            data = self._load()
+            runs = data.get(key, []) + [{
+                "run_id": run_id,
+                "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "metrics": metrics,
+            }]
+            data[key] = runs[-HISTORY_RUNS:]
+            write_json_atomic(self.path, data)
+
+
+def trend(metrics: dict, previous_runs: List[dict]) -> Dict[str, dict]:
+    """Per metric: median of the previous runs and this run's change against it."""
+    result = {}
+    for metric in TREND_METRICS:
+        history = [
+            run["metrics"][metric] for run in previous_runs[-TREND_WINDOW:]
+            if run.get("metrics", {}).get(metric) is not None
+        ]
+        value = metrics.get(metric)
+        if not history or value is None:
+            continue
+        baseline = statistics.median(history)
+        result[metric] = {
+            "baseline_ms": round(baseline, 1),
+            "runs": len(history),
+            "change_pct": round((value - baseline) * 100.0 / baseline, 1) if baseline else None,
+        }
+    return result
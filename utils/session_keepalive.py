@@ -0,0 +1,268 @@
+"""Keep pooled browser sessions logged in.
+
+Broker sessions and pre-spawned browsers outlive a single test, so a Salesforce
+session can time out or expire while a browser sits idle or half-way through a
+test. :class:`SessionKeeper` handles one environment's sessions:
+
+* :meth:`SessionKeeper.keep_alive` pings an idle session every
+  ``KEEPALIVE_INTERVAL`` seconds with a same-origin ``fetch`` of the site
+  (activity that extends the session) and re-authenticates if it expired.
+* :func:`attach_keeper` wraps a pooled driver's ``get`` so a navigation that
+  lands on the login form re-authenticates and retries the navigation, without
+  the test noticing.
+* :meth:`SessionKeeper.reauthenticate` tries the cookie cache first (the last
+  good session cookies for the user, kept in ``HISTORY_DIR/session_cookies.json``
+  and readable only by the owner) and falls back to :class:`login_page.LoginPage`.
+
+Each re-login is counted on the keeper and written to the step-timing export as
+``session_relogin`` with its method and trigger, for the terminal summary.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.history import file_lock, history_dir, write_json_atomic
+from utils.step_timings import record_step
+
+KEEPALIVE_INTERVAL_ENV = "KEEPALIVE_INTERVAL"
+DEFAULT_KEEPALIVE_INTERVAL_SECONDS = 600.0
+COOKIE_CACHE_ENV = "SESSION_COOKIE_CACHE"
+COOKIE_CACHE_FILE_NAME = "session_cookies.json"
+STEP_NAME = "session_relogin"
+# By.CSS_SELECTOR, spelled out to keep selenium.webdriver out of conftest's imports.
+MARKETPLACE_LINK = ("css selector", "a[title='Dakota Marketplace']")
+
+_ON_LOGIN_PAGE_SCRIPT = """
+return !!document.getElementById('loginPage:loginForm:login-email')
+    || /\\/(secur\\/)?login(\\.jsp)?\\/?$/i.test(location.pathname);
+"""
+
+# Fetch the site home with the browser's cookies; an expired session ends on the login form.
+_PING_SCRIPT = """
+const done = arguments[arguments.length - 1];
+fetch(arguments[0], {credentials: 'include', cache: 'no-store'})
+    .then((response) => response.text().then((body) => done({
+        status: response.status,
+        url: response.url,
+        login_form: body.indexOf('loginPage:loginForm') !== -1,
+    })))
+    .catch((error) => done({error: String(error)}));
+"""
+
+
+def keepalive_interval() -> float:
+    """Seconds between pings of an idle pooled session; 0 turns keepalive off."""
+    raw = os.environ.get(KEEPALIVE_INTERVAL_ENV, str(DEFAULT_KEEPALIVE_INTERVAL_SECONDS)).strip()
+    try:
+        interval = float(raw)
+    except ValueError as exc:
+        raise ValueError(f"{KEEPALIVE_INTERVAL_ENV} must be a number of seconds, got '{raw}'.") from exc
+    if interval < 0:
+        raise ValueError(f"{KEEPALIVE_INTERVAL_ENV} must not be negative, got {interval}.")
+    return interval
+
+
+def cookie_cache_enabled() -> bool:
+    return os.environ.get(COOKIE_CACHE_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+class SessionExpiredError(RuntimeError):
+    """Neither the cookie cache nor the login form produced a working session."""
+
+
+class CookieCache:
+    """Last good session cookies per ``(env, user)``, shared by the broker and workers."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or history_dir() / COOKIE_CACHE_FILE_NAME
+
+    def _load(self) -> Dict[str, List[dict]]:
+        try:
+            with self.path.open(encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logging.warning("Ignoring unreadable session cookie cache %s: %s", self.path, exc)
+            return {}
+
+    def get(self, key: str) -> List[dict]:
+        return self._load().get(key, [])
+
+    def put(self, key: str, cookies: List[dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path):
+            data = self._load()
+            data[key] = cookies
+            write_json_atomic(self.path, data)
+            os.chmod(self.path, 0o600)
+
+
+class SessionKeeper:
+    """Pings and re-authenticates sessions of one environment's user."""
+
+    def __init__(self, environment: str, base_url: str, username: str, password: str,
+                 cookie_cache: Optional[CookieCache] = None):
+        self.environment = environment
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.cookie_cache = cookie_cache if cookie_cache is not None else (
+            CookieCache() if cookie_cache_enabled() else None
+        )
+        self.stats = {"pings": 0, "expired": 0, "cookie_relogins": 0,
+                      "form_relogins": 0, "relogin_failures": 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_environment(cls, environment: str) -> "SessionKeeper":
+        from config.settings import resolve_runtime_config
+
+        runtime = resolve_runtime_config(environment)
+        return cls(environment, runtime["url"], runtime["username"], runtime["password"])
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.environment}|{self.username}"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def remember(self, driver) -> None:
+        """Store ``driver``'s cookies as the user's last good session."""
+        if self.cookie_cache is None:
+            return
+        try:
+            self.cookie_cache.put(self.cache_key, driver.get_cookies())
+        except (OSError, WebDriverException) as exc:
+            logging.warning("Session cookies for %s not cached: %s", self.environment, exc)
+
+    @staticmethod
+    def on_login_page(driver) -> bool:
+        try:
+            return bool(driver.execute_script(_ON_LOGIN_PAGE_SCRIPT))
+        except WebDriverException:
+            return False
+
+    def _logged_in(self, driver) -> bool:
+        from pages.base_page import BasePage
+
+        try:
+            BasePage(driver).wait_for("session_check", 15).until(
+                lambda d: d.find_elements(*MARKETPLACE_LINK) or self.on_login_page(d)
+            )
+        except WebDriverException:
+            return False
+        return not self.on_login_page(driver)
+
+    def _open(self, driver, url: str) -> None:
+        getattr(driver, "_unguarded_get", driver.get)(url)
+
+    def _try_cookie_cache(self, driver) -> bool:
+        cookies = self.cookie_cache.get(self.cache_key) if self.cookie_cache is not None else []
+        if not cookies:
+            return False
+        try:
+            # Cookies can only be set for the page's own domain.
+            origin = "{0.scheme}://{0.netloc}".format(urlsplit(self.base_url))
+            if not driver.current_url.startswith(origin):
+                self._open(driver, self.base_url)
+            driver.delete_all_cookies()
+            for cookie in cookies:
+                driver.add_cookie({key: value for key, value in cookie.items() if key != "sameSite"})
+            self._open(driver, self.base_url)
+        except WebDriverException as exc:
+            logging.info("Cached session cookies not applied: %s", exc)
+            return False
+        return self._logged_in(driver)
+
+    def _login_with_form(self, driver) -> None:
+        from login_page import LoginPage
+
+        # The driver is marked as logged in for pooled sessions; LoginPage would skip the form.
+        logged_in_user = getattr(driver, "logged_in_user", None)
+        driver.logged_in_user = None
+        try:
+            login_page = LoginPage(driver)
+            login_page.navigate_to_login(self.base_url)
+            login_page.login(self.username, self.password)
+        finally:
+            driver.logged_in_user = logged_in_user
+
+    def reauthenticate(self, driver, trigger: str) -> str:
+        """Log ``driver`` back in, cookie cache first; returns the method that worked."""
+        started = time.monotonic()
+        # Navigations made while logging in must not re-enter this method.
+        driver._reauthenticating = True
+        try:
+            if self._try_cookie_cache(driver):
+                method = "cookie_cache"
+                self._count("cookie_relogins")
+            else:
+                try:
+                    self._login_with_form(driver)
+                except Exception as exc:
+                    self._count("relogin_failures")
+                    record_step(STEP_NAME, round(time.monotonic() - started, 2),
+                                environment=self.environment, method="failed", trigger=trigger)
+                    if not getattr(exc, "retryable", True):
+                        raise
+                    raise SessionExpiredError(f"Re-login for {self.environment} failed: {exc}") from exc
+                method = "login_form"
+                self._count("form_relogins")
+                self.remember(driver)
+        finally:
+            driver._reauthenticating = False
+        seconds = round(time.monotonic() - started, 2)
+        logging.info("Session for %s re-authenticated via %s in %.2fs (%s)",
+                     self.environment, method, seconds, trigger)
+        record_step(STEP_NAME, seconds, environment=self.environment, method=method, trigger=trigger)
+        return method
+
+    def keep_alive(self, driver) -> bool:
+        """Ping an idle session; re-authenticate when it expired. Returns whether it had expired."""
+        self._count("pings")
+        try:
+            result = driver.execute_async_script(_PING_SCRIPT, self.base_url) or {}
+        except WebDriverException as exc:
+            result = {"error": str(exc)}
+        if "error" in result:
+            # The page itself may be gone (crash, about:blank); check by navigating.
+            self._open(driver, self.base_url)
+            expired = self.on_login_page(driver)
+        else:
+            expired = bool(result.get("login_form")) or "login" in str(result.get("url", "")).lower()
+        if expired:
+            self._count("expired")
+            self.reauthenticate(driver, "keepalive")
+        return expired
+
+    def guarded_get(self, driver, url: str) -> None:
+        """Navigate; when that lands on the login form, log back in and navigate again."""
+        driver._unguarded_get(url)
+        if getattr(driver, "_reauthenticating", False) or not self.on_login_page(driver):
+            return
+        self._count("expired")
+        self.reauthenticate(driver, "navigation")
+        driver._unguarded_get(url)
+
+
+def attach_keeper(driver, keeper: SessionKeeper):
+    """Make ``driver.get`` re-authenticate transparently through ``keeper``; returns ``driver``."""
+    if getattr(driver, "session_keeper", None) is not None:
+        return driver
+    driver.session_keeper = keeper
+    driver._unguarded_get = driver.get
+    driver.get = lambda url: keeper.guarded_get(driver, url)
+    return driver
@@ -0,0 +1,187 @@
+"""Session-start baseline: no pinned list view on any tab, default views recorded.
+
+Pin state belongs to the portal user, not to a test, yet every suite used to
+probe for (and undo) a pinned view before its first step. With
+``SESSION_NORMALIZE=1`` the controller does that once, before any test runs: one
+logged-in browser opens the tabs ``SESSION_NORMALIZE_TABS`` at a time (default
+4) in background windows, so the page loads overlap. Then, window by window, it
+unpins whatever is pinned and records the view the tab opens on.
+
+The result is kept per ``(env, user)`` in ``HISTORY_DIR/tab_baseline.json``;
+:func:`default_view` tells a test which view its tab starts on. The keys of the
+tabs that reached the baseline are exported in ``SESSION_NORMALIZED_TABS``
+(xdist workers inherit it). Suites that never pin call
+:meth:`pages.list_view_page.ListViewPage.ensure_unpinned` with
+``trust_baseline=True``, which skips the probe on those tabs. When the
+pin/unpin suite is part of the run the export is withdrawn, since it pins
+views while the other suites run.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from utils.history import file_lock, history_dir, write_json_atomic
+from utils.list_view_sweeper import run_id
+
+NORMALIZE_ENV = "SESSION_NORMALIZE"
+PARALLEL_TABS_ENV = "SESSION_NORMALIZE_TABS"
+DEFAULT_PARALLEL_TABS = 4
+NORMALIZED_TABS_ENV = "SESSION_NORMALIZED_TABS"
+BASELINE_FILE_NAME = "tab_baseline.json"
+
+
+def normalize_enabled() -> bool:
+    return os.environ.get(NORMALIZE_ENV, "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def parallel_tabs() -> int:
+    raw = os.environ.get(PARALLEL_TABS_ENV, str(DEFAULT_PARALLEL_TABS)).strip()
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise ValueError(f"{PARALLEL_TABS_ENV} must be a whole number, got '{raw}'.") from exc
+    if value < 1:
+        raise ValueError(f"{PARALLEL_TABS_ENV} must be at least 1.")
+    return value
+
+
+def normalized_tabs() -> List[str]:
+    """Tabs this run's normalization pass left with no pinned view."""
+    raw = os.environ.get(NORMALIZED_TABS_ENV, "")
+    return [key for key in raw.split(",") if key]
+
+
+def baseline_path() -> Path:
+    return history_dir() / BASELINE_FILE_NAME
+
+
+def _load_baselines(path: Path) -> Dict[str, Dict[str, dict]]:
+    try:
+        with path.open(encoding="utf-8") as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logging.warning("Ignoring unreadable tab baseline %s: %s", path, exc)
+        return {}
+
+
+def default_view(environment: str, username: str, url_key: str) -> Optional[str]:
+    """View ``url_key`` opened on at the last normalization for ``(environment, username)``."""
+    entry = _load_baselines(baseline_path()).get(f"{environment}|{username}", {}).get(url_key, {})
+    return entry.get("default_view") or None
+
+
+@dataclass
+class TabBaseline:
+    url_key: str
+    default_view: str = ""
+    was_pinned: bool = False
+    error: str = ""
+
+
+class SessionNormalizer:
+    """Unpins and records the default view of many tabs in one logged-in session."""
+
+    def __init__(self, driver, base_url: str, parallel: Optional[int] = None):
+        self.driver = driver
+        self.base_url = base_url
+        self.parallel = parallel or parallel_tabs()
+
+    def _open_in_background(self, url_key: str) -> str:
+        """Start loading ``url_key`` in a new window; returns its handle without waiting."""
+        from config.urls import get_url
+
+        before = set(self.driver.window_handles)
+        self.driver.execute_script("window.open(arguments[0], '_blank');", get_url(self.base_url, url_key))
+        opened = [handle for handle in self.driver.window_handles if handle not in before]
+        if not opened:
+            raise WebDriverException(f"No window opened for {url_key} (pop-up blocked?)")
+        return opened[0]
+
+    def _normalize_window(self, url_key: str) -> TabBaseline:
+        from pages.list_view_page import ListViewPage
+
+        page = ListViewPage(self.driver)
+        page.wait_until_ready(url_key)
+        was_pinned = page.ensure_unpinned(url_key)
+        return TabBaseline(url_key, default_view=page.header_base(), was_pinned=was_pinned)
+
+    def normalize(self, url_keys: Iterable[str]) -> List[TabBaseline]:
+        home = self.driver.current_window_handle
+        keys = list(url_keys)
+        results: List[TabBaseline] = []
+        for start in range(0, len(keys), self.parallel):
+            windows = []
+            for url_key in keys[start:start + self.parallel]:
+                try:
+                    windows.append((url_key, self._open_in_background(url_key)))
+                except WebDriverException as exc:
+                    results.append(TabBaseline(url_key, error=str(exc).splitlines()[0]))
+            for url_key, handle in windows:
+                try:
+                    self.driver.switch_to.window(handle)
+                    results.append(self._normalize_window(url_key))
+                except (WebDriverException, LookupError) as exc:
+                    logging.warning("Session normalization failed on %s: %s", url_key, exc)
+                    error = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+                    results.append(TabBaseline(url_key, error=error))
+                finally:
+                    try:
+                        self.driver.close()
+                    except WebDriverException:
+                        pass
+            self.driver.switch_to.window(home)
+        return results
+
+
+def save_baseline(environment: str, username: str, results: List[TabBaseline],
+                  path: Optional[Path] = None) -> None:
+    path = path or baseline_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    recorded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with file_lock(path):
+        data = _load_baselines(path)
+        tabs = data.setdefault(f"{environment}|{username}", {})
+        for result in results:
+            if result.error:
+                continue
+            entry = asdict(result)
+            entry.pop("error")
+            entry.update(run_id=run_id(), recorded_at=recorded_at)
+            tabs[result.url_key] = entry
+        write_json_atomic(path, data)
+
+
+def publish_normalized(results: List[TabBaseline]) -> None:
+    """Export the tabs that reached the baseline to this process and the workers it starts."""
+    os.environ[NORMALIZED_TABS_ENV] = ",".join(result.url_key for result in results if not result.error)
+
+
+def withdraw_normalized() -> None:
+    """Stop trusting the baseline in this process: something in the run pins views."""
+    os.environ.pop(NORMALIZED_TABS_ENV, None)
+
+
+def summary_lines(results: List[TabBaseline], seconds: float) -> List[str]:
+    unpinned = [result.url_key for result in results if result.was_pinned]
+    failed = [result for result in results if result.error]
+    lines = [
+        f"Session normalization (run {run_id()}): {len(results) - len(failed)}/{len(results)} tab(s) "
+        f"at baseline in {seconds:.1f}s, {len(unpinned)} unpinned."
+    ]
+    if unpinned:
+        lines.append(f"  unpinned: {', '.join(unpinned)}")
+    for result in failed:
+        lines.append(f"  {result.url_key}: not normalized ({result.error})")
+    return lines
+
@@ -0,0 +1,405 @@
+"""Local stand-in for the marketplace, for load runs and offline smoke checks.
+
+It serves just enough of the real site for the repo's page objects to work
+unchanged: the Experience Cloud login form (same element ids), a home page with
+the ``Dakota Marketplace`` link, and every tab in ``config.json`` with the list
+view header, the SLDS grid (100 rows, then 100 more per scroll), the "Select a
+List View" dropdown and the "Select Fields To Display" modal. It also emulates
+the API login strategies of :mod:`utils.api_login`: SOAP ``login()``, the OAuth
+username-password token endpoint and ``secur/frontdoor.jsp``. Form logins as
+``verify.*``, ``expired.*`` or ``locked.*`` users, or with the password
+``wrong``, end on the matching failure screen: verification and expired
+passwords redirect to their own pages, the others are errors on the form.
+
+Latency is configurable so load runs can see how the client side behaves when
+the server slows down: every API call sleeps ``latency_ms``, plus
+``row_cost_ms`` per 1,000 rows already loaded, to mimic a grid that gets slower
+as the page grows. Each tab has 2,437 rows by default, a non-round number, so
+the lazy-loading suite's round-number rule passes against it.
+
+``python -m utils.standin_marketplace --port 8765`` serves it on its own; its
+base URL is ``http://127.0.0.1:8765/dakotaMarketplace/s/``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import logging
+import secrets
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from config.settings import load_config
+
+SITE_ROOT = "/dakotaMarketplace"
+SITE_PREFIX = SITE_ROOT + "/s/"
+SESSION_COOKIE = "sid"
+DEFAULT_TOTAL_ROWS = 2437
+PAGE_SIZE = 100
+FIELD_COUNT = 40
+
+_LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Login | Dakota Marketplace (stand-in)</title></head>
+<body>
+<form id="loginPage:loginForm" method="post" action="{prefix}login">
+  <input id="loginPage:loginForm:login-email" name="username" type="email" autocomplete="username">
+  <input id="loginPage:loginForm:login-password" name="password" type="password" autocomplete="current-password">
+  <button id="loginPage:loginForm:login-submit" type="submit">Log In</button>
+</form>
+{error}
+</body></html>
+"""
+
+_HOME_PAGE = """<!DOCTYPE html>
+<html><head><title>Dakota Marketplace (stand-in)</title></head>
+<body><a title="Dakota Marketplace" href="{prefix}">Dakota Marketplace</a></body></html>
+"""
+
+_TAB_PAGE = """<!DOCTYPE html>
+<html><head><title>{title} | Dakota Marketplace (stand-in)</title>
+<style>tbody tr {{ height: 32px; }} #modal[hidden], #views[hidden] {{ display: none; }}</style>
+</head>
+<body>
+<a title="Dakota Marketplace" href="{prefix}">Dakota Marketplace</a>
+<div role="main">
+  <div class="dropdownStyling">{view} ({total:,})</div>
+  <button title="Select a List View" onclick="document.getElementById('views').hidden = false">&#9662;</button>
+  <ul id="views" hidden><li><a href="#">{view}</a></li><li><a href="#">Recently Viewed</a></li></ul>
+  <button class="slds-button" onclick="openFields()">Select Fields To Display</button>
+  <table>
+    <thead><tr class="slds-line-height_reset"><th>Name</th><th>Type</th><th>City</th></tr></thead>
+    <tbody id="rows"></tbody>
+  </table>
+</div>
+<div id="modal" hidden>
+  <ul id="fields"></ul>
+  <button class="slds-button slds-button_neutral" onclick="closeFields()">Cancel</button>
+</div>
+<script>
+const tab = {tab_json};
+const total = {total};
+let loaded = 0;
+let loading = false;
+function loadMore() {{
+    if (loading || loaded >= total) {{ return; }}
+    loading = true;
+    fetch('{prefix}api/rows?tab=' + tab + '&offset=' + loaded)
+        .then((response) => response.json())
+        .then((rows) => {{
+            const body = document.getElementById('rows');
+            rows.forEach((row) => {{
+                const tr = document.createElement('tr');
+                row.forEach((cell) => {{
+                    const td = document.createElement('td');
+                    td.textContent = cell;
+                    tr.appendChild(td);
+                }});
+                body.appendChild(tr);
+            }});
+            loaded += rows.length;
+            loading = false;
+        }});
+}}
+window.addEventListener('scroll', () => {{
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) {{ loadMore(); }}
+}});
+function openFields() {{
+    fetch('{prefix}api/fields?tab=' + tab)
+        .then((response) => response.json())
+        .then((fields) => {{
+            const list = document.getElementById('fields');
+            list.innerHTML = '';
+            fields.forEach((name) => {{
+                const li = document.createElement('li');
+                li.setAttribute('role', 'presentation');
+                li.textContent = name;
+                list.appendChild(li);
+            }});
+            document.getElementById('modal').hidden = false;
+        }});
+}}
+function closeFields() {{
+    document.getElementById('modal').hidden = true;
+    document.getElementById('fields').innerHTML = '';
+}}
+loadMore();
+</script>
+</body></html>
+"""
+
+
+_SOAP_LOGIN_RESPONSE = """<?xml version="1.0" encoding="UTF-8"?>
+<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/" xmlns="urn:partner.soap.sforce.com">
+<soapenv:Body><loginResponse><result>
+<serverUrl>{server_url}</serverUrl><sessionId>{session}</sessionId><userName>{username}</userName>
+</result></loginResponse></soapenv:Body></soapenv:Envelope>
+"""
+
+_SOAP_FAULT = """<?xml version="1.0" encoding="UTF-8"?>
+<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/">
+<soapenv:Body><soapenv:Fault><faultcode>INVALID_LOGIN</faultcode>
+<faultstring>INVALID_LOGIN: Invalid username, password, security token; or user locked out.</faultstring>
+</soapenv:Fault></soapenv:Body></soapenv:Envelope>
+"""
+
+
+# Username prefixes that make a form login redirect to a Salesforce failure page, as the real site does.
+VERIFY_PATH = SITE_ROOT + "/_ui/identity/verification/method/EmailVerificationFinishUi/e"
+CHANGE_PASSWORD_PATH = SITE_ROOT + "/_ui/system/security/ChangePassword"
+_REJECTION_REDIRECTS = {
+    "verify.": VERIFY_PATH,
+    "expired.": CHANGE_PASSWORD_PATH,
+}
+_REJECTION_SCREENS = {
+    VERIFY_PATH: "<h1>Verify Your Identity</h1><p>We sent a verification code to your email.</p>",
+    CHANGE_PASSWORD_PATH: "<h1>Change Your Password</h1><p>Your password has expired.</p>",
+}
+# Failures Salesforce shows as an error on the login form itself.
+LOCKED_PREFIX = "locked."
+WRONG_PASSWORD = "wrong"
+
+
+def _title(url_key: str) -> str:
+    return url_key.replace("_default", "").replace("_tab", "").replace("_", " ").title()
+
+
+class StandinMarketplace:
+    """Threaded HTTP server standing in for the marketplace on ``127.0.0.1``."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, latency_ms: float = 150.0,
+                 row_cost_ms: float = 20.0, total_rows: int = DEFAULT_TOTAL_ROWS):
+        self.latency_ms = latency_ms
+        self.row_cost_ms = row_cost_ms
+        self.total_rows = total_rows
+        # URL path (as in config.json) -> URL key.
+        self.tabs: Dict[str, str] = {
+            path.strip("/"): url_key for url_key, path in load_config().get("urls", {}).items()
+        }
+        self.sessions: set[str] = set()
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{SITE_PREFIX}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="standin", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandinMarketplace":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def expire_sessions(self) -> None:
+        """Log every browser out, as a Salesforce session timeout would."""
+        with self._lock:
+            self.sessions.clear()
+
+    def delay(self, rows_loaded: int = 0) -> None:
+        time.sleep((self.latency_ms + self.row_cost_ms * rows_loaded / 1000.0) / 1000.0)
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                logging.debug("stand-in: " + fmt, *args)
+
+            def _session(self) -> Optional[str]:
+                for part in self.headers.get("Cookie", "").split(";"):
+                    name, _, value = part.strip().partition("=")
+                    if name == SESSION_COOKIE and value in standin.sessions:
+                        return value
+                return None
+
+            def _send(self, status: int, body: str, content_type: str = "text/html",
+                      headers: Optional[Dict[str, str]] = None) -> None:
+                with standin._lock:
+                    standin.requests_served += 1
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _redirect(self, location: str, headers: Optional[Dict[str, str]] = None) -> None:
+                self._send(303, "", headers=dict(headers or {}, Location=location))
+
+            def _new_session(self) -> str:
+                session = secrets.token_hex(16)
+                with standin._lock:
+                    standin.sessions.add(session)
+                return session
+
+            def _soap_login(self, body: str) -> None:
+                try:
+                    root = ET.fromstring(body)
+                except ET.ParseError:
+                    self._send(500, _SOAP_FAULT, "text/xml")
+                    return
+                values = {element.tag.split("}")[-1]: (element.text or "").strip() for element in root.iter()}
+                if not values.get("username") or not values.get("password"):
+                    self._send(500, _SOAP_FAULT, "text/xml")
+                    return
+                self._send(200, _SOAP_LOGIN_RESPONSE.format(
+                    server_url=html.escape(standin.base_url), session=self._new_session(),
+                    username=html.escape(values["username"]),
+                ), "text/xml")
+
+            def _oauth_token(self, form: Dict[str, list]) -> None:
+                def field(name: str) -> str:
+                    return form.get(name, [""])[0].strip()
+
+                if field("grant_type") != "password" or not field("client_id"):
+                    self._send(400, json.dumps({"error": "invalid_client_id"}), "application/json")
+                    return
+                if not field("username") or not field("password"):
+                    self._send(400, json.dumps({
+                        "error": "invalid_grant", "error_description": "authentication failure",
+                    }), "application/json")
+                    return
+                self._send(200, json.dumps({
+                    "access_token": self._new_session(), "instance_url": standin.base_url,
+                    "token_type": "Bearer",
+                }), "application/json")
+
+            def do_POST(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length).decode("utf-8")
+                if url.path.startswith(SITE_ROOT + "/services/Soap/u/"):
+                    standin.delay()
+                    self._soap_login(body)
+                    return
+                if url.path == SITE_ROOT + "/services/oauth2/token":
+                    standin.delay()
+                    self._oauth_token(parse_qs(body))
+                    return
+                if url.path != SITE_PREFIX + "login":
+                    self._send(404, "Not found", "text/plain")
+                    return
+                form = parse_qs(body)
+                standin.delay()
+                if not form.get("username", [""])[0].strip() or not form.get("password", [""])[0].strip():
+                    self._send(200, _LOGIN_PAGE.format(
+                        prefix=SITE_PREFIX, error="<p id='error'>Enter a username and password.</p>"
+                    ))
+                    return
+                username = form["username"][0].strip()
+                for prefix, path in _REJECTION_REDIRECTS.items():
+                    if username.startswith(prefix):
+                        self._redirect(path)
+                        return
+                if username.startswith(LOCKED_PREFIX):
+                    self._send(200, _LOGIN_PAGE.format(
+                        prefix=SITE_PREFIX,
+                        error="<p id='error'>Your account is locked out. Contact your administrator.</p>",
+                    ))
+                    return
+                if form["password"][0] == WRONG_PASSWORD:
+                    self._send(200, _LOGIN_PAGE.format(
+                        prefix=SITE_PREFIX,
+                        error="<p id='error'>Please check your username and password.</p>",
+                    ))
+                    return
+                session = self._new_session()
+                self._redirect(SITE_PREFIX, {"Set-Cookie": f"{SESSION_COOKIE}={session}; Path=/"})
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                if url.path == SITE_ROOT + "/secur/frontdoor.jsp":
+                    session = query.get("sid", [""])[0]
+                    if session not in standin.sessions:
+                        self._send(200, _LOGIN_PAGE.format(
+                            prefix=SITE_PREFIX, error="<p id='error'>Your session has expired.</p>"
+                        ))
+                        return
+                    ret_url = query.get("retURL", [SITE_PREFIX])[0]
+                    if not ret_url.startswith(SITE_ROOT + "/"):
+                        ret_url = SITE_PREFIX
+                    self._redirect(ret_url, {"Set-Cookie": f"{SESSION_COOKIE}={session}; Path=/"})
+                    return
+                if url.path in _REJECTION_SCREENS:
+                    self._send(200, f"<!DOCTYPE html><html><body>{_REJECTION_SCREENS[url.path]}</body></html>")
+                    return
+                if not url.path.startswith(SITE_PREFIX):
+                    self._send(404, "Not found", "text/plain")
+                    return
+                path = url.path[len(SITE_PREFIX):].strip("/")
+                if self._session() is None:
+                    self._send(200, _LOGIN_PAGE.format(prefix=SITE_PREFIX, error=""))
+                    return
+                if path == "":
+                    self._send(200, _HOME_PAGE.format(prefix=SITE_PREFIX))
+                elif path == "api/rows":
+                    offset = int(query.get("offset", ["0"])[0])
+                    standin.delay(offset)
+                    count = max(0, min(PAGE_SIZE, standin.total_rows - offset))
+                    rows = [[f"Record {n:05d}", "Type " + "ABC"[n % 3], f"City {n % 50}"]
+                            for n in range(offset + 1, offset + count + 1)]
+                    self._send(200, json.dumps(rows), "application/json")
+                elif path == "api/fields":
+                    standin.delay()
+                    fields = [f"Field {n:02d}" for n in range(1, FIELD_COUNT + 1)]
+                    self._send(200, json.dumps(fields), "application/json")
+                elif path in standin.tabs:
+                    url_key = standin.tabs[path]
+                    standin.delay()
+                    self._send(200, _TAB_PAGE.format(
+                        prefix=SITE_PREFIX, title=html.escape(_title(url_key)),
+                        view=html.escape(f"All {_title(url_key)}"), total=standin.total_rows,
+                        tab_json=json.dumps(url_key),
+                    ))
+                else:
+                    self._send(404, "Not found", "text/plain")
+
+        return Handler
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the marketplace")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--row-cost-ms", type=float, default=20.0)
+    parser.add_argument("--rows", type=int, default=DEFAULT_TOTAL_ROWS)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    standin = StandinMarketplace(
+        args.host, args.port, latency_ms=args.latency_ms,
+        row_cost_ms=args.row_cost_ms, total_rows=args.rows,
+    )
+    logging.info("Stand-in marketplace at %s", standin.base_url)
+    try:
+        standin._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
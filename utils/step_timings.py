@@ -0,0 +1,73 @@
+"""Step-timing export shared by every suite that measures itself.
+
+Each measured step appends one JSON line to ``reports/step_timings.jsonl``
+(``STEP_TIMINGS_PATH`` overrides it) with the run id, test id, step name,
+duration and whatever step-specific numbers the caller adds. xdist workers
+append to the same file under :func:`utils.history.file_lock`, so one run
+produces one export that Jenkins can archive and trend.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+from utils.history import file_lock
+from utils.list_view_sweeper import run_id
+
+STEP_TIMINGS_ENV = "STEP_TIMINGS_PATH"
+DEFAULT_STEP_TIMINGS_PATH = Path(__file__).resolve().parent.parent / "reports" / "step_timings.jsonl"
+
+
+def step_timings_path() -> Path:
+    raw = os.environ.get(STEP_TIMINGS_ENV, "").strip()
+    return Path(raw) if raw else DEFAULT_STEP_TIMINGS_PATH
+
+
+def current_test_id() -> str:
+    """Node id of the running test (``PYTEST_CURRENT_TEST`` without its phase suffix)."""
+    return os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" (", 1)[0]
+
+
+def record_step(step: str, seconds: float, *, test: Optional[str] = None, **fields) -> dict:
+    """Append one step to the export and return the written record."""
+    record = {
+        "run_id": run_id(),
+        "test": test if test is not None else current_test_id(),
+        "step": step,
+        "seconds": round(seconds, 3),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    record.update(fields)
+    path = step_timings_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    with file_lock(path):
+        with path.open("a", encoding="utf-8") as export_file:
+            export_file.write(line + "\n")
+    return record
+
+
+def load_steps(step: Optional[str] = None, run: Optional[str] = None,
+               path: Optional[Path] = None) -> List[dict]:
+    """Records from the export, optionally filtered by step name and run id."""
+    path = path or step_timings_path()
+    records: List[dict] = []
+    try:
+        with path.open(encoding="utf-8") as export_file:
+            for line in export_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if step is not None and record.get("step") != step:
+                    continue
+                if run is not None and record.get("run_id") != run:
+                    continue
+                records.append(record)
+    except FileNotFoundError:
+        pass
+    return records
@@ -0,0 +1,226 @@
+"""Single-session crawl of every tab's read-only metadata.
+
+The column-name and fields-comparison suites each log in and load one tab to
+read data that never changes during a run. :class:`TabCrawler` visits every
+tab once in one logged-in session and captures the list view header, column
+headers, first-page row count and both field lists into a
+:class:`CrawlSnapshot`. With ``TAB_CRAWL=1`` the per-tab suites are replaced by
+offline checks that assert against that snapshot; ``TAB_CRAWL_SNAPSHOT``
+re-runs the checks against a saved snapshot without a browser.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from selenium.common.exceptions import WebDriverException
+
+from pages import locators
+from pages.locators import Locator
+from utils.history import write_json_atomic
+from utils.list_view_sweeper import run_id
+from utils.tab_metadata import metadata_expression
+
+TAB_CRAWL_ENV = "TAB_CRAWL"
+TAB_CRAWL_SNAPSHOT_ENV = "TAB_CRAWL_SNAPSHOT"
+DEFAULT_SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / "reports" / "tab_crawl"
+
+# Suites whose live per-tab tests are deselected in favour of the offline checks.
+CRAWLED_CHECKS = ("column_names", "fields_comparison")
+
+SELECT_FIELDS_BUTTON_XPATH = "//button[normalize-space()='Select Fields To Display']"
+CANCEL_BUTTON_XPATH = "//button[contains(@class,'slds-button_neutral') and text()='Cancel']"
+ADDITIONAL_FILTER_BUTTON_XPATH = (
+    "//button[contains(@class,'additionalFiltersStyling') and .//span[text()='Additional Filtering']]"
+)
+SELECT_A_FIELD_XPATH = "//span[normalize-space()='Select a Field']"
+FILTER_OPTION_XPATH = "//lightning-base-combobox-item[contains(@class, 'slds-listbox__option')]"
+
+# Clicks the first visible match of an XPath; returns false while there is none.
+_CLICK_SCRIPT = """
+const node = document.evaluate(arguments[0], document, null,
+    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!node || node.offsetParent === null) {
+    return false;
+}
+node.click();
+return true;
+"""
+
+# Non-empty texts of every match of an XPath, or null while there are none.
+_TEXTS_SCRIPT = """
+const snapshot = document.evaluate(arguments[0], document, null,
+    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const texts = [];
+for (let i = 0; i < snapshot.snapshotLength; i++) {
+    const text = (snapshot.snapshotItem(i).innerText || '').trim();
+    if (text) {
+        texts.push(text);
+    }
+}
+return texts.length ? texts : null;
+"""
+
+
+def crawl_enabled() -> bool:
+    if os.environ.get(TAB_CRAWL_SNAPSHOT_ENV, "").strip():
+        return True
+    return os.environ.get(TAB_CRAWL_ENV, "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def saved_snapshot_path() -> Optional[Path]:
+    raw = os.environ.get(TAB_CRAWL_SNAPSHOT_ENV, "").strip()
+    return Path(raw) if raw else None
+
+
+@dataclass
+class TabCapture:
+    """Everything the read-only suites read from one tab."""
+
+    url_key: str
+    header: str = ""
+    columns: List[str] = field(default_factory=list)
+    row_count: int = 0
+    pinned: bool = False
+    select_fields: Optional[List[str]] = None
+    additional_filter: Optional[List[str]] = None
+    # Section ("tab", "select_fields", "additional_filter") -> first line of its error.
+    errors: Dict[str, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+@dataclass
+class CrawlSnapshot:
+    environment: str
+    run_id: str
+    captured_at: str
+    tabs: Dict[str, TabCapture] = field(default_factory=dict)
+
+    def tab(self, url_key: str) -> TabCapture:
+        if url_key not in self.tabs:
+            raise LookupError(f"Tab '{url_key}' is not in the crawl snapshot of {self.environment}")
+        return self.tabs[url_key]
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        path = path or DEFAULT_SNAPSHOT_DIR / f"{self.environment}.json"
+        write_json_atomic(path, asdict(self))
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> "CrawlSnapshot":
+        with Path(path).open(encoding="utf-8") as snapshot_file:
+            data = json.load(snapshot_file)
+        tabs = {key: TabCapture(**value) for key, value in data.pop("tabs", {}).items()}
+        return cls(tabs=tabs, **data)
+
+
+def _first_line(exc: Exception) -> str:
+    message = (getattr(exc, "msg", None) or str(exc)).strip()
+    return message.splitlines()[0] if message else type(exc).__name__
+
+
+class TabCrawler:
+    """Captures every tab's metadata in one logged-in session."""
+
+    def __init__(self, driver, base_url: str):
+        from pages.list_view_page import ListViewPage
+
+        self.driver = driver
+        self.base_url = base_url
+        self.page = ListViewPage(driver)
+
+    def _click(self, xpath: str, predicate: str) -> None:
+        self.page.wait_for(predicate, 20).until(
+            lambda driver: driver.execute_script(_CLICK_SCRIPT, xpath),
+            f"{predicate}: nothing visible to click at {xpath}",
+        )
+
+    def _texts(self, target: Union[str, Locator], predicate: str) -> List[str]:
+        """Texts of ``target`` (an XPath or a registered locator) once two consecutive polls agree."""
+        previous: List[Optional[List[str]]] = [None]
+        xpath = target.xpath if isinstance(target, Locator) else target
+
+        def settled(driver):
+            if isinstance(target, Locator):
+                texts = locators.texts(driver, target) or None
+            else:
+                texts = driver.execute_script(_TEXTS_SCRIPT, xpath)
+            stable = texts if texts and texts == previous[0] else None
+            previous[0] = texts
+            return stable
+
+        return self.page.wait_for(predicate, 20).until(settled, f"{predicate}: no texts at {xpath}")
+
+    def _metadata(self) -> dict:
+        script = f"return {metadata_expression()};"
+        return self.page.wait_for("tab_metadata", 30).until(
+            lambda driver: driver.execute_script(script), "tab_metadata: grid did not render"
+        )
+
+    def _read_metadata(self, capture: TabCapture) -> None:
+        value = self._metadata()
+        if value.get("pinned"):
+            # Same as the per-tab tests: check the default view, not a pinned one.
+            self.page.ensure_unpinned()
+            value = self._metadata()
+        capture.header = value.get("header", "")
+        capture.columns = list(value.get("columns", []))
+        capture.row_count = int(value.get("row_count", 0))
+        capture.pinned = bool(value.get("pinned"))
+
+    def read_select_fields(self) -> List[str]:
+        self._click(SELECT_FIELDS_BUTTON_XPATH, "select_fields_btn")
+        fields = self._texts(locators.SELECT_FIELDS_OPTIONS, "select_fields_options")
+        self._click(CANCEL_BUTTON_XPATH, "select_fields_cancel")
+        return fields
+
+    def _read_additional_filter(self) -> List[str]:
+        self._click(ADDITIONAL_FILTER_BUTTON_XPATH, "additional_filter_btn")
+        self._click(SELECT_A_FIELD_XPATH, "select_a_field_btn")
+        return self._texts(FILTER_OPTION_XPATH, "additional_filter_options")
+
+    def capture_tab(self, url_key: str) -> TabCapture:
+        """Load ``url_key`` once and read its metadata and both field lists."""
+        capture = TabCapture(url_key)
+        started = time.monotonic()
+        try:
+            self.page.open(self.base_url, url_key)
+            self._read_metadata(capture)
+        except WebDriverException as exc:
+            capture.errors["tab"] = _first_line(exc)
+        else:
+            for section, read in (
+                ("select_fields", self.read_select_fields),
+                ("additional_filter", self._read_additional_filter),
+            ):
+                try:
+                    setattr(capture, section, read())
+                except WebDriverException as exc:
+                    capture.errors[section] = _first_line(exc)
+        capture.seconds = round(time.monotonic() - started, 2)
+        for section, error in capture.errors.items():
+            logging.warning("Tab crawl: %s %s failed: %s", url_key, section, error)
+        return capture
+
+    def crawl(self, url_keys: Iterable[str], environment: str) -> CrawlSnapshot:
+        snapshot = CrawlSnapshot(
+            environment,
+            run_id(),
+            datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+        for url_key in url_keys:
+            capture = self.capture_tab(url_key)
+            print(
+                f"[Crawler] {url_key}: {len(capture.columns)} columns, "
+                f"{len(capture.select_fields or [])} select fields, "
+                f"{len(capture.additional_filter or [])} filter fields in {capture.seconds}s."
+            )
+            snapshot.tabs[url_key] = capture
+        return snapshot
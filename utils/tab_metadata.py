@@ -0,0 +1,145 @@
+"""Read-only tab metadata (list view header, column headers, row count).
+
+The whole read is one in-page script (:func:`metadata_expression`), so
+:func:`collect_with_cdp` can run it on several DevTools page targets of one
+logged-in browser at once through :mod:`utils.cdp_engine`, and the tab crawler
+can run it over Selenium in a single round trip.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+
+from config.urls import get_url
+
+COLUMN_HEADER_XPATH = (
+    "//table[contains(@class,'slds-table')]"
+    "//span[contains(@class,'slds-truncate') and normalize-space(text())]"
+)
+UNPIN_BUTTON_XPATH = "//button[@title='Unpin this List View']"
+
+METADATA_BACKEND_ENV = "METADATA_BACKEND"
+METADATA_BACKENDS = ("selenium", "cdp")
+CDP_CONCURRENCY_ENV = "CDP_CONCURRENCY"
+
+# Body of a function taking the column, grid-row and header XPaths (plus the
+# unpin button XPath) and returning the tab's metadata, or null while the grid
+# and header are not rendered yet.
+_METADATA_FUNCTION = """
+function (columnXpath, gridXpath, headerXpath, unpinXpath) {
+    const first = (xpath) => document.evaluate(xpath, document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const grid = first(gridXpath);
+    const header = first(headerXpath);
+    if (!grid || !header || header.offsetParent === null) {
+        return null;
+    }
+    const snapshot = document.evaluate(columnXpath, document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const columns = [];
+    for (let i = 0; i < snapshot.snapshotLength; i++) {
+        const text = (snapshot.snapshotItem(i).innerText || '').trim();
+        if (text) {
+            columns.push(text);
+        }
+    }
+    if (!columns.length) {
+        return null;
+    }
+    const table = grid.closest('table');
+    return {
+        header: (header.innerText || '').trim(),
+        columns: columns,
+        row_count: table ? table.querySelectorAll('tbody tr').length : 0,
+        pinned: first(unpinXpath) !== null,
+    };
+}
+"""
+
+
+def _metadata_args() -> list:
+    # Page objects import selenium; conftest imports this module at collection time.
+    from pages.list_view_page import ListViewPage
+
+    return [
+        COLUMN_HEADER_XPATH,
+        ListViewPage.GRID_HEADER_ROW[1],
+        ListViewPage.LIST_VIEW_HEADER[1],
+        UNPIN_BUTTON_XPATH,
+    ]
+
+
+def metadata_expression() -> str:
+    """JS expression evaluating to the current tab's metadata dict, or null while it renders."""
+    return f"({_METADATA_FUNCTION}).apply(null, {json.dumps(_metadata_args())})"
+
+
+@dataclass
+class TabMetadata:
+    url_key: str
+    header: str = ""
+    columns: List[str] = field(default_factory=list)
+    row_count: int = 0
+    pinned: bool = False
+    error: str = ""
+
+    @property
+    def view_name(self) -> str:
+        from pages.list_view_page import base_view_name
+
+        return base_view_name(self.header)
+
+    @classmethod
+    def from_script(cls, url_key: str, value: dict) -> "TabMetadata":
+        return cls(
+            url_key,
+            header=value.get("header", ""),
+            columns=list(value.get("columns", [])),
+            row_count=int(value.get("row_count", 0)),
+            pinned=bool(value.get("pinned")),
+        )
+
+
+def metadata_backend() -> str:
+    """Backend for metadata suites: ``selenium`` (default) or ``cdp``."""
+    backend = os.environ.get(METADATA_BACKEND_ENV, "selenium").strip().lower() or "selenium"
+    if backend not in METADATA_BACKENDS:
+        raise ValueError(
+            f"{METADATA_BACKEND_ENV} must be one of {', '.join(METADATA_BACKENDS)}, got '{backend}'."
+        )
+    return backend
+
+
+def collect_with_cdp(driver, base_url: str, url_keys: Iterable[str],
+                     concurrency: int | None = None,
+                     timeout: float = 60.0) -> Dict[str, TabMetadata]:
+    """Metadata for every tab in ``url_keys``, loaded concurrently in ``driver``'s browser.
+
+    ``driver`` must already be logged in; the extra page targets share its
+    cookies. A tab that fails to load gets a :class:`TabMetadata` with
+    ``error`` set instead of aborting the others.
+    """
+    # Imported lazily so Selenium-only runs never need the DevTools client.
+    from utils.cdp_engine import DEFAULT_CONCURRENCY, run_against_driver
+
+    if concurrency is None:
+        concurrency = int(os.environ.get(CDP_CONCURRENCY_ENV, DEFAULT_CONCURRENCY))
+    expression = metadata_expression()
+
+    async def job(page, url_key):
+        await page.navigate(get_url(base_url, url_key), timeout)
+        value = await page.wait_for(expression, timeout)
+        return TabMetadata.from_script(url_key, value)
+
+    raw = run_against_driver(driver, list(url_keys), job, concurrency)
+    results: Dict[str, TabMetadata] = {}
+    for url_key, value in raw.items():
+        if isinstance(value, Exception):
+            logging.warning("CDP metadata failed for %s: %s", url_key, value)
+            value = TabMetadata(url_key, error=f"{type(value).__name__}: {value}")
+        results[url_key] = value
+    return results
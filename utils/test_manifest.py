@@ -0,0 +1,156 @@
+"""Import-free collection for ``--collect-only`` runs.
+
+Jenkins runs a collect-only pass before every build to validate the selection.
+Importing ~200 test modules (each pulling in selenium, allure and the page
+objects) dominates that pass, yet all it needs is each module's test names and
+markers. This module reads those from the source with :mod:`ast` and caches
+the result in pytest's cache (``.pytest_cache``) keyed by file mtime and size,
+so an unchanged tree is collected from one JSON read.
+
+Only modules whose tests are fully static are served from the manifest: plain
+``def test_*`` functions with bare ``@pytest.mark.<name>`` decorators and an
+optional literal ``pytestmark`` list. Anything else (parametrize, marker
+arguments, test classes, ``pytest_generate_tests``) falls back to normal
+collection, so node ids and markers always match a real run.
+"""
+
+from __future__ import annotations
+
+import ast
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+MANIFEST_ENV = "TEST_MANIFEST"
+CACHE_KEY = "test_manifest/v1"
+
+_manifest_key = pytest.StashKey["Manifest"]()
+
+
+def manifest_enabled(config) -> bool:
+    if not config.option.collectonly:
+        return False
+    return os.environ.get(MANIFEST_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _mark_name(node: ast.expr) -> Optional[str]:
+    """``pytest.mark.<name>`` -> ``<name>``; ``None`` for anything with arguments or logic."""
+    if (
+        isinstance(node, ast.Attribute)
+        and isinstance(node.value, ast.Attribute)
+        and node.value.attr == "mark"
+        and isinstance(node.value.value, ast.Name)
+        and node.value.value.id == "pytest"
+    ):
+        return node.attr
+    return None
+
+
+def parse_module(source: str) -> Optional[dict]:
+    """Tests and markers of a module, or ``None`` when it needs a real import to collect."""
+    tree = ast.parse(source)
+    module_markers: List[str] = []
+    tests: List[dict] = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            return None
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name == "pytest_generate_tests":
+                return None
+            if not node.name.startswith("test"):
+                continue
+            markers = [_mark_name(decorator) for decorator in node.decorator_list]
+            if None in markers:
+                return None
+            tests.append({"name": node.name, "lineno": node.lineno, "markers": markers})
+        elif isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "pytestmark" for target in node.targets
+        ):
+            values = node.value.elts if isinstance(node.value, (ast.List, ast.Tuple)) else [node.value]
+            names = [_mark_name(value) for value in values]
+            if None in names:
+                return None
+            module_markers.extend(names)
+    return {"module_markers": module_markers, "tests": tests}
+
+
+class Manifest:
+    """Per-run view of the cached manifest; new parses are written back once at the end."""
+
+    def __init__(self, config):
+        self.config = config
+        self.cache = getattr(config, "cache", None)
+        self.entries: dict = self.cache.get(CACHE_KEY, {}) if self.cache is not None else {}
+        self.dirty = False
+
+    @classmethod
+    def for_config(cls, config) -> "Manifest":
+        manifest = config.stash.get(_manifest_key, None)
+        if manifest is None:
+            manifest = cls(config)
+            config.stash[_manifest_key] = manifest
+        return manifest
+
+    def entry(self, path: Path) -> Optional[dict]:
+        stat = path.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        key = str(path.relative_to(self.config.rootpath))
+        cached = self.entries.get(key)
+        if cached is not None and cached["stamp"] == stamp:
+            return cached["module"]
+        module = parse_module(path.read_text(encoding="utf-8"))
+        self.entries[key] = {"stamp": stamp, "module": module}
+        self.dirty = True
+        return module
+
+    def save(self) -> None:
+        if self.dirty and self.cache is not None:
+            self.cache.set(CACHE_KEY, self.entries)
+            self.dirty = False
+
+
+class ManifestItem(pytest.Item):
+    """Collected test backed by the manifest; it exists only to be listed."""
+
+    def __init__(self, *, lineno: int, markers: List[str], **kwargs):
+        super().__init__(**kwargs)
+        self.lineno = lineno
+        for name in markers:
+            self.add_marker(name)
+
+    def runtest(self) -> None:
+        raise RuntimeError(
+            f"{self.nodeid} was collected from the test manifest and cannot run; "
+            f"manifest collection is only used with --collect-only."
+        )
+
+    def reportinfo(self):
+        return self.path, self.lineno - 1, self.name
+
+
+class ManifestModule(pytest.File):
+    """Stands in for ``pytest.Module`` when the module's tests are fully static."""
+
+    def __init__(self, *, module: dict, **kwargs):
+        super().__init__(**kwargs)
+        self.module = module
+        for name in module["module_markers"]:
+            self.add_marker(name)
+
+    def collect(self):
+        for test in self.module["tests"]:
+            yield ManifestItem.from_parent(
+                self, name=test["name"], lineno=test["lineno"], markers=test["markers"]
+            )
+
+
+def make_module(module_path: Path, parent) -> Optional[ManifestModule]:
+    """``pytest_pycollect_makemodule`` implementation; ``None`` defers to normal collection."""
+    if not manifest_enabled(parent.config):
+        return None
+    module = Manifest.for_config(parent.config).entry(module_path)
+    if module is None:
+        return None
+    return ManifestModule.from_parent(parent, path=module_path, module=module)
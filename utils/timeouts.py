@@ -0,0 +1,293 @@
+"""Adaptive explicit-wait timeouts learned from observed readiness latency.
+
+Every wait is keyed by ``(env, tab, predicate)``. Observed latencies are kept in
+``HISTORY_DIR/readiness_latency.json`` between runs; once a key has enough
+samples its timeout becomes ``p99 * TIMEOUT_MULTIPLIER`` clamped to
+``[TIMEOUT_FLOOR, TIMEOUT_CEILING]``. Keys without history fall back to the
+hard-coded default the caller passes, so a fresh workspace behaves exactly as
+before.
+
+A per-test :class:`TimeBudget` caps every wait by the time the test has left,
+so chained waits cannot add up to many minutes. Background threads that are not
+part of the running test (the driver pre-spawner) wrap their work in
+:meth:`TimeoutPolicy.outside_test`, which gives that thread no tab and no budget.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.history import file_lock, history_dir, write_json_atomic
+
+HISTORY_FILE_NAME = "readiness_latency.json"
+
+DEFAULT_MULTIPLIER = 3.0
+DEFAULT_FLOOR_SECONDS = 5.0
+DEFAULT_CEILING_SECONDS = 120.0
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW = 200
+DEFAULT_TEST_BUDGET_SECONDS = 900.0
+
+
+class TimeBudgetExceeded(TimeoutException):
+    """Raised when a wait starts after the test's overall time budget is spent."""
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError as exc:
+        raise ValueError(f"{name} must be a number, got '{raw}'.") from exc
+    if value <= 0:
+        raise ValueError(f"{name} must be greater than zero.")
+    return value
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    rank = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+class TimeBudget:
+    """Overall wall-clock budget shared by every wait in one test."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.started = time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        return self.seconds - self.elapsed()
+
+    def cap(self, timeout: float) -> float:
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise TimeBudgetExceeded(
+                f"Test time budget of {self.seconds:.0f}s exhausted "
+                f"({self.elapsed():.0f}s elapsed)."
+            )
+        return min(timeout, remaining)
+
+
+class TimeoutPolicy:
+    """Learns readiness latency per ``(env, tab, predicate)`` and sizes waits from it."""
+
+    def __init__(
+        self,
+        environment: str,
+        history_path: Optional[Path] = None,
+        *,
+        enabled: bool = True,
+        multiplier: float = DEFAULT_MULTIPLIER,
+        floor: float = DEFAULT_FLOOR_SECONDS,
+        ceiling: float = DEFAULT_CEILING_SECONDS,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        window: int = DEFAULT_WINDOW,
+        test_budget_seconds: float = DEFAULT_TEST_BUDGET_SECONDS,
+    ):
+        self.environment = environment
+        self.history_path = history_path or history_dir() / HISTORY_FILE_NAME
+        self.enabled = enabled
+        self.multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.window = window
+        self.test_budget_seconds = test_budget_seconds
+        self.current_tab: Optional[str] = None
+        self.current_budget: Optional[TimeBudget] = None
+        self._thread_state = threading.local()
+        self._history: Dict[str, List[float]] = self._load()
+        self._pending: Dict[str, List[float]] = {}
+
+    @classmethod
+    def from_env(cls, environment: str) -> "TimeoutPolicy":
+        enabled = os.environ.get("ADAPTIVE_TIMEOUTS", "1").strip().lower() not in {
+            "0", "false", "no", "off"
+        }
+        return cls(
+            environment,
+            enabled=enabled,
+            multiplier=_env_float("TIMEOUT_MULTIPLIER", DEFAULT_MULTIPLIER),
+            floor=_env_float("TIMEOUT_FLOOR", DEFAULT_FLOOR_SECONDS),
+            ceiling=_env_float("TIMEOUT_CEILING", DEFAULT_CEILING_SECONDS),
+            test_budget_seconds=_env_float(
+                "TEST_TIME_BUDGET", DEFAULT_TEST_BUDGET_SECONDS
+            ),
+        )
+
+    def _key(self, tab: Optional[str], predicate: str) -> str:
+        return f"{self.environment}|{tab or '-'}|{predicate}"
+
+    def _load(self) -> Dict[str, List[float]]:
+        try:
+            with self.history_path.open(encoding="utf-8") as history_file:
+                data = json.load(history_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logging.warning("Ignoring unreadable timeout history %s: %s", self.history_path, exc)
+            return {}
+        return {key: [float(s) for s in samples] for key, samples in data.items()}
+
+    def begin_test(self, tab: Optional[str]) -> None:
+        self.current_tab = tab
+        self.current_budget = TimeBudget(self.test_budget_seconds)
+
+    def end_test(self) -> None:
+        self.current_tab = None
+        self.current_budget = None
+
+    @contextmanager
+    def outside_test(self) -> Iterator[None]:
+        """Waits on this thread use no tab and no test budget while the block runs."""
+        self._thread_state.outside_test = True
+        try:
+            yield
+        finally:
+            self._thread_state.outside_test = False
+
+    def _in_test(self) -> bool:
+        return not getattr(self._thread_state, "outside_test", False)
+
+    def _tab(self, tab: Optional[str]) -> Optional[str]:
+        if tab is not None or not self._in_test():
+            return tab
+        return self.current_tab
+
+    def samples(self, tab: Optional[str], predicate: str) -> List[float]:
+        key = self._key(tab, predicate)
+        return self._history.get(key, []) + self._pending.get(key, [])
+
+    def timeout_for(self, predicate: str, default: float, tab: Optional[str] = None) -> float:
+        """Learned timeout for ``predicate`` on ``tab``, or ``default`` without enough history."""
+        tab = self._tab(tab)
+        timeout = float(default)
+        samples = self.samples(tab, predicate)
+        if self.enabled and len(samples) >= self.min_samples:
+            learned = _percentile(samples, 99) * self.multiplier
+            timeout = min(max(learned, self.floor), self.ceiling)
+        if self.current_budget is not None and self._in_test():
+            timeout = self.current_budget.cap(timeout)
+        return timeout
+
+    def record(self, predicate: str, seconds: float, tab: Optional[str] = None) -> None:
+        tab = self._tab(tab)
+        self._pending.setdefault(self._key(tab, predicate), []).append(round(seconds, 3))
+
+    def wait(
+        self,
+        driver,
+        predicate: str,
+        default: float,
+        tab: Optional[str] = None,
+        poll_frequency: float = 0.5,
+        ignored_exceptions=None,
+    ) -> "AdaptiveWait":
+        return AdaptiveWait(
+            driver,
+            self,
+            predicate,
+            default,
+            tab=tab,
+            poll_frequency=poll_frequency,
+            ignored_exceptions=ignored_exceptions,
+        )
+
+    def save(self) -> None:
+        """Merge this process's observations into the history file."""
+        if not self._pending:
+            return
+        path = self.history_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(path):
+            merged = self._load()
+            for key, samples in self._pending.items():
+                merged[key] = (merged.get(key, []) + samples)[-self.window:]
+            write_json_atomic(path, merged)
+        self._history = merged
+        self._pending = {}
+
+
+class AdaptiveWait(WebDriverWait):
+    """``WebDriverWait`` whose timeout comes from a :class:`TimeoutPolicy`.
+
+    The timeout is resolved at each ``until`` call so the per-test budget is
+    applied to the time actually left. Successful waits are recorded as
+    latency samples; timeouts are recorded at the timeout used, which pushes
+    a too-tight learned value back up on the next run.
+
+    Calling a wait with a predicate name, ``wait("save_btn", 10)``, returns
+    the same wait keyed by that predicate, so code holding one shared wait can
+    still give each thing it waits for its own history.
+    """
+
+    def __init__(self, driver, policy: TimeoutPolicy, predicate: str, default: float, *,
+                 tab: Optional[str] = None, poll_frequency: float = 0.5,
+                 ignored_exceptions=None):
+        super().__init__(driver, default, poll_frequency, ignored_exceptions)
+        self.policy = policy
+        self.predicate = predicate
+        self.default = default
+        self.tab = tab
+
+    def _timed(self, method, condition, message):
+        self._timeout = self.policy.timeout_for(self.predicate, self.default, tab=self.tab)
+        started = time.monotonic()
+        try:
+            result = method(condition, message)
+        except TimeoutException:
+            self.policy.record(self.predicate, self._timeout, tab=self.tab)
+            raise
+        self.policy.record(self.predicate, time.monotonic() - started, tab=self.tab)
+        return result
+
+    def until(self, method, message: str = ""):
+        return self._timed(super().until, method, message)
+
+    def until_not(self, method, message: str = ""):
+        return self._timed(super().until_not, method, message)
+
+    def __call__(self, predicate: str, timeout: Optional[float] = None) -> "AdaptiveWait":
+        return AdaptiveWait(
+            self._driver, self.policy, predicate, timeout or self.default, tab=self.tab,
+            poll_frequency=self._poll, ignored_exceptions=self._ignored_exceptions,
+        )
+
+
+_policy: Optional[TimeoutPolicy] = None
+
+
+def set_policy(policy: Optional[TimeoutPolicy]) -> None:
+    global _policy
+    _policy = policy
+
+
+def get_policy() -> TimeoutPolicy:
+    """Process-wide policy; conftest installs one per run, scripts get a disabled default."""
+    global _policy
+    if _policy is None:
+        _policy = TimeoutPolicy("-", enabled=False)
+    return _policy
+
+
+def adaptive_wait(driver, predicate: str, default: float, **kwargs) -> AdaptiveWait:
+    """Drop-in replacement for ``WebDriverWait(driver, default)`` keyed by ``predicate``."""
+    return get_policy().wait(driver, predicate, default, **kwargs)